@@ -6,6 +6,13 @@ from fastapi.responses import FileResponse
 from routers.auth import router as auth_router
 from routers.inference.inference import router as inference_router
 from routers.training.train import router as train_router
+from routers.uploads import router as uploads_router
+from routers.helpers.worker_pool import WorkerPool
+from routers.helpers.job_processes import JobProcesses
+from routers.helpers.job_store import JobStore
+from routers.helpers.job_manager import JobCleanupService
+from routers.helpers.uploads import UploadStore
+from inference.transcription.result_cache import TranscriptCache
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -17,6 +24,23 @@ app = FastAPI()
 app.include_router(auth_router, prefix="/api/auth")
 app.include_router(inference_router, prefix="/api/inference")
 app.include_router(train_router, prefix="/api/train")
+app.include_router(uploads_router, prefix="/api/uploads")
+
+
+@app.on_event("startup")
+def recover_job_store():
+    # jobs owned by a process that no longer exists can never finish
+    JobStore.mark_orphans()
+    JobCleanupService.prune_expired()
+    UploadStore.prune()
+    TranscriptCache.prune()
+
+
+@app.on_event("shutdown")
+def shutdown_worker_pool():
+    WorkerPool.shutdown()
+    # job processes are not daemonic, so they would outlive the API otherwise
+    JobProcesses.shutdown()
 
 
 @app.get("/{full_path:path}", include_in_schema=False)
@@ -2,6 +2,7 @@
 import re
 from abc import ABC, abstractmethod
 from utils.functions import load_glossing_rules
+from inference.model_registry import ModelRegistry
 from inference.translation.factory import TranslationStrategyFactory
 
 LEIPZIG_GLOSSARY = load_glossing_rules("LEIPZIG_GLOSSARY.json")
@@ -24,7 +25,6 @@ class GlossingStrategy(ABC):
             self.translation_strategy = TranslationStrategyFactory.get_strategy(
                 language_code=language_code, translationModel=translationModel
             )
-            self.translation_strategy.load_model()
         except Exception as e:
             print(f"Warning: could not load translation model: {e}")
             self.translation_strategy = None
@@ -35,6 +35,14 @@ class GlossingStrategy(ABC):
     @abstractmethod
     def gloss(self, sentence: str) -> str: ...
 
+    def unload(self):
+        """
+        Release the glossing and translation models back to the shared ModelRegistry.
+        """
+        ModelRegistry.release_owner(self)
+        if self.translation_strategy:
+            self.translation_strategy.unload()
+
     # ---------- Leipzig mapping helpers ----------
     @staticmethod
     def _map_one_atom(category: str, ud_val_atom: str) -> str:
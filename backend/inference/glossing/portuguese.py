@@ -3,24 +3,21 @@ import spacy
 from spacy.cli import download
 from spacy.util import is_package
 from utils.functions import load_glossing_rules
+from inference.model_registry import ModelRegistry
 from inference.glossing.abstract import GlossingStrategy
-from inference.translation.factory import TranslationStrategyFactory
 
 LEIPZIG_GLOSSARY = load_glossing_rules("LEIPZIG_GLOSSARY.json")
 
 class PortugueseGlossingStrategy(GlossingStrategy):
-    def __init__(self, language_code: str):
-        super().__init__(language_code)
-        self.translation_strategy = TranslationStrategyFactory.get_strategy(language_code)
-        self.nlp = self.load_model()
-
     def load_model(self):
         model_name = "pt_core_news_lg"
         if not is_package(model_name):
             print(f"{model_name} isn't installed—pulling it down now…")
             download(model_name)
         try:
-            return spacy.load(model_name)
+            self.nlp = ModelRegistry.acquire(
+                f"spacy:{model_name}", lambda: spacy.load(model_name), owner=self
+            )
         except Exception as e:
             print(f"Error loading spaCy model {model_name}: {e}")
             raise
@@ -5,6 +5,7 @@ from spacy.cli import download
 from spacy.util import is_package
 
 from utils.functions import load_glossing_rules
+from inference.model_registry import ModelRegistry
 from inference.glossing.abstract import GlossingStrategy
 
 
@@ -41,13 +42,17 @@ class SpaCyGlossingStrategy(GlossingStrategy):
             print(f"Loading custom glossing model from {model_dir}")
             if not model_dir.exists():
                 raise ValueError(f"Custom glossing model not found at {model_dir}")
-            self.nlp = spacy.load(model_dir)
+            self.nlp = ModelRegistry.acquire(
+                f"spacy:{model_dir}", lambda: spacy.load(model_dir), owner=self
+            )
         elif self.language_code in self.DEFAULT_SPACY:
             pkg = self.DEFAULT_SPACY[self.language_code]
             if not is_package(pkg):
                 print(f"{pkg} not found — downloading…")
                 download(pkg)
-            self.nlp = spacy.load(pkg)
+            self.nlp = ModelRegistry.acquire(
+                f"spacy:{pkg}", lambda: spacy.load(pkg), owner=self
+            )
 
         else:
             raise ValueError("No glossing model specified or available for this language.")
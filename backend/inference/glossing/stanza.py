@@ -3,6 +3,7 @@ import re
 import torch
 
 from utils.functions import load_glossing_rules
+from inference.model_registry import ModelRegistry
 from inference.glossing.abstract import GlossingStrategy
 from inference.translation.factory import TranslationStrategyFactory
 
@@ -15,15 +16,24 @@ class StanzaGlossingStrategy(GlossingStrategy):
     """
 
     def load_model(self):
+        self.nlp = ModelRegistry.acquire(
+            f"stanza:{self.language_code}:tokenize,pos,lemma",
+            self._load_pipeline,
+            owner=self,
+        )
+
+    def _load_pipeline(self):
         _orig = torch.load
         torch.load = lambda f, *a, **k: _orig(f, *a, weights_only=False, **k)
-        self.nlp = stanza.Pipeline(
-            self.language_code,
-            processors="tokenize,pos,lemma",
-            use_gpu=True
-        )
-        # put it back
-        torch.load = _orig
+        try:
+            return stanza.Pipeline(
+                self.language_code,
+                processors="tokenize,pos,lemma",
+                use_gpu=True
+            )
+        finally:
+            # put it back
+            torch.load = _orig
     
     def parse_stanza_feats(self, feats_str):
         if not feats_str:
@@ -0,0 +1,247 @@
+import gc
+import os
+import sys
+import time
+import logging
+import weakref
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# RAM budget for cached models in MB (0 unloads every model as soon as it is unreferenced)
+BUDGET_MB = float(os.getenv("MODEL_REGISTRY_BUDGET_MB", "0"))
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process, or 0 if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _torch_module_size(obj) -> int:
+    torch = sys.modules.get("torch")
+    if torch is None or not isinstance(obj, torch.nn.Module):
+        return 0
+    tensors = list(obj.parameters()) + list(obj.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def _model_size(model) -> int:
+    """Best-effort size in bytes of a loaded model (or tuple of models)."""
+    if isinstance(model, (tuple, list)):
+        return sum(_model_size(m) for m in model)
+    size = _torch_module_size(model)
+    if not size:
+        # pipelines usually wrap the torch module in a `.model` attribute
+        size = _torch_module_size(getattr(model, "model", None))
+    return size
+
+
+class ModelEntry:
+    """
+    A loaded model plus its references and bookkeeping stats. Owners are
+    held weakly, so the references of an owner that is garbage collected
+    without releasing them disappear with it; owners that cannot be weakly
+    referenced (e.g. strings) are kept as plain tokens.
+    """
+    def __init__(self, key: tuple, model: Any, load_time: float, size_bytes: int):
+        self.key = key
+        self.model = model
+        self.load_time = load_time
+        self.size_bytes = size_bytes
+        self.hits = 0
+        self.anonymous = 0
+        self.holders: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.tokens: Counter = Counter()
+
+    @property
+    def refs(self) -> int:
+        return self.anonymous + sum(self.holders.values()) + sum(self.tokens.values())
+
+    def _held_by(self, owner):
+        try:
+            weakref.ref(owner)
+        except TypeError:
+            return self.tokens
+        return self.holders
+
+    def add(self, owner=None) -> None:
+        if owner is None:
+            self.anonymous += 1
+        else:
+            held = self._held_by(owner)
+            held[owner] = held.get(owner, 0) + 1
+
+    def remove(self, owner=None, count: int | None = None) -> None:
+        """Drop `count` references of `owner` (all of them when None)."""
+        if owner is None:
+            self.anonymous = max(self.anonymous - (count or 1), 0)
+            return
+        held = self._held_by(owner)
+        left = 0 if count is None else held.get(owner, 0) - count
+        if left > 0:
+            held[owner] = left
+        else:
+            held.pop(owner, None)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models shared by all strategy factories.
+
+    Models are keyed by (name, device) and handed out reference counted:
+    strategies `acquire` a model with a loader that is only called on a cache
+    miss and `release` it when they are unloaded. Without a RAM budget,
+    unreferenced models are unloaded right away; with one, they stay cached
+    and are evicted least-recently-used first once the total size exceeds
+    the budget. Loading happens outside the registry lock, so different
+    models load concurrently while callers of the same model wait for the
+    first load.
+    """
+    _entries: "OrderedDict[tuple, ModelEntry]" = OrderedDict()
+    _loading: dict[tuple, threading.Event] = {}
+    _load_counts: Counter = Counter()
+    _known_sizes: dict[tuple, int] = {}
+    _lock = threading.RLock()
+    budget_bytes: int = int(BUDGET_MB * 1024 * 1024)
+
+    @classmethod
+    def acquire(cls, name: str, loader: Callable[[], Any], device: str = "cpu", owner=None) -> Any:
+        """
+        Return the cached model for (name, device), loading it on a miss.
+
+        Args:
+            name (str): Unique model identifier, e.g. 'whisper:large-v2'.
+            loader (Callable): Zero-argument function that loads the model.
+            device (str): Device the model lives on.
+            owner (optional): Object holding the reference, so that all of its
+                models can be released at once with `release_owner`.
+        """
+        key = (name, str(device))
+        while True:
+            with cls._lock:
+                entry = cls._entries.get(key)
+                if entry is not None:
+                    entry.hits += 1
+                    return cls._hand_out(entry, owner)
+                loading = cls._loading.get(key)
+                if loading is None:
+                    loading = cls._loading[key] = threading.Event()
+                    # make room up front if we know how big this model was last time
+                    cls._evict(reserve=cls._known_sizes.get(key, 0))
+                    break
+            # another thread is loading this model; if it fails, try ourselves
+            loading.wait()
+
+        try:
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            model = loader()
+            load_time = time.perf_counter() - start
+            size = _model_size(model) or max(_rss_bytes() - rss_before, 0)
+            logger.info(
+                f"Loaded model {name} on {device} in {load_time:.1f}s "
+                f"({size / 1024 ** 2:.0f} MB)"
+            )
+            with cls._lock:
+                entry = ModelEntry(key, model, load_time, size)
+                cls._entries[key] = entry
+                cls._load_counts[key] += 1
+                cls._known_sizes[key] = size
+                return cls._hand_out(entry, owner)
+        finally:
+            with cls._lock:
+                cls._loading.pop(key, None)
+            loading.set()
+
+    @classmethod
+    def _hand_out(cls, entry: ModelEntry, owner) -> Any:
+        cls._entries.move_to_end(entry.key)
+        entry.add(owner)
+        cls._evict()
+        return entry.model
+
+    @classmethod
+    def release(cls, name: str, device: str = "cpu", owner=None) -> None:
+        """Drop one reference to (name, device); the model stays cached."""
+        with cls._lock:
+            entry = cls._entries.get((name, str(device)))
+            if entry is None:
+                return
+            entry.remove(owner, 1)
+            cls._evict()
+
+    @classmethod
+    def release_owner(cls, owner) -> None:
+        """Drop every reference held by `owner`."""
+        with cls._lock:
+            for entry in cls._entries.values():
+                entry.remove(owner)
+            cls._evict()
+
+    @classmethod
+    def clear(cls) -> None:
+        """Unload every model that is not currently referenced."""
+        with cls._lock:
+            for key in [k for k, e in cls._entries.items() if e.refs == 0]:
+                cls._unload(key)
+
+    @classmethod
+    def load_count(cls, name: str, device: str = "cpu") -> int:
+        """How often (name, device) was loaded from disk by this process."""
+        with cls._lock:
+            return cls._load_counts[(name, str(device))]
+
+    @classmethod
+    def stats(cls) -> list[dict]:
+        """Per-model load time, size and usage statistics."""
+        with cls._lock:
+            return [
+                {
+                    "name": name,
+                    "device": device,
+                    "size_mb": round(e.size_bytes / 1024 ** 2, 1),
+                    "load_time_s": round(e.load_time, 2),
+                    "loads": cls._load_counts[(name, device)],
+                    "hits": e.hits,
+                    "refs": e.refs,
+                }
+                for (name, device), e in cls._entries.items()
+            ]
+
+    @classmethod
+    def _total_bytes(cls) -> int:
+        return sum(e.size_bytes for e in cls._entries.values())
+
+    @classmethod
+    def _evict(cls, reserve: int = 0) -> None:
+        """Evict unreferenced models, oldest first, until under budget."""
+        if cls.budget_bytes <= 0:
+            for key in [k for k, e in cls._entries.items() if e.refs == 0]:
+                cls._unload(key)
+            return
+        for key in list(cls._entries):
+            if cls._total_bytes() + reserve <= cls.budget_bytes:
+                return
+            if cls._entries[key].refs == 0:
+                cls._unload(key)
+        if cls._total_bytes() + reserve > cls.budget_bytes:
+            logger.warning(
+                f"Model registry over budget: {cls._total_bytes() / 1024 ** 2:.0f} MB "
+                f"in use, budget {cls.budget_bytes / 1024 ** 2:.0f} MB"
+            )
+
+    @classmethod
+    def _unload(cls, key: tuple) -> None:
+        entry = cls._entries.pop(key)
+        logger.info(f"Evicting model {key[0]} from {key[1]} ({entry.size_bytes / 1024 ** 2:.0f} MB)")
+        del entry
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
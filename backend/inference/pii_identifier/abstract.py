@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from inference.model_registry import ModelRegistry
+
 class PIIStrategy(ABC):
     def __init__(self, language_code: str):
         self.lang = language_code.lower()
@@ -12,6 +14,12 @@ class PIIStrategy(ABC):
         Subclasses must implement this to load their specific NER model.
         """
         raise NotImplementedError("Subclasses must implement load_model()")
+
+    def unload(self):
+        """
+        Release this strategy's models back to the shared ModelRegistry.
+        """
+        ModelRegistry.release_owner(self)
         
     @abstractmethod
     def identify_and_annotate(self, text: str) -> str | None:
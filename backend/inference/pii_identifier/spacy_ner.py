@@ -3,6 +3,7 @@ import spacy
 from typing import List, Tuple, Dict
 from spacy.cli import download as spacy_download
 from importlib import util
+from inference.model_registry import ModelRegistry
 from inference.pii_identifier.abstract import PIIStrategy
 
 class SpacyIdentifier(PIIStrategy):
@@ -56,7 +57,9 @@ class SpacyIdentifier(PIIStrategy):
 
         # Try to load the model
         try:
-            self.nlp = spacy.load(model_name)
+            self.nlp = ModelRegistry.acquire(
+                f"spacy:{model_name}", lambda: spacy.load(model_name), owner=self
+            )
         except Exception as e:
             print(f"Failed to load '{model_name}': {e}")
             self.nlp = None
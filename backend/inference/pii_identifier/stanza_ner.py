@@ -2,6 +2,7 @@ import re
 import sys
 import stanza
 from typing import List, Tuple, Dict
+from inference.model_registry import ModelRegistry
 from inference.pii_identifier.abstract import PIIStrategy
 import torch
 from functools import wraps
@@ -43,7 +44,11 @@ class StanzaIdentifier(PIIStrategy):
             print(f"Warning: Failed to download Stanza model for language '{self.lang}': {e}")
 
         try:
-            self.nlp = stanza.Pipeline(lang=self.lang, processors='tokenize,ner')
+            self.nlp = ModelRegistry.acquire(
+                f"stanza:{self.lang}:tokenize,ner",
+                lambda: stanza.Pipeline(lang=self.lang, processors='tokenize,ner'),
+                owner=self,
+            )
             print(f"Stanza NER initialized for language: {self.lang}")
             print('nlp in identifier initialization', self.nlp)
         except Exception as e:
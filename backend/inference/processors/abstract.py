@@ -3,8 +3,10 @@ import os
 import logging
 import sys
 from pathlib import Path
+from typing import Callable
 import pandas as pd
 from utils.functions import set_global_variables, format_excel_output
+from inference.processors.checkpoint import Checkpoint
 
 # global constants
 LANGUAGES, NO_LATIN, OBLIGATORY_COLUMNS = set_global_variables()
@@ -57,6 +59,17 @@ class DataProcessor(ABC):
         self.instruction = instruction
         self.columns_to_highlight = None
 
+        # checkpointing: finished items are always recorded, but only reused
+        # when resume is set; checkpoint_dir overrides the session folder
+        self.resume = False
+        self.checkpoint_dir: str | None = None
+        self.checkpoint: Checkpoint | None = None
+        # engine options that change the output, part of the checkpoint signature
+        self.transcriptionModel: str | None = None
+        self.diarize: bool | None = None
+        # called with the session directory once its output is written
+        self.on_session_done: Callable[[str], None] | None = None
+
         # base logger; per-session handlers will be attached in _attach_session_handler
         self.logger = logging.getLogger(f"{self.__class__.__name__}")
         self.logger.setLevel(logging.INFO)
@@ -75,7 +88,9 @@ class DataProcessor(ABC):
 
     def _attach_session_handler(self, session_path: str):
         log_name = f"{self.__class__.__name__}.log"
-        log_path = os.path.join(Path(session_path).parent, log_name)
+        # sessions are given as their sheet, or as their folder by transcription
+        log_dir = session_path if os.path.isdir(session_path) else Path(session_path).parent
+        log_path = os.path.join(log_dir, log_name)
 
         # Clear existing handlers to avoid duplicates
         if self.logger.hasHandlers():
@@ -114,16 +129,52 @@ class DataProcessor(ABC):
         files = self._find_files(input_dir)
         for path in files:
             fh = self._attach_session_handler(path)
+            self.checkpoint = self._open_checkpoint(path)
             try:
+                if self.resume and self.checkpoint.is_complete:
+                    self.logger.info(f"Session {path} already finished, skipping")
+                    self._session_finished(path)
+                    continue
                 self.logger.info(f"Processing session {path}")
                 df = self._read_file(path)
                 self.logger.info(f"Loaded DataFrame with {len(df)} rows")
                 df = self._process_dataframe(df)
                 self._write_file(path, df)
+                self._session_finished(path)
             finally:
+                self.checkpoint.flush()
                 self.logger.info(f"Finished session {path}")
                 self._detach_session_handler(fh)
 
+    def _session_finished(self, session_path: str) -> None:
+        self.checkpoint.mark_complete()
+        if self.on_session_done is not None:
+            session_dir = session_path if os.path.isdir(session_path) else os.path.dirname(session_path)
+            self.on_session_done(session_dir)
+
+    def _checkpoint_signature(self) -> str:
+        return (
+            f"{self.__class__.__name__}:{self.language}:{self.instruction}"
+            f":{self.transcriptionModel}:{self.diarize}"
+        )
+
+    def _open_checkpoint(self, session_path: str) -> Checkpoint:
+        session_dir = session_path if os.path.isdir(session_path) else os.path.dirname(session_path)
+        directory = session_dir
+        if self.checkpoint_dir:
+            directory = os.path.join(self.checkpoint_dir, os.path.basename(os.path.normpath(session_dir)))
+        return Checkpoint(directory, self._checkpoint_signature(), resume=self.resume)
+
+    def _finished_item(self, key):
+        """Result an earlier run recorded for this item, when resuming."""
+        if self.resume and self.checkpoint is not None:
+            return self.checkpoint.get(self.__class__.__name__, key)
+        return None
+
+    def _record_item(self, key, value) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.record(self.__class__.__name__, key, value)
+
     def _find_files(self, base_dir: str) -> list[str]:
         matches = []
         for root, _, files in os.walk(base_dir):
@@ -144,6 +195,16 @@ class DataProcessor(ABC):
         if self.columns_to_highlight:
             format_excel_output(path, self.columns_to_highlight)
 
+    def close(self):
+        """
+        Release the models held by this processor's strategies. Call once the
+        processor is no longer needed, e.g. at the end of a job.
+        """
+        for name in ("strategy", "pii_identifier"):
+            strategy = getattr(self, name, None)
+            if strategy is not None and hasattr(strategy, "unload"):
+                strategy.unload()
+
     @abstractmethod
     def _process_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         pass
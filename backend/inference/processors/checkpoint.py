@@ -0,0 +1,73 @@
+import os
+import json
+import time
+import tempfile
+
+
+class Checkpoint:
+    """
+    Progress file kept next to a session (or in an explicit checkpoint
+    directory) that records every finished item, e.g. transcribed audio files
+    or translated rows, and whether the whole session was written. A resumed
+    job reads it back and skips the work that was already done.
+
+    Items are grouped by stage so that several processors of a pipeline can
+    share one checkpoint. The signature ties the checkpoint to the processor
+    configuration; a checkpoint written with a different configuration is
+    ignored, and so is any stored checkpoint when the run is not resuming.
+    """
+    FILENAME = ".tgt_checkpoint.json"
+
+    def __init__(self, directory: str, signature: str, flush_interval: float = 1.0,
+                 resume: bool = True):
+        self.path = os.path.join(directory, self.FILENAME)
+        self.signature = signature
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+        self._dirty = False
+        self.data = {"signature": signature, "complete": False, "stages": {}}
+
+        if resume and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                if stored.get("signature") == signature:
+                    self.data = stored
+            except (OSError, ValueError):
+                pass
+
+    def get(self, stage: str, key: str):
+        """Stored value of a finished item, or None if it was not finished."""
+        return self.data["stages"].get(stage, {}).get(str(key))
+
+    def items(self, stage: str) -> dict:
+        return dict(self.data["stages"].get(stage, {}))
+
+    def record(self, stage: str, key: str, value) -> None:
+        """Mark an item as finished; written to disk at most every flush_interval seconds."""
+        self.data["stages"].setdefault(stage, {})[str(key)] = value
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    @property
+    def is_complete(self) -> bool:
+        return bool(self.data.get("complete"))
+
+    def mark_complete(self) -> None:
+        self.data["complete"] = True
+        self._dirty = True
+        self.flush()
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        # write atomically so a crash never leaves a half-written checkpoint
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        self._last_flush = time.monotonic()
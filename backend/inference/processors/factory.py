@@ -4,12 +4,38 @@ from inference.processors.translation import TranslationProcessor
 from inference.processors.glossing import GlossingProcessor
 from inference.processors.transliteration import Transliterator
 from inference.processors.ColumnCreation import ColumnCreationProcessor
+from inference.processors.pipeline import PipelineProcessor
 
 class ProcessorFactory:
     @staticmethod
-    def get_processor(language: str, action: str, instruction: str, translationModel = None, glossingModel = None) -> DataProcessor:
+    def parse_actions(action: str | list[str]) -> list[str]:
+        """
+        Split an action into its ordered stages, e.g.
+        'transcribe,translate,gloss' -> ['transcribe', 'translate', 'gloss'].
+        """
+        if isinstance(action, str):
+            action = action.split(",")
+        return [a.strip() for a in action if a and a.strip()]
+
+    @staticmethod
+    def get_processor(language: str, action: str | list[str], instruction: str, translationModel = None, glossingModel = None,
+                      transcriptionModel = None, diarize = None) -> DataProcessor:
+        actions = ProcessorFactory.parse_actions(action)
+        if len(actions) > 1:
+            stages = [
+                ProcessorFactory.get_processor(
+                    language, stage, instruction, translationModel, glossingModel,
+                    transcriptionModel, diarize
+                )
+                for stage in actions
+            ]
+            return PipelineProcessor(language, instruction, stages)
+        action = actions[0] if actions else action
+
         if action == "transcribe":
-            return TranscriptionProcessor(language, instruction)
+            return TranscriptionProcessor(
+                language, instruction, transcriptionModel=transcriptionModel, diarize=diarize
+            )
         elif action == "translate":
             return TranslationProcessor(language, instruction, translationModel)
         elif action == "gloss":
@@ -55,10 +55,14 @@ class GlossingProcessor(DataProcessor):
             return df
 
         glossed = []
-        for cell in tqdm(df[col], desc="Glossing rows", total=len(df)):
+        for idx, cell in tqdm(df[col].items(), desc="Glossing rows", total=len(df)):
             if isinstance(cell, str):
-                lines = cell.split("\n")
-                glossed.append("\n".join(self.strategy.gloss(line) for line in lines))
+                gloss = self._finished_item(idx)
+                if gloss is None:
+                    lines = cell.split("\n")
+                    gloss = "\n".join(self.strategy.gloss(line) for line in lines)
+                    self._record_item(idx, gloss)
+                glossed.append(gloss)
             else:
                 glossed.append("")
 
@@ -0,0 +1,84 @@
+import pandas as pd
+
+from inference.processors.abstract import DataProcessor
+from inference.processors.transcription import TranscriptionProcessor
+from inference.processors.ColumnCreation import ColumnCreationProcessor
+
+
+class PipelineProcessor(DataProcessor):
+    """
+    Runs several processors over each session in a single pass. The sheet is
+    located and read once by the first stage, every stage's _process_dataframe
+    is applied in order to the same in-memory DataFrame, and the annotated
+    workbook is written and formatted once at the end.
+    """
+
+    def __init__(self, language: str, instruction: str, stages: list[DataProcessor]):
+        super().__init__(language, instruction)
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        if any(isinstance(s, ColumnCreationProcessor) for s in stages):
+            raise ValueError("'create columns' cannot be part of a pipeline")
+        if any(isinstance(s, TranscriptionProcessor) for s in stages[1:]):
+            raise ValueError("'transcribe' can only be the first stage of a pipeline")
+
+        self.stages = stages
+        self.columns_to_highlight = []
+        for stage in stages:
+            # stages log into the pipeline's session log
+            stage.logger = self.logger
+            cols = stage.columns_to_highlight
+            for col in [cols] if isinstance(cols, str) else (cols or []):
+                if col not in self.columns_to_highlight:
+                    self.columns_to_highlight.append(col)
+
+    def process(self, input_dir: str):
+        first = self.stages[0]
+        for path in first._find_files(input_dir):
+            fh = self._attach_session_handler(path)
+            # stages record their items in the pipeline's checkpoint
+            self.checkpoint = self._open_checkpoint(path)
+            for stage in self.stages:
+                stage.checkpoint, stage.resume = self.checkpoint, self.resume
+
+            try:
+                if self.resume and self.checkpoint.is_complete:
+                    self.logger.info(f"Session {path} already finished, skipping")
+                    self._session_finished(path)
+                    continue
+                self.logger.info(f"Processing session {path}")
+                df = first._read_file(path)
+                self.logger.info(f"Loaded DataFrame with {len(df)} rows")
+                df = self._process_dataframe(df)
+                self._write_file(path, df)
+                self._session_finished(path)
+            finally:
+                self.checkpoint.flush()
+                self.logger.info(f"Finished session {path}")
+                self._detach_session_handler(fh)
+
+    def _checkpoint_signature(self) -> str:
+        stages = ",".join(s._checkpoint_signature() for s in self.stages)
+        return f"{self.__class__.__name__}[{stages}]"
+
+    def _process_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        for stage in self.stages:
+            self.logger.info(f"Running stage {stage.__class__.__name__}")
+            df = stage._process_dataframe(df)
+        return df
+
+    def _write_file(self, path: str, df: pd.DataFrame):
+        # the first stage read the sheet, so it writes it like it would alone
+        # (transcription keeps the column order and writes an annotated copy),
+        # highlighting the columns of every stage
+        first = self.stages[0]
+        own_highlight = first.columns_to_highlight
+        first.columns_to_highlight = self.columns_to_highlight
+        try:
+            first._write_file(path, df)
+        finally:
+            first.columns_to_highlight = own_highlight
+
+    def close(self):
+        for stage in self.stages:
+            stage.close()
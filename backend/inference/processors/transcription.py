@@ -2,6 +2,7 @@ import os
 import re
 import torch
 import warnings
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 import logging
@@ -9,18 +10,24 @@ import logging
 from abc import ABC
 from inference.pii_identifier.factory import PIIIdentifierFactory
 from inference.transcription.factory import TranscriptionStrategyFactory
+from inference.transcription.audio import AudioPrefetcher, file_sha256, load_audio, probe_duration
+from inference.transcription import silence, shards, result_cache, chunking, guard
 from utils.functions import (
     set_global_variables,
     clean_german_transcription,
-    find_ffmpeg,
     format_excel_output,
 )
 from inference.processors.abstract import DataProcessor  # adjust import path as needed
+from inference.processors.trial_index import TrialIndex
 
 # Global setup
 LANGUAGES, NO_LATIN, OBLIGATORY_COLUMNS = set_global_variables()
 warnings.filterwarnings("ignore")
-ffmpeg_path = find_ffmpeg()
+# Audio files handed to the strategy per transcribe_many call
+TRANSCRIBE_BATCH_FILES = int(os.getenv("TRANSCRIBE_BATCH_FILES", "32"))
+# Seconds of audio per batch; the batch being transcribed and the one being
+# decoded ahead hold at most about twice this in memory (64 kB per second)
+TRANSCRIBE_BATCH_SECONDS = float(os.getenv("TRANSCRIBE_BATCH_SECONDS", "900"))
 
 
 class TranscriptionProcessor(DataProcessor):
@@ -28,12 +35,53 @@ class TranscriptionProcessor(DataProcessor):
     Processes directories of audio files, transcribing them into a trials-and-sessions sheet.
     """
 
-    def __init__(self, language: str, instruction: str, device: str | None = None):
+    def __init__(self, language: str, instruction: str, device: str | None = None,
+                 transcriptionModel: str | None = None, diarize: bool | None = None):
         super().__init__(language, instruction)
+        self.transcriptionModel = transcriptionModel
+        self.diarize = diarize
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.pii_identifier = PIIIdentifierFactory.get_strategy(self.language)
-        self.strategy = TranscriptionStrategyFactory.get_strategy(self.language)
-        print('initialized transcription strategy:', self.strategy.__class__.__name__)
+        # on CPU nodes, a session's files can be spread over several processes
+        # that each load their own model
+        self.shard_pool = None
+        if shards.SHARDS > 1:
+            self.strategy = None
+            self.shard_pool = shards.ShardPool(self.language, transcriptionModel, diarize)
+            print('initialized transcription shards:', self.shard_pool.workers)
+        else:
+            self.strategy = TranscriptionStrategyFactory.get_strategy(
+                self.language, transcriptionModel, diarize
+            )
+            print('initialized transcription strategy:', self.strategy.__class__.__name__)
+        self.chunk_long_audio = (
+            self.shard_pool.chunks_long_audio()
+            if self.shard_pool is not None
+            else self.strategy.chunk_long_audio
+        )
+        self.columns_to_highlight = (
+            'transcription_original_script'
+            if self.language in NO_LATIN
+            else 'latin_transcription_everything'
+        )
+        self.transcript_cache = None
+        if result_cache.ENABLED:
+            if self.shard_pool is not None:
+                strategy_name, model_id = self.shard_pool.describe()
+            else:
+                strategy_name, model_id = type(self.strategy).__name__, self.strategy.model_id
+            self.transcript_cache = result_cache.TranscriptCache(
+                strategy_name, model_id, self.language, self.pii_identifier is not None,
+                f"{guard.settings_key()}:{chunking.LONG_SECONDS:g}:{chunking.CHUNK_SECONDS:g}",
+            )
+        # filename -> sha256 of the audio, for storing results in the cache
+        self._audio_hashes: dict[str, str] = {}
+        self.silence_detector = silence.SilenceDetector() if silence.ENABLED else None
+        self.silent_files = 0
+        # files whose transcription was cut short by the decoding guards
+        self.truncated_files: list[str] = []
+        # column -> row -> transcription snippets not yet written to the sheet
+        self._text_parts: dict[str, dict] = {}
         self.filename_regexp = re.compile(
             r'blockNr_(?P<block>\d+)_taskNr_(?P<task>\d+)_trialNr_(?P<trial>\d+).*'
         )
@@ -51,44 +99,278 @@ class TranscriptionProcessor(DataProcessor):
         df, out_file = self.load_trials_data(base_dir)
         self._current_out_file = out_file
         self._current_base_dir = base_dir
+        self._trial_index = TrialIndex(df)
         return df
 
     def _process_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         # iterate over audio files in 'binaries' and append transcriptions
         bin_dir = os.path.join(self._current_base_dir, 'binaries')
-        files = sorted(os.listdir(bin_dir))
-        count = 0
-        for file in tqdm(files, desc="Transcribing audio"):
-            if not file.lower().endswith(('.mp3', '.mp4', '.m4a')):
+        files = [
+            f for f in sorted(os.listdir(bin_dir))
+            if f.lower().endswith(('.mp3', '.mp4', '.m4a'))
+        ]
+        texts = {f: self._finished_item(f) for f in files}
+        pending = [f for f in files if texts[f] is None]
+        pending = self._cached_texts(bin_dir, pending, texts)
+        self.silent_files = 0
+        self.truncated_files = []
+
+        durations = {f: probe_duration(os.path.join(bin_dir, f)) for f in pending}
+        # long recordings are split into chunks instead of being batched whole
+        long_files = [
+            f for f in pending
+            if self.chunk_long_audio and durations[f] > chunking.LONG_SECONDS
+        ]
+        split = set(long_files)
+        local = [f for f in pending if f not in split]
+        if long_files:
+            texts.update(self._transcribe_long(bin_dir, long_files))
+        if self.shard_pool is not None:
+            texts.update(self._transcribe_sharded(bin_dir, local, durations))
+            local = []
+
+        # transcribe in batches so that the strategy can pack many short clips
+        # into one model call, while progress is still checkpointed regularly;
+        # the next batch is decoded in the background while the model runs
+        batches = self._batches(local, durations)
+        with AudioPrefetcher() as prefetcher, tqdm(total=len(local), desc="Transcribing audio") as bar:
+            def decode(batch):
+                return prefetcher.fetch([os.path.join(bin_dir, f) for f in batch])
+
+            upcoming = decode(batches[0]) if batches else []
+            for i, batch in enumerate(batches):
+                decoding = upcoming
+                if i + 1 < len(batches):
+                    upcoming = decode(batches[i + 1])
+                texts.update(self._transcribe_batch(batch, decoding))
+                bar.update(len(batch))
+
+        if self.silent_files:
+            self.logger.info(
+                f"Skipped {self.silent_files} of {len(pending)} recordings without speech"
+            )
+        if self.truncated_files:
+            self.logger.warning(
+                f"Cut short runaway transcriptions of {len(self.truncated_files)} files: "
+                + ", ".join(self.truncated_files)
+            )
+
+        for count, file in enumerate(files, start=1):
+            if texts[file] is None:
                 continue
-            count += 1
-            path = os.path.join(bin_dir, file)
             try:
-                text = self.strategy.transcribe(path)
-                if self.pii_identifier:
-                    _, text = self.pii_identifier.identify_and_annotate(text)
-                if self.language == 'de':
-                    text = clean_german_transcription(text)
                 self.add_transcription_to_df(
                     df,
                     file,
-                    text,
+                    texts[file],
                     count,
                     self.filename_regexp,
                 )
             except Exception as e:
                 self.logger.info(f"Error processing file '{file}': {e}")
+        self._flush_texts(df)
+        summary = self.strategy.session_summary() if self.strategy is not None else None
+        if summary:
+            self.logger.info(summary)
         return df
 
+    @staticmethod
+    def _batches(files: list[str], durations: dict[str, float]) -> list[list[str]]:
+        """
+        Group files into batches of at most TRANSCRIBE_BATCH_FILES files and
+        TRANSCRIBE_BATCH_SECONDS of audio, so that decoding ahead stays
+        bounded in memory however long the recordings are. A recording
+        longer than the limit gets a batch of its own.
+        """
+        batches, seconds = [], 0.0
+        for file in files:
+            duration = durations[file]
+            if not batches or len(batches[-1]) >= TRANSCRIBE_BATCH_FILES or (
+                    batches[-1] and seconds + duration > TRANSCRIBE_BATCH_SECONDS):
+                batches.append([])
+                seconds = 0.0
+            batches[-1].append(file)
+            seconds += duration
+        return batches
+
+    def _cached_texts(self, bin_dir: str, files: list[str], texts: dict) -> list[str]:
+        """
+        Fill `texts` with the cached transcriptions of `files` and return the
+        files that still have to go through the model.
+        """
+        self._audio_hashes = {}
+        if self.transcript_cache is None:
+            return files
+        self.transcript_cache.reset_stats()
+        missing = []
+        for file in files:
+            try:
+                digest = file_sha256(os.path.join(bin_dir, file))
+            except OSError as e:
+                self.logger.info(f"Error processing file '{file}': {e}")
+                missing.append(file)
+                continue
+            self._audio_hashes[file] = digest
+            text = self.transcript_cache.get(digest)
+            if text is None:
+                missing.append(file)
+            else:
+                self._record_item(file, text)
+                texts[file] = text
+        self.logger.info(
+            f"Transcript cache: {self.transcript_cache.hits} hits, "
+            f"{self.transcript_cache.misses} misses"
+        )
+        return missing
+
+    def _cache_text(self, file: str, text: str, segments: list | None = None) -> None:
+        digest = self._audio_hashes.get(file)
+        if self.transcript_cache is not None and digest is not None:
+            self.transcript_cache.put(digest, text, segments)
+
+    def _transcribe_batch(self, files: list[str], decoding: list) -> dict:
+        """
+        Transcribe a batch of audio files with the strategy's batched API,
+        given the futures of their decoded waveforms. If the batch fails,
+        files are retried one by one so that a single broken recording only
+        loses its own transcription.
+        """
+        texts, names, audios = {}, [], []
+        for file, future in zip(files, decoding):
+            try:
+                audio = future.result()
+            except Exception as e:
+                self.logger.info(f"Error processing file '{file}': {e}")
+                continue
+            if self.silence_detector is not None and self.silence_detector.is_silent(audio):
+                # no speech: keep the ASR model from hallucinating text
+                self.silent_files += 1
+                self._record_item(file, "")
+                self._cache_text(file, "")
+                texts[file] = ""
+                continue
+            names.append(file)
+            audios.append(audio)
+
+        if not audios:
+            return texts
+        try:
+            raw = dict(zip(names, self.strategy.transcribe_many(audios)))
+        except Exception as e:
+            self.logger.info(f"Batch transcription failed ({e}); retrying files one by one")
+            raw = {}
+            for file, audio in zip(names, audios):
+                try:
+                    raw[file] = self.strategy.transcribe(audio)
+                except Exception as e:
+                    self.logger.info(f"Error processing file '{file}': {e}")
+
+        for file, text in raw.items():
+            text = self._finish_text(file, text)
+            if text is not None:
+                texts[file] = text
+        return texts
+
+    def _transcribe_long(self, bin_dir: str, files: list[str]) -> dict:
+        """
+        Transcribe long recordings one at a time, split at pauses into chunks
+        that are transcribed together: spread over the shard workers, or
+        batched by the strategy, which keeps every core busy instead of
+        decoding the recording window after window. The chunk texts are
+        joined in order, with their time spans kept as segments.
+        """
+        texts = {}
+        for file in tqdm(files, desc="Transcribing long recordings"):
+            try:
+                audio = load_audio(os.path.join(bin_dir, file))
+                bounds = chunking.split_on_silence(audio)
+                results = self._transcribe_chunks([np.array(audio[s:e]) for s, e in bounds])
+            except Exception as e:
+                self.logger.info(f"Error processing file '{file}': {e}")
+                continue
+            error = next((error for _, _, error in results if error is not None), None)
+            if error is not None:
+                # a missing chunk would leave a gap in the transcript
+                self.logger.info(f"Error processing file '{file}': {error}")
+                continue
+            if all(silent for _, silent, _ in results):
+                self.silent_files += 1
+                self._record_item(file, "")
+                self._cache_text(file, "")
+                texts[file] = ""
+                continue
+            text, segments = chunking.stitch(bounds, [text for text, _, _ in results])
+            text = self._finish_text(file, text, segments)
+            if text is not None:
+                texts[file] = text
+        return texts
+
+    def _transcribe_chunks(self, chunks: list) -> list[tuple]:
+        """(text, silent, error) for each waveform chunk of one recording."""
+        if self.shard_pool is not None:
+            return self.shard_pool.transcribe_chunks(chunks)
+        results = [("", True, None)] * len(chunks)
+        speech = [
+            i for i, chunk in enumerate(chunks)
+            if self.silence_detector is None or not self.silence_detector.is_silent(chunk)
+        ]
+        if speech:
+            decoded = self.strategy.transcribe_many([chunks[i] for i in speech])
+            for i, text in zip(speech, decoded):
+                results[i] = (text, False, None)
+        return results
+
+    def _transcribe_sharded(self, bin_dir: str, files: list[str], durations: dict[str, float]) -> dict:
+        """Transcribe files across the shard pool; results are merged by filename."""
+        texts = {}
+        paths = [os.path.join(bin_dir, f) for f in files]
+        known = {os.path.join(bin_dir, f): durations[f] for f in files}
+        with tqdm(total=len(paths), desc="Transcribing audio (sharded)") as bar:
+            for path, text, silent, error in self.shard_pool.transcribe(paths, known):
+                file = os.path.basename(path)
+                bar.update(1)
+                if error is not None:
+                    self.logger.info(f"Error processing file '{file}': {error}")
+                    continue
+                if silent:
+                    self.silent_files += 1
+                    self._record_item(file, "")
+                    self._cache_text(file, "")
+                    texts[file] = ""
+                    continue
+                text = self._finish_text(file, text)
+                if text is not None:
+                    texts[file] = text
+        return texts
+
+    def _finish_text(self, file: str, text: str | None, segments: list | None = None) -> str | None:
+        """Annotate PII, clean up and checkpoint a raw transcription."""
+        if text is None:
+            return None
+        if getattr(text, "truncated", False):
+            self.truncated_files.append(file)
+        try:
+            if self.pii_identifier:
+                _, text = self.pii_identifier.identify_and_annotate(text)
+            if self.language == 'de':
+                text = clean_german_transcription(text)
+        except Exception as e:
+            self.logger.info(f"Error processing file '{file}': {e}")
+            return None
+        self._record_item(file, text)
+        self._cache_text(file, text, segments)
+        return text
+
+    def close(self):
+        super().close()
+        if self.shard_pool is not None:
+            self.shard_pool.close()
+            self.shard_pool = None
+
     def _write_file(self, _: str, df: pd.DataFrame):
         # write out annotated sheet and apply formatting
         df.to_excel(self._current_out_file, index=False)
-        highlight_col = (
-            'transcription_original_script'
-            if self.language in NO_LATIN
-            else 'latin_transcription_everything'
-        )
-        format_excel_output(self._current_out_file, highlight_col)
+        format_excel_output(self._current_out_file, self.columns_to_highlight)
 
     def load_trials_data(self, base_dir: str):
         csv_file = os.path.join(base_dir, 'trials_and_sessions.csv')
@@ -114,22 +396,38 @@ class TranscriptionProcessor(DataProcessor):
         return df, excel_out
 
     def _append_to_cell(self, df, idx, column, text):
-        old = df.at[idx, column]
-        df.at[idx, column] = ("" if pd.isna(old) else old) + text
+        # collected per row and written with one assignment per column in
+        # _flush_texts, instead of rebuilding the cell string for every file
+        self._text_parts.setdefault(column, {}).setdefault(idx, []).append(text)
+
+    def _flush_texts(self, df):
+        """Append the collected texts to their cells, keeping what the cells already hold."""
+        for column, parts in self._text_parts.items():
+            rows = list(parts)
+            if column in df.columns and df[column].dtype != object:
+                # empty columns are read from Excel as float NaN
+                df[column] = df[column].astype(object)
+            old = df[column].reindex(rows) if column in df.columns else pd.Series("", index=rows)
+            new = pd.Series(["".join(p) for p in parts.values()], index=rows)
+            df.loc[rows, column] = old.fillna("").astype(str) + new
+        self._text_parts = {}
 
     def add_transcription_to_df(
         self, df, file, transcription, count, filename_regexp
     ):
-        series = df[df.isin([file])].stack()
+        index = getattr(self, "_trial_index", None)
+        if index is None:
+            index = self._trial_index = TrialIndex(df)
+        rows = index.filename_rows(file)
         text_auto = f"{count}: {transcription}"
-        suffix = " - " if series.empty else " "
+        suffix = " - " if not rows else " "
         col_name = (
             'transcription_original_script'
             if self.language in NO_LATIN
             else 'latin_transcription_everything'
         )
 
-        if series.empty:
+        if not rows:
             match = filename_regexp.search(file)
             if not match:
                 self.logger.info(
@@ -139,12 +437,8 @@ class TranscriptionProcessor(DataProcessor):
             blk = int(match['block'])
             tsk = int(match['task'])
             trl = int(match['trial'])
-            cond = (
-                (df['Block_Nr'] == blk)
-                & (df['Task_Nr'] == tsk)
-                & (df['Trial_Nr'] == trl)
-            )
-            if df.loc[cond].empty:
+            trial_rows = index.trial_rows(blk, tsk, trl)
+            if not trial_rows:
                 self.logger.info(
                     f"No row for block {blk}, task {tsk}, trial {trl}. Skipping '{file}'."
                 )
@@ -153,14 +447,14 @@ class TranscriptionProcessor(DataProcessor):
                 f"missing_filename_{i}"
                 for i in range(1, 10)
                 if f"missing_filename_{i}" not in df.columns
-                or df.loc[cond, f"missing_filename_{i}"].isna().all()
+                or df.loc[trial_rows, f"missing_filename_{i}"].isna().all()
             )
-            df.loc[cond, miss_col] = file
-            for idx in df.loc[cond].index:
+            df.loc[trial_rows, miss_col] = file
+            for idx in trial_rows:
                 self._append_to_cell(df, idx, 'automatic_transcription', text_auto + suffix)
                 self._append_to_cell(df, idx, col_name,      text_auto + suffix)
         else:
-            for (row_idx, _), _ in series.items():
+            for row_idx in rows:
                 self._append_to_cell(df, row_idx, 'automatic_transcription', text_auto + suffix)
                 self._append_to_cell(df, row_idx, col_name,      text_auto + suffix)
     
@@ -174,13 +468,20 @@ class TranscriptionProcessor(DataProcessor):
             fh = logging.FileHandler(log_path, mode="a")
             fh.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
             self.logger.addHandler(fh)
+            self.checkpoint = self._open_checkpoint(path)
 
             try:
+                if self.resume and self.checkpoint.is_complete:
+                    self.logger.info(f"Session {path} already finished, skipping")
+                    self._session_finished(path)
+                    continue
                 self.logger.info(f"Processing Session {path}")
                 df = self._read_file(path)
                 self.logger.info(f"Loaded DataFrame with {len(df)} rows")
                 df = self._process_dataframe(df)
                 self._write_file(path, df)
+                self._session_finished(path)
             finally:
+                self.checkpoint.flush()
                 self.logger.removeHandler(fh)
                 fh.close()
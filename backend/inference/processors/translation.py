@@ -4,16 +4,12 @@ from tqdm import tqdm
 
 from inference.translation.factory import TranslationStrategyFactory
 from inference.translation.abstract import TranslationStrategy
-from utils.functions import (
-    set_global_variables,
-    find_ffmpeg,
-)
+from utils.functions import set_global_variables
 from inference.processors.abstract import DataProcessor  # adjust import path as needed
 
 # Global setup
 LANGUAGES, NO_LATIN, OBLIGATORY_COLUMNS = set_global_variables()
 warnings.filterwarnings("ignore")
-ffmpeg_path = find_ffmpeg()
 
 
 class TranslationProcessor(DataProcessor):
@@ -71,9 +67,12 @@ class TranslationProcessor(DataProcessor):
             if pd.isna(text) or not str(text).strip():
                 continue
             try:
-                translation = self.strategy.translate(str(text))
-                if not translation:
-                    continue
+                translation = self._finished_item(idx)
+                if translation is None:
+                    translation = self.strategy.translate(str(text))
+                    if not translation:
+                        continue
+                    self._record_item(idx, translation)
                 for target_col in cols_map[self.instruction]:
                     df.at[idx, target_col] = translation
             except Exception as e:
@@ -0,0 +1,42 @@
+from collections import defaultdict
+from numbers import Number
+
+import pandas as pd
+
+
+def _as_int(value) -> int | None:
+    """Integer value of a numeric cell (1 or 1.0), None for anything else."""
+    if isinstance(value, bool) or not isinstance(value, Number) or pd.isna(value):
+        return None
+    return int(value) if value == int(value) else None
+
+
+class TrialIndex:
+    """
+    Lookup tables of a trials sheet, built once when the sheet is loaded, so
+    that every audio file is placed in constant time instead of scanning the
+    whole sheet:
+
+    - filename -> row labels of the cells holding exactly that filename, in
+      row-major order, once per matching cell (as `df[df.isin([f])].stack()`)
+    - (block, task, trial) -> row labels of that trial
+    """
+    def __init__(self, df: pd.DataFrame):
+        self.by_filename: dict[str, list] = defaultdict(list)
+        for row, values in zip(df.index, df.itertuples(index=False, name=None)):
+            for value in values:
+                if isinstance(value, str):
+                    self.by_filename[value].append(row)
+
+        self.by_trial: dict[tuple[int, int, int], list] = defaultdict(list)
+        if {"Block_Nr", "Task_Nr", "Trial_Nr"}.issubset(df.columns):
+            for row, blk, tsk, trl in zip(df.index, df["Block_Nr"], df["Task_Nr"], df["Trial_Nr"]):
+                key = (_as_int(blk), _as_int(tsk), _as_int(trl))
+                if None not in key:
+                    self.by_trial[key].append(row)
+
+    def filename_rows(self, filename: str) -> list:
+        return self.by_filename.get(filename, [])
+
+    def trial_rows(self, block: int, task: int, trial: int) -> list:
+        return self.by_trial.get((block, task, trial), [])
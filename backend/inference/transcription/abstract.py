@@ -3,10 +3,24 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from dotenv import load_dotenv
 
+from inference.model_registry import ModelRegistry
+from inference.transcription.audio import SAMPLE_RATE
+from inference.transcription.guard import (
+    MAX_COMPRESSION_RATIO,
+    Transcript,
+    compression_ratio,
+    token_budget,
+    trim_repetitions,
+)
+
 _this_file = Path(__file__).resolve()
 parent_dir = _this_file.parent.parent.parent
 
 class TranscriptionStrategy(ABC):
+    # long recordings are split at pauses and their chunks transcribed
+    # together (see inference.transcription.chunking)
+    chunk_long_audio = True
+
     def __init__(self, language_code: str, device: str = "cpu"):
         self.language_code = language_code.lower()
         self.device = device
@@ -38,15 +52,60 @@ class TranscriptionStrategy(ABC):
         raise NotImplementedError(
             "Subclasses must implement load_model() to initialize their transcription models. "
         )
+
+    @property
+    def model_id(self) -> str:
+        """
+        Identifies the weights and settings that shape this strategy's output,
+        so that cached transcriptions are only reused for the same model.
+        """
+        return ""
+
+    def max_new_tokens(self, audio) -> int:
+        """Output token budget of one 30 s window of `audio`, derived from its duration."""
+        return token_budget(min(len(audio) / SAMPLE_RATE, 30))
+
+    def guard(self, text: str | None, cut_short: bool = False) -> Transcript | None:
+        """
+        Drop runaway repetitions from a decoded text that looks like a loop:
+        it was stopped by its token budget (`cut_short`) or compresses too
+        well. The result is flagged as truncated when repetitions were
+        dropped, when what is left still compresses like a loop, or when the
+        decoder was cut short.
+        """
+        if text is None:
+            return None
+        trimmed, repeated = text, False
+        if cut_short or compression_ratio(text) > MAX_COMPRESSION_RATIO:
+            trimmed, repeated = trim_repetitions(text)
+        result = Transcript(trimmed)
+        result.truncated = (
+            repeated or cut_short or compression_ratio(trimmed) > MAX_COMPRESSION_RATIO
+        )
+        return result
+
+    def session_summary(self) -> str | None:
+        """
+        One line of statistics about the files transcribed since the last
+        call, written to the session log; the counters start over afterwards.
+        None when the strategy has nothing to report.
+        """
+        return None
+
+    def unload(self):
+        """
+        Release this strategy's models back to the shared ModelRegistry.
+        """
+        ModelRegistry.release_owner(self)
         
     @abstractmethod
-    def transcribe(self, text: str) -> str | None:
+    def transcribe(self, audio) -> str | None:
         """
-        Transcribe the given text using the model implemented by the subclass.
+        Transcribe the given audio using the model implemented by the subclass.
 
         Arguments:
-            text (str): The input string to transcribe, which could be a result of speech recognition
-                        or another input source depending on the use case.
+            audio (str | np.ndarray): Path of an audio file, or its waveform already decoded
+                        to 16 kHz mono float32 (see transcription.audio.load_audio).
 
         Returns:
             str | None: The transcribed (processed) version of the input text,
@@ -55,3 +114,15 @@ class TranscriptionStrategy(ABC):
         This method must be implemented by subclasses to define their core logic.
         """
         raise NotImplementedError("Subclasses must implement transcribe()")
+
+    def transcribe_many(self, paths: list) -> list[str | None]:
+        """
+        Transcribe several audio files, returning one result per path in the
+        same order. Like transcribe(), it accepts file paths or waveforms
+        already decoded to 16 kHz mono float32 (see transcription.audio).
+
+        The default transcribes the files one by one. Strategies that can
+        batch work across files (e.g. many short trial recordings) override
+        it to keep their model's batches full.
+        """
+        return [self.transcribe(path) for path in paths]
@@ -0,0 +1,229 @@
+import os
+import shutil
+import hashlib
+import functools
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from utils.functions import find_ffmpeg
+
+try:
+    import av
+except ImportError:
+    av = None
+
+logger = logging.getLogger(__name__)
+
+# Sample rate every transcription model in this package expects
+SAMPLE_RATE = 16000
+# "auto" decodes in-process with PyAV when installed, "ffmpeg" always runs the ffmpeg binary
+DECODER = os.getenv("AUDIO_DECODER", "auto")
+# Threads decoding upcoming audio files while the model runs
+DECODE_WORKERS = int(os.getenv("AUDIO_DECODE_WORKERS", "2"))
+# Directory of the decoded-audio cache; caching is off when unset
+CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", "")
+# Size cap of the cache in MB, least recently used files are evicted first
+CACHE_MAX_MB = float(os.getenv("AUDIO_CACHE_MAX_MB", "10240"))
+
+
+def file_sha256(path: str) -> str:
+    """
+    sha256 of a file's bytes. Memoized per (path, size, mtime), so that the
+    audio and transcript caches read every recording only once per job.
+    """
+    st = os.stat(path)
+    return _sha256(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4096)
+def _sha256(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """
+    Decoded waveforms stored as .npy files, keyed by the content hash of the
+    source file and the sample rate, so re-running a session (other language,
+    new model, resumed job) skips ffmpeg. Entries are opened as read-only
+    memory maps, so strategies read them without copying.
+    """
+    directory: str = CACHE_DIR
+    max_bytes: int = int(CACHE_MAX_MB * 1024 * 1024)
+    _lock = threading.Lock()
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return bool(cls.directory)
+
+    @classmethod
+    def _entry(cls, path: str, sr: int) -> str:
+        return os.path.join(cls.directory, f"{file_sha256(path)}_{sr}.npy")
+
+    @classmethod
+    def load(cls, path: str, sr: int) -> np.ndarray:
+        """Waveform of `path` from the cache, decoding and storing it on a miss."""
+        entry = cls._entry(path, sr)
+        try:
+            audio = np.load(entry, mmap_mode="r")
+            os.utime(entry)  # mark as recently used
+            return audio
+        except (OSError, ValueError):
+            pass
+
+        audio = _decode(path, sr)
+        try:
+            cls._store(entry, audio)
+            return np.load(entry, mmap_mode="r")
+        except OSError as e:
+            logger.warning(f"Could not cache decoded audio of {path}: {e}")
+            return audio
+
+    @classmethod
+    def _store(cls, entry: str, audio: np.ndarray) -> None:
+        os.makedirs(cls.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cls.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, audio)
+        os.replace(tmp_path, entry)
+        cls._evict()
+
+    @classmethod
+    def _evict(cls) -> None:
+        with cls._lock:
+            entries = []
+            for name in os.listdir(cls.directory):
+                if name.endswith(".npy"):
+                    try:
+                        st = os.stat(os.path.join(cls.directory, name))
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= cls.max_bytes:
+                    break
+                try:
+                    # open memory maps stay valid after the file is unlinked
+                    os.remove(os.path.join(cls.directory, name))
+                    total -= size
+                except OSError:
+                    pass
+
+
+def probe_duration(path: str) -> float:
+    """Duration of a media file in seconds via PyAV or ffprobe, or its size as a fallback proxy."""
+    if av is not None:
+        try:
+            with av.open(path, metadata_errors="ignore") as container:
+                if container.duration is not None:
+                    return container.duration / av.time_base
+        except av.FFmpegError:
+            pass
+    ffmpeg = find_ffmpeg() or "ffmpeg"
+    ffprobe = shutil.which("ffprobe") or os.path.join(os.path.dirname(ffmpeg), "ffprobe")
+    try:
+        out = subprocess.run(
+            [ffprobe, "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", path],
+            capture_output=True, check=True, text=True,
+        ).stdout
+        return float(out.strip())
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        # roughly proportional to the duration for compressed audio
+        return os.path.getsize(path) / 16000
+
+
+def load_audio(path: str, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode an audio file to a mono float32 waveform in [-1, 1], through the
+    AudioCache when AUDIO_CACHE_DIR is set.
+
+    Args:
+        path (str): Audio or video file readable by ffmpeg (PyAV or the ffmpeg binary).
+        sr (int): Target sample rate.
+
+    Returns:
+        np.ndarray: 1-D float32 samples (a read-only memory map when cached).
+    """
+    if AudioCache.enabled():
+        return AudioCache.load(path, sr)
+    return _decode(path, sr)
+
+
+def _decode(path: str, sr: int) -> np.ndarray:
+    if av is not None and DECODER != "ffmpeg":
+        try:
+            return _decode_av(path, sr)
+        except (av.FFmpegError, IndexError) as e:
+            logger.info(f"PyAV could not decode {path} ({e}); falling back to ffmpeg")
+    return _decode_ffmpeg(path, sr)
+
+
+def _decode_av(path: str, sr: int) -> np.ndarray:
+    """
+    Decode with libav in this process, saving the ffmpeg process start and
+    pipe copy per clip. Resamples to the same s16 mono output as the
+    ffmpeg command, so both paths produce identical waveforms.
+    """
+    chunks = []
+    with av.open(path, metadata_errors="ignore") as container:
+        stream = container.streams.audio[0]
+        stream.thread_type = "AUTO"
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=sr)
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        # drain the samples still buffered in the resampler
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().reshape(-1))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32) / 32768.0
+
+
+def _decode_ffmpeg(path: str, sr: int) -> np.ndarray:
+    cmd = [
+        find_ffmpeg() or "ffmpeg",
+        "-nostdin", "-threads", "0",
+        "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr),
+        "-",
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio {path}: {e.stderr.decode(errors='ignore')}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+class AudioPrefetcher:
+    """
+    Bounded thread pool that decodes audio files ahead of the model. PyAV
+    releases the GIL while decoding and ffmpeg runs in a subprocess, so
+    either way decoding overlaps with inference, and the decoded buffers are
+    handed over without copies.
+    """
+    def __init__(self, workers: int = DECODE_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="audio-decode")
+
+    def fetch(self, paths: list[str]) -> list[Future]:
+        """Start decoding `paths`; each future resolves to the waveform of one file."""
+        return [self._pool.submit(load_audio, path) for path in paths]
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
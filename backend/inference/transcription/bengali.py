@@ -1,15 +1,24 @@
 import torch
 from transformers import pipeline
+from inference.model_registry import ModelRegistry
 from inference.transcription.abstract import TranscriptionStrategy
+from inference.transcription.audio import SAMPLE_RATE, load_audio
 
 
 class BengaliStrategy(TranscriptionStrategy):
+    model_id = "mozilla-ai/whisper-large-v3-bn"
+
     def load_model(self):
         self.device = 0 if (torch.cuda.is_available()) else "cpu"
-        self.whisper_asr = pipeline(
-            "automatic-speech-recognition",
-            model="mozilla-ai/whisper-large-v3-bn",
-            device=self.device
+        self.whisper_asr = ModelRegistry.acquire(
+            "hf-asr:mozilla-ai/whisper-large-v3-bn",
+            lambda: pipeline(
+                "automatic-speech-recognition",
+                model="mozilla-ai/whisper-large-v3-bn",
+                device=self.device
+            ),
+            self.device,
+            owner=self,
         )
 
     def transcribe(self, path_to_audio: str):
@@ -17,7 +26,11 @@ class BengaliStrategy(TranscriptionStrategy):
             self.whisper_asr.tokenizer.get_decoder_prompt_ids(language=self.language_code, task="transcribe")
         )
 
-        result = self.whisper_asr(path_to_audio)
-        result = result.get("text", "").strip()
+        audio = load_audio(path_to_audio) if isinstance(path_to_audio, str) else path_to_audio
+        result = self.whisper_asr(
+            {"raw": audio, "sampling_rate": SAMPLE_RATE},
+            generate_kwargs={"max_new_tokens": self.max_new_tokens(audio)},
+        )
+        result = self.guard(result.get("text", "").strip())
         print(result)
         return result
\ No newline at end of file
@@ -0,0 +1,93 @@
+import os
+from typing import Callable
+
+from inference.transcription.abstract import TranscriptionStrategy
+from inference.transcription.whisper import WhisperStrategy
+
+# Whisper model that transcribes every clip first
+DRAFT_MODEL = os.getenv("CASCADE_DRAFT_MODEL", "small")
+# Draft transcriptions outside these bounds are redone by the full model
+MIN_AVG_LOGPROB = float(os.getenv("CASCADE_MIN_AVG_LOGPROB", "-0.7"))
+MAX_NO_SPEECH_PROB = float(os.getenv("CASCADE_MAX_NO_SPEECH_PROB", "0.5"))
+MAX_COMPRESSION_RATIO = float(os.getenv("CASCADE_MAX_COMPRESSION_RATIO", "2.4"))
+
+
+class CascadeStrategy(TranscriptionStrategy):
+    """
+    Transcribes with a small Whisper model first and re-runs only the clips
+    it is unsure about on the language's full strategy (large-v2). Most
+    trial utterances are short and clear, so the large model only sees a
+    fraction of them. The share of escalated clips is reported per session
+    to tune the thresholds.
+    """
+    def __init__(self, language_code: str, final: Callable[[], TranscriptionStrategy],
+                 device: str = "cpu", draft_size: str | None = None):
+        """
+        Args:
+            language_code (str): Language of the recordings.
+            final (Callable): Builds the strategy unsure clips are escalated to.
+            device (str): Device of the draft model.
+            draft_size (str, optional): Whisper size of the draft model; defaults to DRAFT_MODEL.
+        """
+        self.draft_size = draft_size or DRAFT_MODEL
+        self._build_final = final
+        self.clips = 0
+        self.escalated = 0
+        super().__init__(language_code, device)
+
+    @property
+    def chunk_long_audio(self) -> bool:
+        return self.final.chunk_long_audio
+
+    @property
+    def model_id(self) -> str:
+        return (
+            f"{self.draft_size}>{type(self.final).__name__}:{self.final.model_id}"
+            f":lp{MIN_AVG_LOGPROB}:ns{MAX_NO_SPEECH_PROB}:cr{MAX_COMPRESSION_RATIO}"
+        )
+
+    def load_model(self):
+        self.draft = WhisperStrategy(self.language_code, self.device, model_size=self.draft_size)
+        self.final = self._build_final()
+
+    @staticmethod
+    def confident(scores: dict) -> bool:
+        return (
+            scores["avg_logprob"] >= MIN_AVG_LOGPROB
+            and scores["no_speech_prob"] <= MAX_NO_SPEECH_PROB
+            and scores["compression_ratio"] <= MAX_COMPRESSION_RATIO
+        )
+
+    def transcribe(self, path_to_audio):
+        return self.transcribe_many([path_to_audio])[0]
+
+    def transcribe_many(self, paths):
+        drafts = self.draft.transcribe_scored(paths)
+        results = [text for text, _ in drafts]
+        unsure = [
+            i for i, (text, scores) in enumerate(drafts)
+            if not self.confident(scores) or getattr(text, "truncated", False)
+        ]
+        self.clips += len(paths)
+        self.escalated += len(unsure)
+        if unsure:
+            final = self.final.transcribe_many([paths[i] for i in unsure])
+            for i, text in zip(unsure, final):
+                results[i] = text
+        return results
+
+    def session_summary(self) -> str | None:
+        if not self.clips:
+            return None
+        summary = (
+            f"Cascade escalated {self.escalated} of {self.clips} clips "
+            f"({self.escalated / self.clips:.0%}) from whisper {self.draft_size} "
+            f"to {type(self.final).__name__}"
+        )
+        self.clips = self.escalated = 0
+        return summary
+
+    def unload(self):
+        self.draft.unload()
+        self.final.unload()
+        super().unload()
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+
+from inference.transcription.audio import SAMPLE_RATE
+from inference.transcription.guard import Transcript
+from inference.transcription.silence import FRAME_MS, frame_levels
+
+# Recordings longer than this (seconds) are split into chunks transcribed in parallel
+LONG_SECONDS = float(os.getenv("TRANSCRIBE_LONG_SECONDS", "300"))
+# Upper bound of a chunk; matches Whisper's 30 s window by default
+CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "30"))
+
+
+def split_on_silence(audio: np.ndarray, sr: int = SAMPLE_RATE,
+                     max_seconds: float = CHUNK_SECONDS) -> list[tuple[int, int]]:
+    """
+    Split a long recording into consecutive chunks of at most `max_seconds`.
+    Each cut is placed at the quietest frame in the second half of the
+    allowed span, so chunks end in pauses rather than mid-word.
+
+    Args:
+        audio (np.ndarray): Mono waveform.
+        sr (int): Sample rate of `audio`.
+        max_seconds (float): Longest chunk.
+
+    Returns:
+        list[tuple[int, int]]: (start, end) sample offsets covering the whole recording.
+    """
+    frame_len = int(sr * FRAME_MS / 1000)
+    max_frames = max(int(max_seconds * 1000 / FRAME_MS), 2)
+    levels = frame_levels(audio, sr)
+
+    bounds, start = [], 0
+    while len(levels) - start > max_frames:
+        window = levels[start + max_frames // 2:start + max_frames]
+        cut = start + max_frames // 2 + int(np.argmin(window))
+        bounds.append((start * frame_len, cut * frame_len))
+        start = cut
+    bounds.append((start * frame_len, len(audio)))
+    return bounds
+
+
+def stitch(bounds: list[tuple[int, int]], texts: list[str | None],
+           sr: int = SAMPLE_RATE) -> tuple[Transcript, list[dict]]:
+    """
+    Join the transcriptions of consecutive chunks into one text.
+
+    Returns:
+        tuple[Transcript, list[dict]]: The text, truncated if any chunk was,
+            and its {"start", "end", "text"} segments with times in seconds.
+    """
+    segments, truncated = [], False
+    for (start, end), text in zip(bounds, texts):
+        truncated = truncated or getattr(text, "truncated", False)
+        if text and text.strip():
+            segments.append({"start": round(start / sr, 3), "end": round(end / sr, 3), "text": text.strip()})
+    joined = Transcript(" ".join(seg["text"] for seg in segments))
+    joined.truncated = truncated
+    return joined, segments
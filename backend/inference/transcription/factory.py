@@ -2,14 +2,42 @@ from inference.transcription.abstract import TranscriptionStrategy
 from inference.transcription.whisperx import WhisperxStrategy
 from inference.transcription.whisper import WhisperStrategy
 from inference.transcription.bengali import BengaliStrategy
+from inference.transcription.fasterwhisper import FasterWhisperStrategy
+from inference.transcription.cascade import CascadeStrategy
 
 
 
 class TranscriptionStrategyFactory:
+    # engines that can be requested per job, e.g. 'faster-whisper' or 'faster-whisper:medium';
+    # 'cascade:small' drafts with whisper small and escalates to the language's default engine
+    ENGINES = {
+        "whisperx": WhisperxStrategy,
+        "whisper": WhisperStrategy,
+        "faster-whisper": FasterWhisperStrategy,
+        "cascade": CascadeStrategy,
+    }
+
     @staticmethod
-    def get_strategy(language_code: str) -> TranscriptionStrategy:
+    def get_strategy(language_code: str, engine: str | None = None,
+                     diarize: bool | None = None) -> TranscriptionStrategy:
+        if engine:
+            name, _, size = engine.partition(":")
+            if name not in TranscriptionStrategyFactory.ENGINES:
+                raise ValueError(f"Unknown transcription engine: {engine}")
+            if name == "faster-whisper":
+                return FasterWhisperStrategy(language_code, model_size=size or None)
+            if name == "cascade":
+                return CascadeStrategy(
+                    language_code,
+                    lambda: TranscriptionStrategyFactory.get_strategy(language_code, diarize=diarize),
+                    draft_size=size or None,
+                )
+            if name == "whisperx":
+                return WhisperxStrategy(language_code, diarize=diarize)
+            return TranscriptionStrategyFactory.ENGINES[name](language_code)
+
         if language_code in ['en', 'fr', 'de', 'es', 'it']:
-            return WhisperxStrategy(language_code)
+            return WhisperxStrategy(language_code, diarize=diarize)
         elif language_code in ['ar', 'et', 'ja', 'nl', 'uk', 'pt', 'cs',
                              'ru', 'pl', 'hu', 'fi', 'fa', 'el', 'tr', 'da', 'he', 'vi', 'ko',
                              'ur', 'te', 'hi', 'ca', 'ml', 'no', 'nn', 'sk', 'sl', 'hr', 'ro',
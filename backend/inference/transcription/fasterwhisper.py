@@ -0,0 +1,59 @@
+import os
+from faster_whisper import WhisperModel
+
+from inference.model_registry import ModelRegistry
+from inference.transcription.abstract import TranscriptionStrategy
+from inference.transcription.audio import load_audio
+
+# Defaults, overridable per strategy instance
+MODEL_SIZE = os.getenv("FASTER_WHISPER_MODEL", "large-v2")
+COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")
+BEAM_SIZE = int(os.getenv("FASTER_WHISPER_BEAM_SIZE", "5"))
+# 0 lets CTranslate2 pick the number of threads
+CPU_THREADS = int(os.getenv("FASTER_WHISPER_CPU_THREADS", "0"))
+
+
+class FasterWhisperStrategy(TranscriptionStrategy):
+    """
+    Whisper on the CTranslate2 runtime (faster-whisper), quantized to int8 by
+    default. Meant for CPU-only nodes, where it runs several times faster
+    than fp32 PyTorch Whisper at a similar word error rate.
+    """
+    def __init__(self, language_code: str, device: str = "cpu", model_size: str | None = None,
+                 compute_type: str = COMPUTE_TYPE, beam_size: int = BEAM_SIZE,
+                 cpu_threads: int = CPU_THREADS):
+        self.model_size = model_size or MODEL_SIZE
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.cpu_threads = cpu_threads
+        super().__init__(language_code, device)
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.model_size}:{self.compute_type}:beam{self.beam_size}"
+
+    def load_model(self):
+        self.model = ModelRegistry.acquire(
+            f"faster-whisper:{self.model_size}:{self.compute_type}:{self.cpu_threads}",
+            lambda: WhisperModel(
+                self.model_size,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+            ),
+            self.device,
+            owner=self,
+        )
+
+    def transcribe(self, path_to_audio):
+        audio = load_audio(path_to_audio) if isinstance(path_to_audio, str) else path_to_audio
+        budget = self.max_new_tokens(audio)
+        segments, _ = self.model.transcribe(
+            audio, language=self.language_code, beam_size=self.beam_size, max_new_tokens=budget
+        )
+        # segments is a generator; decoding happens while it is consumed
+        segments = list(segments)
+        return self.guard(
+            " ".join(seg.text.strip() for seg in segments),
+            any(len(seg.tokens) >= budget for seg in segments),
+        )
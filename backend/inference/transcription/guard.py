@@ -0,0 +1,83 @@
+import os
+import math
+import zlib
+
+# Output tokens allowed per second of audio; speech rarely needs more than ~5
+TOKENS_PER_SECOND = float(os.getenv("DECODE_TOKENS_PER_SECOND", "12"))
+# Budget added on top, so that very short clips are not cut off
+MIN_TOKENS = int(os.getenv("DECODE_MIN_TOKENS", "24"))
+# Times a phrase may repeat back to back before the rest of the output is dropped
+MAX_REPEATS = int(os.getenv("DECODE_MAX_REPEATS", "4"))
+# Characters the repetition must span before it counts as a loop, so that
+# "no no no no no" or a drawn-out "あああああ" is kept
+MIN_REPEATED_CHARS = int(os.getenv("DECODE_MIN_REPEATED_CHARS", "40"))
+# Texts compressing better than this are loops Whisper itself would reject (its default threshold)
+MAX_COMPRESSION_RATIO = float(os.getenv("DECODE_MAX_COMPRESSION_RATIO", "2.4"))
+# Whisper's text context holds 448 tokens, half of which are left for the output
+MAX_WINDOW_TOKENS = 224
+# Longest repeated phrase looked for, in words (or characters for unspaced
+# scripts); whole looping sentences are common, so this is well above a phrase
+MAX_PHRASE = int(os.getenv("DECODE_MAX_PHRASE", "64"))
+
+
+def settings_key() -> str:
+    """The guard settings as one string, for keying cached transcriptions."""
+    return (
+        f"{TOKENS_PER_SECOND:g}:{MIN_TOKENS}:{MAX_REPEATS}:"
+        f"{MIN_REPEATED_CHARS}:{MAX_PHRASE}:{MAX_COMPRESSION_RATIO:g}"
+    )
+
+
+class Transcript(str):
+    """Transcribed text that remembers whether a decoding guard cut it short."""
+    truncated = False
+
+
+def token_budget(seconds: float) -> int:
+    """Maximum number of output tokens for `seconds` of audio in one Whisper window."""
+    return min(MAX_WINDOW_TOKENS, MIN_TOKENS + math.ceil(max(seconds, 0) * TOKENS_PER_SECOND))
+
+
+def compression_ratio(text: str) -> float:
+    """gzip compression ratio as Whisper computes it; repetitive text compresses well."""
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+
+def trim_repetitions(text: str, max_repeats: int = MAX_REPEATS,
+                     min_chars: int = MIN_REPEATED_CHARS) -> tuple[str, bool]:
+    """
+    Cut a transcription at the first phrase that repeats more than
+    `max_repeats` times in a row over at least `min_chars` characters, the
+    typical shape of a looping decoder, keeping the first occurrence of the
+    phrase. Phrases up to MAX_PHRASE units, and short enough to repeat that
+    often in the text, are looked for in O(len(text) * MAX_PHRASE).
+
+    Returns:
+        tuple[str, bool]: The (possibly shortened) text, and whether it was cut.
+    """
+    spaced = " " in text.strip()
+    units = text.split() if spaced else list(text.strip())
+    sep = 1 if spaced else 0
+    # offsets[k]: characters before unit k, separators included
+    offsets = [0]
+    for unit in units:
+        offsets.append(offsets[-1] + len(unit) + sep)
+
+    cut = None
+    for n in range(1, min(MAX_PHRASE, len(units) // (max_repeats + 1)) + 1):
+        # run: how many units before j + n continue the period-n repetition
+        run = 0
+        for j in range(len(units) - n):
+            if cut is not None and j - run >= cut:
+                break
+            run = run + 1 if units[j] == units[j + n] else 0
+            start = j - run + 1
+            if run >= n * max_repeats and offsets[j + n + 1] - offsets[start] - sep >= min_chars:
+                if cut is None or start + n < cut:
+                    cut = start + n
+                break
+    if cut is None:
+        return text, False
+    kept = units[:cut]
+    return (" ".join(kept) if spaced else "".join(kept)), True
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Set to 1 to reuse transcriptions of unchanged recordings across jobs
+ENABLED = os.getenv("TRANSCRIPT_CACHE", "0") == "1"
+# Kept out of the shared temp dir: the cache holds interview transcripts
+CACHE_PATH = os.getenv(
+    "TRANSCRIPT_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "tgt", "transcripts.sqlite3"),
+)
+# Cached transcriptions older than this are pruned on startup
+RETENTION_DAYS = float(os.getenv("TRANSCRIPT_CACHE_RETENTION_DAYS", "7"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    audio_sha256 TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    model TEXT NOT NULL,
+    language TEXT NOT NULL,
+    pii INTEGER NOT NULL,
+    decoding TEXT NOT NULL,
+    text TEXT NOT NULL,
+    segments TEXT,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (audio_sha256, strategy, model, language, pii, decoding)
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_created ON transcripts(created_at);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """Open the cache database, readable by the current user only."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    os.close(fd)
+    os.chmod(path, 0o600)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class TranscriptCache:
+    """
+    Persistent transcriptions keyed by the audio content and everything that
+    changes the output: strategy, model, language, PII annotation and the
+    decoding limits. A re-uploaded session only sends new or changed
+    recordings to the model. Only the post-processed (anonymized) text and
+    segment time spans are stored. Counts hits and misses until `reset_stats`.
+    """
+    def __init__(self, strategy: str, model: str, language: str, pii: bool,
+                 decoding: str = "", path: str = CACHE_PATH):
+        self.key = (strategy, model, language, int(pii), decoding)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = _connect(self.path)
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, audio_sha256: str) -> str | None:
+        """Post-processed text of a cached transcription, or None on a miss."""
+        try:
+            row = self._connection().execute(
+                "SELECT text FROM transcripts WHERE audio_sha256 = ? AND strategy = ? "
+                "AND model = ? AND language = ? AND pii = ? AND decoding = ?",
+                (audio_sha256, *self.key),
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Transcript cache lookup failed: {e}")
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, audio_sha256: str, text: str, segments: list | None = None) -> None:
+        """Store the post-processed text; only the time spans of `segments` are kept."""
+        spans = [{"start": s["start"], "end": s["end"]} for s in segments] if segments is not None else None
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (audio_sha256, *self.key, text,
+                 json.dumps(spans) if spans is not None else None, time.time()),
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Transcript cache write failed: {e}")
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def prune(older_than_days: float = RETENTION_DAYS, path: str = CACHE_PATH) -> None:
+        """Delete cached transcriptions older than `older_than_days`."""
+        if not os.path.exists(path):
+            return
+        cutoff = time.time() - older_than_days * 86400
+        try:
+            conn = _connect(path)
+            try:
+                conn.execute("DELETE FROM transcripts WHERE created_at < ?", (cutoff,))
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Transcript cache pruning failed: {e}")
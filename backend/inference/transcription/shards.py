@@ -0,0 +1,142 @@
+import os
+import time
+import logging
+import threading
+import multiprocessing as mp
+from typing import Callable
+
+from inference.transcription.audio import load_audio, probe_duration
+
+logger = logging.getLogger(__name__)
+
+# Worker processes a session's audio files are spread across (<= 1 disables)
+SHARDS = int(os.getenv("TRANSCRIBE_SHARDS", "0"))
+# Torch/CTranslate2 threads per worker; defaults to an even split of the cores
+SHARD_THREADS = int(os.getenv("TRANSCRIBE_SHARD_THREADS", "0"))
+
+# State of a shard worker process
+_strategy = None
+_silence_detector = None
+
+
+def _watch_parent(parent_pid: int) -> None:
+    # a job process that is terminated cannot close its pool; exit with it
+    # instead of holding a model in memory forever
+    while os.getppid() == parent_pid:
+        time.sleep(1.0)
+    os._exit(1)
+
+
+def _start_worker(parent_pid: int, initializer: Callable, *initargs) -> None:
+    threading.Thread(target=_watch_parent, args=(parent_pid,), daemon=True).start()
+    initializer(*initargs)
+
+
+def _init_worker(language: str, engine: str | None, diarize: bool | None, threads: int) -> None:
+    global _strategy, _silence_detector
+    # read by the engines at import time
+    os.environ["FASTER_WHISPER_CPU_THREADS"] = str(threads)
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    import torch
+    from inference.transcription import silence
+    from inference.transcription.factory import TranscriptionStrategyFactory
+
+    torch.set_num_threads(threads)
+    _strategy = TranscriptionStrategyFactory.get_strategy(language, engine, diarize)
+    _silence_detector = silence.SilenceDetector() if silence.ENABLED else None
+
+
+def _describe() -> tuple[str, str]:
+    return type(_strategy).__name__, _strategy.model_id
+
+
+def _chunks_long_audio() -> bool:
+    return _strategy.chunk_long_audio
+
+
+def _transcribe(audio) -> tuple[str | None, bool, str | None]:
+    """(text, silent, error) for one file path or waveform chunk, run inside a shard worker."""
+    try:
+        if isinstance(audio, str):
+            audio = load_audio(audio)
+        if _silence_detector is not None and _silence_detector.is_silent(audio):
+            return "", True, None
+        return _strategy.transcribe(audio), False, None
+    except Exception as e:
+        return None, False, str(e)
+
+
+class ShardPool:
+    """
+    Process pool in which every worker holds its own transcription strategy
+    and a bounded number of threads, for CPU-only nodes where one model
+    cannot use all cores. Files are handed out longest first, so the pool
+    does not end up waiting on one long recording started last; the chunks
+    of a split recording are spread over all workers.
+    """
+    def __init__(self, language: str, engine: str | None = None, diarize: bool | None = None,
+                 workers: int = SHARDS, threads: int = SHARD_THREADS,
+                 initializer: Callable = _init_worker):
+        """
+        Args:
+            language (str): Language of the recordings.
+            engine (str, optional): Transcription engine, as for the strategy factory.
+            diarize (bool, optional): Label speakers in the transcriptions.
+            workers (int): Worker processes.
+            threads (int): Threads per worker; 0 splits the cores evenly.
+            initializer (Callable): Sets up the strategy of a worker from
+                (language, engine, diarize, threads).
+
+        The pool is started from a job process, so job processes must not be
+        daemonic (see routers.helpers.job_processes).
+        """
+        self.workers = workers
+        self.threads = threads or max((os.cpu_count() or 1) // workers, 1)
+        # spawn: the parent may already hold torch thread pools and CUDA state
+        self._pool = mp.get_context("spawn").Pool(
+            workers,
+            initializer=_start_worker,
+            initargs=(os.getpid(), initializer, language, engine, diarize, self.threads),
+        )
+        logger.info(f"Started {workers} transcription shards with {self.threads} threads each")
+
+    def describe(self) -> tuple[str, str]:
+        """(strategy class name, model id) of the strategy the workers run."""
+        return self._pool.apply(_describe)
+
+    def chunks_long_audio(self) -> bool:
+        """Whether the workers' strategy wants long recordings split into chunks."""
+        return self._pool.apply(_chunks_long_audio)
+
+    def transcribe(self, paths: list[str], durations: dict[str, float] | None = None):
+        """
+        Transcribe `paths` across the workers.
+
+        Args:
+            paths (list[str]): Audio files.
+            durations (dict, optional): Known durations by path; probed otherwise.
+
+        Yields:
+            tuple: (path, text, silent, error) in longest-first submission order.
+        """
+        durations = durations or {}
+        durations = {path: durations.get(path) or probe_duration(path) for path in paths}
+        ordered = sorted(paths, key=lambda p: (-durations[p], p))
+        pending = [(path, self._pool.apply_async(_transcribe, (path,))) for path in ordered]
+        for path, result in pending:
+            text, silent, error = result.get()
+            yield path, text, silent, error
+
+    def transcribe_chunks(self, chunks: list) -> list[tuple]:
+        """
+        Transcribe the waveform chunks of one recording in parallel.
+
+        Returns:
+            list[tuple]: (text, silent, error) per chunk, in order.
+        """
+        pending = [self._pool.apply_async(_transcribe, (chunk,)) for chunk in chunks]
+        return [result.get() for result in pending]
+
+    def close(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
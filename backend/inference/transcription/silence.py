@@ -0,0 +1,75 @@
+import os
+import logging
+
+import numpy as np
+
+from inference.transcription.audio import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to send every recording to the ASR model
+ENABLED = os.getenv("SILENCE_SCREEN", "1") != "0"
+# Frames quieter than this (dB relative to full scale) count as silence
+THRESHOLD_DB = float(os.getenv("SILENCE_THRESHOLD_DB", "-45"))
+# Minimum amount of loud (or voiced) audio for a recording to be transcribed
+MIN_SPEECH_MS = float(os.getenv("SILENCE_MIN_SPEECH_MS", "200"))
+# Confirm loud frames with webrtcvad when it is installed (0 disables)
+USE_VAD = os.getenv("SILENCE_USE_VAD", "1") != "0"
+
+FRAME_MS = 30
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+def frame_levels(audio: np.ndarray, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """Level in dB relative to full scale of every FRAME_MS frame of `audio`."""
+    frame_len = int(sr * FRAME_MS / 1000)
+    n = len(audio) // frame_len
+    frames = np.asarray(audio[:n * frame_len], dtype=np.float32).reshape(n, frame_len)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+class SilenceDetector:
+    """
+    Cheap pre-screen that finds recordings without speech before they reach
+    the ASR model. Frame energies are computed in one vectorized pass; when
+    webrtcvad is available, the frames above the energy threshold must also
+    be classified as voiced, which filters out clicks and background noise.
+    """
+    def __init__(self, threshold_db: float = THRESHOLD_DB, min_speech_ms: float = MIN_SPEECH_MS,
+                 use_vad: bool = USE_VAD, sr: int = SAMPLE_RATE):
+        self.threshold_db = threshold_db
+        self.min_speech_ms = min_speech_ms
+        self.sr = sr
+        self.frame_len = int(sr * FRAME_MS / 1000)
+        self.vad = webrtcvad.Vad(2) if use_vad and webrtcvad is not None else None
+
+    def _frames(self, audio: np.ndarray) -> np.ndarray:
+        n = len(audio) // self.frame_len
+        return np.asarray(audio[:n * self.frame_len], dtype=np.float32).reshape(n, self.frame_len)
+
+    def is_silent(self, audio: np.ndarray) -> bool:
+        """True if `audio` (mono float32 at `sr`) holds no speech worth transcribing."""
+        frames = self._frames(audio)
+        if not len(frames):
+            return True
+        db = frame_levels(audio, self.sr)
+        loud = np.flatnonzero(db > self.threshold_db)
+        needed = self.min_speech_ms / FRAME_MS
+        if len(loud) < needed:
+            return True
+        if self.vad is None:
+            return False
+
+        pcm = (np.clip(frames[loud], -1, 1) * 32767).astype(np.int16)
+        voiced = 0
+        for frame in pcm:
+            if self.vad.is_speech(frame.tobytes(), self.sr):
+                voiced += 1
+                if voiced >= needed:
+                    return False
+        return True
@@ -1,15 +1,104 @@
 import os
+import torch
 import whisper
+from inference.model_registry import ModelRegistry
 from inference.transcription.abstract import TranscriptionStrategy
+from inference.transcription.audio import load_audio
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 
 
 class WhisperStrategy(TranscriptionStrategy):
+    # clips decoded together by transcribe_many
+    batch_size = 8
+
+    def __init__(self, language_code: str, device: str = "cpu", model_size: str = "large-v2"):
+        self.model_size = model_size
+        super().__init__(language_code, device)
+
+    @property
+    def model_id(self) -> str:
+        return self.model_size
+
     def load_model(self):
-         self.model = whisper.load_model("large-v2", self.device)
+        self.model = ModelRegistry.acquire(
+            f"whisper:{self.model_size}",
+            lambda: whisper.load_model(self.model_size, self.device),
+            self.device,
+            owner=self,
+        )
 
     def transcribe(self, path_to_audio):
-        res = self.model.transcribe(path_to_audio, language=self.language_code)
-        return res["text"]
\ No newline at end of file
+        if isinstance(path_to_audio, str):
+            path_to_audio = load_audio(path_to_audio)
+        res = self.model.transcribe(
+            path_to_audio, language=self.language_code, sample_len=self.max_new_tokens(path_to_audio)
+        )
+        return self.guard(res["text"], self._hit_budget(res["segments"], path_to_audio))
+
+    def transcribe_many(self, paths):
+        """
+        Clips that fit into Whisper's 30 second window are decoded in batches
+        of log-mel spectrograms; longer recordings go through the regular
+        sliding-window transcribe().
+        """
+        return [text for text, _ in self.transcribe_scored(paths)]
+
+    def transcribe_scored(self, paths) -> list[tuple[str, dict]]:
+        """
+        Like transcribe_many(), but each text comes with Whisper's confidence
+        scores: avg_logprob, no_speech_prob and compression_ratio (averaged
+        over the segments of a long recording, the worst compression ratio).
+        """
+        results = [None] * len(paths)
+        clips = []
+        for i, path in enumerate(paths):
+            audio = load_audio(path) if isinstance(path, str) else path
+            if len(audio) <= whisper.audio.N_SAMPLES:
+                clips.append((i, audio))
+            else:
+                res = self.model.transcribe(
+                    audio, language=self.language_code, sample_len=self.max_new_tokens(audio)
+                )
+                text = self.guard(res["text"], self._hit_budget(res["segments"], audio))
+                results[i] = (text, _segment_scores(res["segments"]))
+
+        # similar durations per batch, so that one budget fits all its clips
+        clips.sort(key=lambda clip: len(clip[1]))
+
+        for start in range(0, len(clips), self.batch_size):
+            batch = clips[start:start + self.batch_size]
+            budget = self.max_new_tokens(batch[-1][1])
+            options = whisper.DecodingOptions(
+                language=self.language_code, fp16=str(self.model.device) != "cpu", sample_len=budget
+            )
+            mels = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), self.model.dims.n_mels)
+                for _, audio in batch
+            ]).to(self.model.device)
+            for (i, _), decoded in zip(batch, whisper.decode(self.model, mels, options)):
+                # same silence rule transcribe() applies to each window
+                silent = decoded.no_speech_prob > 0.6 and decoded.avg_logprob < -1.0
+                scores = {
+                    "avg_logprob": decoded.avg_logprob,
+                    "no_speech_prob": decoded.no_speech_prob,
+                    "compression_ratio": decoded.compression_ratio,
+                }
+                text = "" if silent else self.guard(decoded.text, len(decoded.tokens) >= budget)
+                results[i] = (text, scores)
+        return results
+
+    def _hit_budget(self, segments: list[dict], audio) -> bool:
+        budget = self.max_new_tokens(audio)
+        return any(len(seg["tokens"]) >= budget for seg in segments)
+
+
+def _segment_scores(segments: list[dict]) -> dict:
+    if not segments:
+        return {"avg_logprob": 0.0, "no_speech_prob": 1.0, "compression_ratio": 0.0}
+    return {
+        "avg_logprob": sum(s["avg_logprob"] for s in segments) / len(segments),
+        "no_speech_prob": sum(s["no_speech_prob"] for s in segments) / len(segments),
+        "compression_ratio": max(s["compression_ratio"] for s in segments),
+    }
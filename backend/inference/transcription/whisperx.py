@@ -1,40 +1,210 @@
+import os
+import torch
 import whisperx
+from concurrent.futures import Future, ThreadPoolExecutor
+from whisperx.audio import SAMPLE_RATE
 from whisperx.diarize import DiarizationPipeline
+try:
+    from whisperx.vads import Vad, Pyannote
+except ImportError:  # whisperx < 3.4 ships a single pyannote VAD
+    from whisperx.vad import merge_chunks
+    Vad = Pyannote = None
 
 
+from inference.model_registry import ModelRegistry
 from inference.transcription.abstract import TranscriptionStrategy
+from inference.transcription.audio import load_audio
+
+# Whether jobs label speakers unless they choose otherwise; on, as before
+# diarization became optional, so that existing jobs keep their output
+DIARIZE_DEFAULT = os.getenv("DIARIZE_DEFAULT", "1") != "0"
+# Languages whose recordings have a single speaker (comma-separated codes);
+# diarization is off by default for them
+SINGLE_SPEAKER_LANGUAGES = {
+    code.strip().lower()
+    for code in os.getenv("DIARIZE_SINGLE_SPEAKER_LANGUAGES", "").split(",")
+    if code.strip()
+}
+
+
+def default_diarize(language_code: str) -> bool:
+    return DIARIZE_DEFAULT and language_code.lower() not in SINGLE_SPEAKER_LANGUAGES
 
 
 class WhisperxStrategy(TranscriptionStrategy):
-    def __init__(self, *args, **kwargs):
+    # batches the VAD segments of a whole recording itself, and diarization
+    # needs the whole recording to keep speaker labels consistent
+    chunk_long_audio = False
+
+    def __init__(self, language_code: str, device: str = "cpu", batch_size: int = 8,
+                 diarize: bool | None = None):
         """
-        Initialize the Whisperx transcription strategy.	"""
-        super().__init__(*args, **kwargs)
-        self.batch_size = kwargs.get('batch_size', 8)
+        Initialize the Whisperx transcription strategy.
+
+        Args:
+            language_code (str): Language of the recordings.
+            device (str): Device to run the models on.
+            batch_size (int): Speech segments per ASR forward pass.
+            diarize (bool, optional): Label speakers in the transcription;
+                defaults to default_diarize(language_code).
+        """
+        self.batch_size = batch_size
+        self.diarize = default_diarize(language_code) if diarize is None else diarize
+        # loaded on first use and kept for the lifetime of the strategy
+        self.align_model = None
+        self.diarize_model = None
+        # pyannote runs on this thread, overlapping with the ASR of the
+        # following files. A thread rather than a worker process: it shares
+        # the already loaded model and the waveforms without copies, and
+        # torch releases the GIL in its kernels, though both models still
+        # compete for the same device.
+        self._diarizer: ThreadPoolExecutor | None = None
+        super().__init__(language_code, device)
     
+    @property
+    def model_id(self) -> str:
+        return f"large-v2:diarize={int(self.diarize)}"
+
     def load_model(self):
+        self.model = ModelRegistry.acquire(
+            f"whisperx:large-v2:{self.language_code}",
+            self._load_whisperx,
+            self.device,
+            owner=self,
+        )
+        print(f"Whisperx model loaded on device {self.device}")
+
+    def _load_whisperx(self):
         try:
-            self.model = whisperx.load_model("large-v2", self.device, compute_type="float16", language=self.language_code)
+            return whisperx.load_model("large-v2", self.device, compute_type="float16", language=self.language_code)
         except:
-            self.model = whisperx.load_model("large-v2", self.device, compute_type="int8", language=self.language_code)
-        finally:
-            print(f"Whisperx model loaded on device {self.device}")
+            return whisperx.load_model("large-v2", self.device, compute_type="int8", language=self.language_code)
 
     def transcribe(self, path_to_audio):
-        audio = whisperx.load_audio(path_to_audio)
+        audio = self._as_waveform(path_to_audio)
+        diarization = self._start_diarization(audio)
         result = self.model.transcribe(audio, batch_size=self.batch_size, language=self.language_code)
+        return self._guarded_text(result, audio, diarization)
 
-        model_a, metadata = whisperx.load_align_model(
-            language_code=result["language"],
-            device=self.device)
-        result = whisperx.align(result["segments"], model_a, metadata, audio, self.device)
+    def transcribe_many(self, paths):
+        """
+        Run VAD on every file, then send the speech segments of all files
+        through the ASR pipeline together so that its batches stay full even
+        when each recording only holds one or two segments. Diarization of
+        all files starts first and runs in the background meanwhile.
+        """
+        audios = [self._as_waveform(path) for path in paths]
+        diarizations = [self._start_diarization(audio) for audio in audios]
+        owners, inputs, bounds = [], [], []
+        for i, audio in enumerate(audios):
+            for seg in self._vad_segments(audio):
+                f1, f2 = int(seg["start"] * SAMPLE_RATE), int(seg["end"] * SAMPLE_RATE)
+                owners.append(i)
+                inputs.append({"inputs": audio[f1:f2]})
+                bounds.append((round(seg["start"], 3), round(seg["end"], 3)))
+
+        segments = [[] for _ in paths]
+        outputs = self.model(iter(inputs), batch_size=self.batch_size, num_workers=0)
+        for i, (start, end), out in zip(owners, bounds, outputs):
+            text = out["text"]
+            if self.batch_size in (0, 1, None):
+                text = text[0]
+            segments[i].append({"text": text, "start": start, "end": end})
+
+        texts = []
+        for segs, audio, diarization in zip(segments, audios, diarizations):
+            if not segs:
+                if diarization is not None:
+                    diarization.cancel()
+                texts.append("")
+                continue
+            result = {"segments": segs, "language": self.language_code}
+            texts.append(self._guarded_text(result, audio, diarization))
+        return texts
 
-        diarize_model = DiarizationPipeline(
-            use_auth_token=self.hugging_key,
-            device=self.device
+    def _guarded_text(self, result, audio, diarization: Future | None = None):
+        """
+        The pipeline decodes speech segments with a fixed token limit, so
+        looping segments are trimmed here, before alignment and diarization.
+        """
+        truncated = False
+        for seg in result["segments"]:
+            seg["text"] = self.guard(seg["text"])
+            truncated = truncated or seg["text"].truncated
+        return self.guard(self._speaker_text(result, audio, diarization), truncated)
+
+    @staticmethod
+    def _as_waveform(audio):
+        return load_audio(audio) if isinstance(audio, str) else audio
+
+    def _get_align_model(self):
+        """wav2vec2 alignment model and metadata for this language, shared per (language, device)."""
+        if self.align_model is None:
+            self.align_model = ModelRegistry.acquire(
+                f"whisperx-align:{self.language_code}",
+                lambda: whisperx.load_align_model(language_code=self.language_code, device=self.device),
+                self.device,
+                owner=self,
+            )
+        return self.align_model
+
+    def _get_diarize_model(self):
+        """pyannote diarization pipeline, shared per device."""
+        if self.diarize_model is None:
+            self.diarize_model = ModelRegistry.acquire(
+                "pyannote-diarization",
+                lambda: DiarizationPipeline(use_auth_token=self.hugging_key, device=self.device),
+                self.device,
+                owner=self,
+            )
+        return self.diarize_model
+
+    def _start_diarization(self, audio) -> Future | None:
+        """Run pyannote on `audio` in the background, if this job labels speakers."""
+        if not self.diarize:
+            return None
+        if self._diarizer is None:
+            self._diarizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize")
+        return self._diarizer.submit(lambda: self._get_diarize_model()(audio))
+
+    def unload(self):
+        if self._diarizer is not None:
+            self._diarizer.shutdown(wait=True, cancel_futures=True)
+            self._diarizer = None
+        super().unload()
+        self.align_model = None
+        self.diarize_model = None
+
+    def _vad_segments(self, audio):
+        """Speech chunks of at most 30 seconds, as FasterWhisperPipeline.transcribe finds them."""
+        vad_model = self.model.vad_model
+        if Vad is not None:
+            vad_cls = type(vad_model) if isinstance(vad_model, Vad) else Pyannote
+            waveform = vad_cls.preprocess_audio(audio)
+            merge = vad_cls.merge_chunks
+        else:
+            waveform = torch.from_numpy(audio).unsqueeze(0)
+            merge = merge_chunks
+        vad_segments = vad_model({"waveform": waveform, "sample_rate": SAMPLE_RATE})
+        return merge(
+            vad_segments,
+            30,
+            onset=self.model._vad_params["vad_onset"],
+            offset=self.model._vad_params["vad_offset"],
         )
-        diarize_segments = diarize_model(audio)
-        result = whisperx.assign_word_speakers(diarize_segments, result)
+
+    def _speaker_text(self, result, audio, diarization: Future | None = None):
+        """
+        Join an ASR result into 'SPEAKER: text' turns, aligning it with the
+        diarization; without diarization the segment texts are joined as is.
+        """
+        if diarization is None:
+            return " ".join(seg["text"].strip() for seg in result["segments"]).strip()
+
+        model_a, metadata = self._get_align_model()
+        result = whisperx.align(result["segments"], model_a, metadata, audio, self.device)
+
+        result = whisperx.assign_word_speakers(diarization.result(), result)
 
 
         full_sentences, buffer_speaker, buffer_text = [], None, ""
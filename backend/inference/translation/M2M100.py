@@ -1,15 +1,20 @@
+from inference.model_registry import ModelRegistry
 from inference.translation.abstract import TranslationStrategy
 from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
 
 class M2M100Strategy(TranslationStrategy):
 
     def load_model(self, model_path = None):
-        if model_path:
-            self._M2_M100_model = M2M100ForConditionalGeneration.from_pretrained(model_path)
-            self._M2_M100_tokenizer = M2M100Tokenizer.from_pretrained(model_path)
-        else:
-            self._M2_M100_model = M2M100ForConditionalGeneration.from_pretrained("facebook/m2m100_1.2B")
-            self._M2_M100_tokenizer = M2M100Tokenizer.from_pretrained("facebook/m2m100_1.2B")
+        model_path = model_path or "facebook/m2m100_1.2B"
+        self._M2_M100_model, self._M2_M100_tokenizer = ModelRegistry.acquire(
+            f"m2m100:{model_path}",
+            lambda: (
+                M2M100ForConditionalGeneration.from_pretrained(model_path),
+                M2M100Tokenizer.from_pretrained(model_path),
+            ),
+            self.device,
+            owner=self,
+        )
 
     def translate(self, text: str) -> str | None:
         self._M2_M100_tokenizer.src_lang = self.language_code
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from inference.model_registry import ModelRegistry
+
 class TranslationStrategy(ABC):
     def __init__(self, language_code: str, translationModel: str = None, device: str = "cpu"):
         self.language_code = language_code.lower()
@@ -15,6 +17,12 @@ class TranslationStrategy(ABC):
         raise NotImplementedError(
             "Subclasses must implement load_model() to initialize their translation models."
         )
+
+    def unload(self):
+        """
+        Release this strategy's models back to the shared ModelRegistry.
+        """
+        ModelRegistry.release_owner(self)
         
     @abstractmethod
     def translate(self, text: str) -> str | None:
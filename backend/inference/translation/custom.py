@@ -1,12 +1,6 @@
-from inference.translation.abstract import TranslationStrategy
+from inference.translation.M2M100 import M2M100Strategy
 
-class CustomTranslationStrategy(TranslationStrategy):
+class CustomTranslationStrategy(M2M100Strategy):
     
     def load_model(self):
-        #self._init_M2M100_model(model_path=f"models/translation/{model_name}")
-        self._init_M2M100_model(model_path=f"models/translation/{self.translationModel}")
-
-    def translate(self, text: str) -> str | None:
-        #out = self._translate_marian(text)
-        out = self._translate_M2M100(text)
-        return out
\ No newline at end of file
+        super().load_model(model_path=f"models/translation/{self.translationModel}")
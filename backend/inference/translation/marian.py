@@ -1,4 +1,5 @@
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from inference.model_registry import ModelRegistry
 from inference.translation.abstract import TranslationStrategy
 
 class MarianStrategy(TranslationStrategy):
@@ -12,10 +13,14 @@ class MarianStrategy(TranslationStrategy):
                 model_name = f"Helsinki-NLP/opus-mt-mul-en"
             else:
                 model_name = f"Helsinki-NLP/opus-mt-{self.language_code}-en"
-            self._marian_tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self._marian_model = (
-                AutoModelForSeq2SeqLM.from_pretrained(model_name)
-                .to(self.device)
+            self._marian_tokenizer, self._marian_model = ModelRegistry.acquire(
+                f"marian:{model_name}",
+                lambda: (
+                    AutoTokenizer.from_pretrained(model_name),
+                    AutoModelForSeq2SeqLM.from_pretrained(model_name).to(self.device),
+                ),
+                self.device,
+                owner=self,
             )
 
     def translate(self, text: str) -> str | None:
@@ -17,7 +17,8 @@ class AbstractInferenceWorker(ABC):
     """
 
     def __init__(self, base_dir: str, action: str, language: str, instruction: str,
-                 translationModel: str = None, glossingModel: str = None, job=None):
+                 translationModel: str = None, glossingModel: str = None, job=None,
+                 resume: bool = False, transcriptionModel: str = None, diarize: bool = None):
         """
         Initialize the inference worker with configuration parameters.
 
@@ -29,6 +30,13 @@ class AbstractInferenceWorker(ABC):
             translationModel (str, optional): Name of translation model to use.
             glossingModel (str, optional): Name of glossing model to use.
             job (optional): Job object providing id, queue, and cancel_event.
+            resume (bool): Reuse the checkpoints of an earlier, interrupted run
+                of this job and skip the work that was already finished.
+            transcriptionModel (str, optional): Transcription engine, e.g.
+                'faster-whisper' or 'faster-whisper:medium'; defaults to the
+                language's standard engine.
+            diarize (bool, optional): Label speakers in transcriptions; defaults
+                to the language's configuration.
         """
         self.base_dir = base_dir
         self.current_folder = self.base_dir
@@ -37,7 +45,14 @@ class AbstractInferenceWorker(ABC):
         self.instruction = instruction
         self.translationModel = translationModel
         self.glossingModel = glossingModel
+        self.transcriptionModel = transcriptionModel
+        self.diarize = diarize
         self.job = job
+        self.resume = resume
+        # Preloaded processor handed in by a warm pooled worker; it is reused
+        # but never closed by this worker
+        self.shared_processor = None
+        self.processor = None
 
         # Setup job identification and messaging queue
         self.job_id = job.id if job else 'local_job'
@@ -69,6 +84,19 @@ class AbstractInferenceWorker(ABC):
         """
         raise NotImplementedError("Subclasses must implement after_process()")
     
+    def _checkpoint_dir(self) -> str | None:
+        """
+        Directory for the processor's checkpoints, or None to keep them next
+        to the session data. Workers whose session folders do not survive a
+        failed run should return a persistent location.
+        """
+        return None
+
+    def _session_done(self, session_dir: str) -> None:
+        """
+        Hook called by the processor after each session's output is written.
+        """
+
     def _put(self, msg: str) -> None:
         """
         Send a status message to the job queue or print to console.
@@ -84,9 +112,11 @@ class AbstractInferenceWorker(ABC):
     def run(self) -> None:
         """
         Execute the inference workflow: send initial message, iterate over
-        folders, instantiate the appropriate processor, and process each folder.
+        folders, and process each folder with one processor that is created
+        on the first folder and reused for the rest of the job.
         Handles cancellation and exceptions.
         """
+        self.processor = self.shared_processor
         try:
             # Notify start
             self._initial_message()
@@ -103,14 +133,20 @@ class AbstractInferenceWorker(ABC):
                 session_name = os.path.basename(os.path.normpath(self.current_folder))
                 self._put(f"Processing session: {session_name}")
 
-                # Create a processor based on configuration
-                self.processor = ProcessorFactory.get_processor(
-                    self.language,
-                    self.action,
-                    self.instruction,
-                    self.translationModel,
-                    self.glossingModel,
-                )
+                # Create the processor once per job, so models load only once
+                if self.processor is None:
+                    self.processor = ProcessorFactory.get_processor(
+                        self.language,
+                        self.action,
+                        self.instruction,
+                        self.translationModel,
+                        self.glossingModel,
+                        self.transcriptionModel,
+                        self.diarize,
+                    )
+                self.processor.resume = self.resume
+                self.processor.checkpoint_dir = self._checkpoint_dir()
+                self.processor.on_session_done = self._session_done
 
                 # Run the processing logic
                 self.processor.process(self.current_folder)
@@ -123,6 +159,12 @@ class AbstractInferenceWorker(ABC):
             self._put(f"[ERROR] {e}")
             self._put(traceback.format_exc())
         finally:
+            # Unload models of a processor this job created itself
+            if self.processor is not None and self.processor is not self.shared_processor:
+                try:
+                    self.processor.close()
+                except Exception as e:
+                    self._put(f"[WARNING] Failed to release processor: {e}")
             # Always signal completion
             self._put("[DONE ALL]")
 
@@ -170,8 +212,8 @@ def main() -> None:
     )
     parser.add_argument(
         "--action", required=True,
-        choices=['transcribe', 'translate', 'transliterate', 'gloss'],
-        help="Action to perform"
+        help="Action to perform ('transcribe', 'translate', 'transliterate', 'gloss'), "
+             "or a comma-separated pipeline such as 'transcribe,translate,gloss'"
     )
     parser.add_argument(
         "--language", required=True,
@@ -190,10 +232,22 @@ def main() -> None:
         "--glossing-model", default=None,
         help="Name of glossing model (optional)"
     )
+    parser.add_argument(
+        "--transcription-model", default=None,
+        help="Transcription engine, e.g. 'faster-whisper', 'faster-whisper:medium' or 'cascade:small' (optional)"
+    )
     parser.add_argument(
         "--job-id", type=int, default=0,
         help="Numeric job identifier"
     )
+    parser.add_argument(
+        "--diarize", action=argparse.BooleanOptionalAction, default=None,
+        help="Label speakers in transcriptions (default depends on the language)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip sessions and items finished by an earlier run"
+    )
 
     args = parser.parse_args()
 
@@ -205,7 +259,10 @@ def main() -> None:
         instruction=args.instruction,
         translationModel=args.translation_model,
         glossingModel=args.glossing_model,
-        job=None  # CLI usage, no job object
+        transcriptionModel=args.transcription_model,
+        diarize=args.diarize,
+        job=None,  # CLI usage, no job object
+        resume=args.resume,
     )
     worker.run() 
 
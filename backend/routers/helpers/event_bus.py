@@ -0,0 +1,171 @@
+import os
+import asyncio
+import logging
+from collections import deque
+
+from routers.helpers.job_store import JobStore
+
+logger = logging.getLogger(__name__)
+
+# Events per job kept in memory for replay to late or reconnecting clients
+BUFFER_SIZE = int(os.getenv("EVENT_BUS_BUFFER_SIZE", "1000"))
+# Undelivered events per subscriber before it falls back to the JobStore
+SUBSCRIBER_BACKLOG = int(os.getenv("EVENT_BUS_SUBSCRIBER_BACKLOG", "500"))
+# Seconds between JobStore polls of a watched job
+POLL_INTERVAL = float(os.getenv("EVENT_BUS_POLL_INTERVAL", "0.5"))
+
+# Repeated status messages where only the latest one matters to a client
+COALESCED_TAGS = ("[QUEUED]",)
+
+DONE = "[DONE ALL]"
+
+
+def _coalesce_tag(message: str) -> str | None:
+    for tag in COALESCED_TAGS:
+        if message.startswith(tag):
+            return tag
+    return None
+
+
+class _Subscriber:
+    """Pending events of one SSE connection."""
+    def __init__(self, last_id: int):
+        self.last_id = last_id
+        self.pending: deque[tuple[int, str]] = deque()
+        self.wakeup = asyncio.Event()
+        self.lagging = False
+
+    def push(self, event_id: int, message: str) -> None:
+        if self.lagging or event_id <= self.last_id:
+            return
+        tag = _coalesce_tag(message)
+        if tag and self.pending and self.pending[-1][1].startswith(tag):
+            # the client has not seen the older progress yet: replace it
+            self.pending[-1] = (event_id, message)
+        elif len(self.pending) >= SUBSCRIBER_BACKLOG:
+            # too slow to keep up; it re-reads the missed events from the store
+            self.pending.clear()
+            self.lagging = True
+        else:
+            self.pending.append((event_id, message))
+        self.wakeup.set()
+
+
+class _JobChannel:
+    """Ring buffer and subscribers of one job, fed by a single poller task."""
+    def __init__(self, job_id: str, start_id: int):
+        self.job_id = job_id
+        self.buffer: deque[tuple[int, str]] = deque(maxlen=BUFFER_SIZE)
+        self.subscribers: set[_Subscriber] = set()
+        self.last_id = start_id
+        self.finished = False
+        self.task: asyncio.Task | None = None
+
+    def covers(self, after_id: int) -> bool:
+        """True if the buffer holds every event after `after_id`."""
+        if after_id >= self.last_id:
+            return True
+        return bool(self.buffer) and self.buffer[0][0] <= after_id + 1
+
+    def replay(self, after_id: int) -> list[tuple[int, str]]:
+        return [(i, m) for i, m in self.buffer if i > after_id]
+
+    def publish(self, events: list[tuple[int, str]]) -> None:
+        for event_id, message in events:
+            self.buffer.append((event_id, message))
+            self.last_id = event_id
+            for sub in self.subscribers:
+                sub.push(event_id, message)
+            if message == DONE:
+                self.finished = True
+
+
+class JobEventBus:
+    """
+    Asyncio fan-out of job progress events to any number of SSE clients.
+
+    Each watched job has one poller task per API process that reads new
+    events from the JobStore (where every process and job worker writes them)
+    and pushes them to all subscribers, so open connections cost no threads
+    and a slow client never steals messages from another. A bounded ring
+    buffer serves replays from `Last-Event-ID`; older events are read from
+    the store. Pending '[QUEUED]' position updates are coalesced per
+    subscriber so that only the latest one is delivered.
+    """
+    _channels: dict[str, _JobChannel] = {}
+
+    @classmethod
+    async def subscribe(cls, job_id: str, last_event_id: int | None = None):
+        """
+        Yield {"id", "data"} SSE messages for a job until '[DONE ALL]'.
+
+        Args:
+            job_id (str): Job to watch.
+            last_event_id (int, optional): Last event the client received;
+                delivery resumes after it. Defaults to the start of the job's
+                latest run.
+        """
+        if last_event_id is None:
+            # a resumed job starts over at its '[RESUMED]' marker; the earlier
+            # run already ended with its own '[DONE ALL]'
+            last_event_id = await asyncio.to_thread(JobStore.last_event_id, job_id, "[RESUMED]")
+
+        channel = cls._channel(job_id, last_event_id)
+        sub = _Subscriber(last_event_id)
+        channel.subscribers.add(sub)
+        try:
+            while True:
+                if sub.lagging or not channel.covers(sub.last_id):
+                    # catch up from the store, then continue from the buffer
+                    sub.lagging = False
+                    while not channel.covers(sub.last_id):
+                        events = await asyncio.to_thread(JobStore.events, job_id, sub.last_id)
+                        if not events:
+                            break
+                        for event_id, message in events:
+                            sub.last_id = event_id
+                            yield {"id": str(event_id), "data": message}
+                            if message == DONE:
+                                return
+                    sub.pending = deque(channel.replay(sub.last_id))
+
+                while sub.pending:
+                    event_id, message = sub.pending.popleft()
+                    sub.last_id = event_id
+                    yield {"id": str(event_id), "data": message}
+                    if message == DONE:
+                        return
+
+                if channel.finished and sub.last_id >= channel.last_id:
+                    return
+                sub.wakeup.clear()
+                if not sub.pending and not sub.lagging:
+                    await sub.wakeup.wait()
+        finally:
+            channel.subscribers.discard(sub)
+            if not channel.subscribers and channel.task is not None:
+                channel.task.cancel()
+                cls._channels.pop(job_id, None)
+
+    @classmethod
+    def _channel(cls, job_id: str, start_id: int) -> _JobChannel:
+        channel = cls._channels.get(job_id)
+        if channel is None:
+            channel = _JobChannel(job_id, start_id)
+            cls._channels[job_id] = channel
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(cls._poll(channel))
+        return channel
+
+    @classmethod
+    async def _poll(cls, channel: _JobChannel) -> None:
+        while not channel.finished:
+            try:
+                events = await asyncio.to_thread(JobStore.events, channel.job_id, channel.last_id)
+            except Exception as e:
+                # e.g. the database is briefly locked; try again on the next tick
+                logger.error(f"Error polling events for job {channel.job_id}: {e}")
+                events = []
+            channel.publish(events)
+            if not events:
+                await asyncio.sleep(POLL_INTERVAL)
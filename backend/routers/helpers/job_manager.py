@@ -1,16 +1,21 @@
 import os
+import asyncio
 import shutil
 import tempfile
 from typing import Optional
 import uuid
 import logging
+import weakref
 from pathlib import Path
-from zipfile import ZipFile
 from fastapi import APIRouter, HTTPException, UploadFile
-from multiprocessing import Process, Queue, Event
 from multiprocessing import Process
 
 from routers.inference.inference_workers import OneDriveWorker, ZipWorker
+from routers.helpers.worker_pool import WorkerPool
+from routers.helpers.job_store import JobStore, StoreQueue, StoreCancelEvent
+from routers.helpers.event_bus import JobEventBus
+from routers.helpers.uploads import extract_upload
+from routers.helpers.job_processes import JobProcesses
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -19,21 +24,39 @@ MODELS_BASE = Path(__file__).resolve().parent.parent / "models"
 DEFAULT_MODEL = "Default"
 
 class Job:
+    """
+    Handle to a job persisted in the JobStore. The queue and cancel event are
+    store-backed, so any API worker process can read or signal the job; only
+    the process that started the job holds its `process` handle.
+    """
     def __init__(self, job_id: str):
         self.id = job_id
-        self.queue: Queue = Queue()
-        self.cancel_event: Event = Event()
-        self.base_dir: str | None = None
-        self.zip_path: str | None = None
+        self.queue = StoreQueue(job_id)
+        self.cancel_event = StoreCancelEvent(job_id)
         self.token: str | None = None
         self.process: Process | None = None
 
+    @property
+    def base_dir(self) -> str | None:
+        return (JobStore.get(self.id) or {}).get("base_dir")
+
+    @base_dir.setter
+    def base_dir(self, value: str | None):
+        JobStore.update(self.id, base_dir=value)
+
+    @property
+    def status(self) -> str | None:
+        return (JobStore.get(self.id) or {}).get("status")
+
 class JobManager:
-    _jobs: dict[str, Job] = {}
+    # Jobs of this process, kept for their process handles while the
+    # scheduler or worker pool still holds them
+    _jobs: "weakref.WeakValueDictionary[str, Job]" = weakref.WeakValueDictionary()
 
     @classmethod
-    def create(cls) -> Job:
+    def create(cls, kind: str = "inference", params: dict | None = None) -> Job:
         job_id = str(uuid.uuid4())
+        JobStore.create(job_id, kind, params)
         job = Job(job_id)
         cls._jobs[job_id] = job
         return job
@@ -41,24 +64,37 @@ class JobManager:
     @classmethod
     def get(cls, job_id: str) -> Job:
         job = cls._jobs.get(job_id)
-        if not job:
+        if job:
+            return job
+        if not job_id or JobStore.get(job_id) is None:
             raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
-        return job
+        return Job(job_id)
 
     @classmethod
     def remove(cls, job_id: str):
         cls._jobs.pop(job_id, None)
+        JobStore.delete(job_id)
+
+
+def job_event_stream(job_id: str, last_event_id: str | None = None):
+    """
+    SSE messages of a job from the JobEventBus until '[DONE ALL]'. A client
+    reconnecting with a Last-Event-ID header continues after that event.
+    """
+    try:
+        after_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        after_id = None
+    return JobEventBus.subscribe(job_id, after_id)
 
 
 class ProcessingService:
     """Service class to handle processing logic."""
     
     @staticmethod
-    async def create_worker_process(process_fn) -> Process:
+    def create_worker_process(process_fn) -> Process:
         """Create and start a worker process."""
-        proc = Process(target=process_fn, daemon=True)
-        proc.start()
-        return proc
+        return JobProcesses.start(process_fn)
     
     @staticmethod
     def normalize_model_name(model: Optional[str]) -> Optional[str]:
@@ -66,47 +102,25 @@ class ProcessingService:
         return None if model == DEFAULT_MODEL else model
     
     @staticmethod
-    async def extract_zipfile(zipfile: UploadFile) -> str:
-        """Extract uploaded zip file to temporary directory."""
-        tmp_dir = tempfile.mkdtemp()
-        archive_path = Path(tmp_dir) / "upload.zip"
-        
-        try:
-            contents = await zipfile.read()
-            archive_path.write_bytes(contents)
-            
-            with ZipFile(archive_path, 'r') as archive:
-                archive.extractall(tmp_dir)
-            
-            archive_path.unlink()
-            return tmp_dir
-            
-        except Exception as e:
-            # Cleanup on failure
-            if archive_path.exists():
-                archive_path.unlink()
-            shutil.rmtree(tmp_dir, ignore_errors=True)
-            raise HTTPException(status_code=400, detail=f"Failed to extract zip file: {str(e)}")
-    
-    @staticmethod
-    def create_zip_worker(tmp_dir: str, action: str, language: str, 
-                         instruction: Optional[str], translation_model: Optional[str], 
-                         glossing_model: Optional[str], job) -> ZipWorker:
-        """Create a ZipWorker instance."""
-        return ZipWorker(
-            tmp_dir, action, language, instruction,
-            translation_model, glossing_model, job
-        )
+    async def extract_zipfile(zipfile: Optional[UploadFile] = None, upload_id: Optional[str] = None) -> str:
+        """Stream an uploaded (or chunk-uploaded) zip file to disk and extract it to a temporary directory."""
+        return await extract_upload(zipfile, upload_id)
     
     @staticmethod
-    def create_onedrive_worker(base_dir: str, action: str, language: str,
-                              instruction: Optional[str], translation_model: Optional[str],
-                              glossing_model: Optional[str], access_token: str, job) -> OneDriveWorker:
-        """Create an OneDriveWorker instance."""
-        return OneDriveWorker(
-            base_dir, action, language, instruction,
-            translation_model, glossing_model, access_token, job
-        )
+    def start_worker(job, worker_cls, **worker_kwargs) -> Optional[Process]:
+        """
+        Dispatch a job to a warm pooled worker that already has its models
+        loaded. Falls back to a dedicated cold process when the pool is
+        disabled or all warm workers are busy with other configurations.
+
+        Returns:
+            Process | None: The dedicated process, or None if the job was pooled.
+        """
+        if WorkerPool.submit(job, worker_cls, worker_kwargs):
+            logger.info(f"Job {job.id} dispatched to warm worker pool")
+            return None
+        worker = worker_cls(**worker_kwargs, job=job)
+        return ProcessingService.create_worker_process(worker.run)
 
 
 class JobCleanupService:
@@ -115,16 +129,23 @@ class JobCleanupService:
     @staticmethod
     def cleanup_job(job_id: str, job):
         """Clean up job resources including files and directories."""
-        try:
-            if job.zip_path and os.path.exists(job.zip_path):
-                os.remove(job.zip_path)
-        except OSError as e:
-            logger.warning(f"Failed to delete zip file {job.zip_path}: {e}")
-        
         if job.base_dir and os.path.isdir(job.base_dir):
             try:
                 shutil.rmtree(job.base_dir, ignore_errors=True)
             except Exception as e:
                 logger.warning(f"Failed to remove base directory {job.base_dir}: {e}")
+
+        checkpoint_dir = Path(tempfile.gettempdir()) / "tgt_checkpoints" / job_id
+        shutil.rmtree(checkpoint_dir, ignore_errors=True)
         
-        JobManager.remove(job_id)
\ No newline at end of file
+        JobManager.remove(job_id)
+
+    @staticmethod
+    def prune_expired():
+        """
+        Remove jobs past the retention period together with their files.
+        Only downloaded 'done' jobs are cleaned up right away; the others are
+        kept until then so that they can be resumed.
+        """
+        for job_id in JobStore.expired():
+            JobCleanupService.cleanup_job(job_id, Job(job_id))
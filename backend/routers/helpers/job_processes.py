@@ -0,0 +1,34 @@
+import logging
+import weakref
+from multiprocessing import Process
+
+logger = logging.getLogger(__name__)
+
+
+class JobProcesses:
+    """
+    Starts the processes jobs run in. They are not daemonic, because a job
+    may start processes of its own (the transcription shard pool), which
+    daemonic processes are not allowed to do. Instead they are tracked here
+    and stopped explicitly when the API shuts down.
+    """
+    _processes: "weakref.WeakSet[Process]" = weakref.WeakSet()
+
+    @classmethod
+    def start(cls, target, args: tuple = ()) -> Process:
+        proc = Process(target=target, args=args, daemon=False)
+        proc.start()
+        cls._processes.add(proc)
+        return proc
+
+    @classmethod
+    def shutdown(cls, timeout: float = 5) -> None:
+        """Terminate every job process that is still running."""
+        alive = [p for p in list(cls._processes) if p.is_alive()]
+        for proc in alive:
+            proc.terminate()
+        for proc in alive:
+            proc.join(timeout=timeout)
+            if proc.is_alive():
+                logger.warning(f"Force killing job process {proc.pid}")
+                proc.kill()
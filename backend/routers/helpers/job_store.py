@@ -0,0 +1,346 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# One SQLite file shared by every uvicorn worker process on the machine
+STORE_PATH = os.getenv(
+    "JOB_STORE_PATH", os.path.join(tempfile.gettempdir(), "tgt_jobs.sqlite3")
+)
+# Finished jobs older than this are removed with their files on startup
+RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+FINAL_STATUSES = ("done", "failed", "cancelled", "interrupted")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    action TEXT,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    params TEXT,
+    base_dir TEXT,
+    owner TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, priority, created_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, id);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, path)
+);
+"""
+
+
+def _pid_alive(pid: int | None) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _start_time(pid: int) -> str | None:
+    """Start time of a process in clock ticks since boot, or None without /proc."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # fields after the parenthesized command name, which may contain spaces
+    return stat.rsplit(")", 1)[1].split()[19]
+
+
+def process_token(pid: int | None = None) -> str:
+    """
+    Identifies a process even when its PID is reused, e.g. by a restarted
+    container that launches uvicorn the same way: 'pid:start time'.
+    """
+    pid = pid or os.getpid()
+    started = _start_time(pid)
+    return f"{pid}:{started}" if started else str(pid)
+
+
+def _owner_alive(token: str | None) -> bool:
+    if not token:
+        return False
+    pid = int(token.split(":", 1)[0])
+    if not _pid_alive(pid):
+        return False
+    return ":" not in token or process_token(pid) == token
+
+
+class JobStore:
+    """
+    SQLite-backed (WAL mode) store for job state, progress events and result
+    paths. Every process, including forked job processes, opens its own
+    connection, so all uvicorn workers see the same jobs.
+    """
+    _local = threading.local()
+    _initialized_pid: int | None = None
+    _init_lock = threading.Lock()
+
+    # ---------- connection handling ----------
+
+    @classmethod
+    def _conn(cls) -> sqlite3.Connection:
+        conn = getattr(cls._local, "conn", None)
+        if conn is None or cls._local.pid != os.getpid():
+            conn = sqlite3.connect(STORE_PATH, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            cls._local.conn, cls._local.pid = conn, os.getpid()
+            cls._init_schema(conn)
+        return conn
+
+    @classmethod
+    def _init_schema(cls, conn: sqlite3.Connection) -> None:
+        with cls._init_lock:
+            if cls._initialized_pid == os.getpid():
+                return
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                # stores from before owners were identified by process token
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            cls._initialized_pid = os.getpid()
+
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        """Exclusive write transaction, serialized across processes (re-entrant)."""
+        conn = cls._conn()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    # ---------- jobs ----------
+
+    @classmethod
+    def create(cls, job_id: str, kind: str, params: dict | None = None) -> None:
+        now = time.time()
+        params = params or {}
+        cls._conn().execute(
+            "INSERT INTO jobs (id, kind, action, status, params, owner, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'created', ?, ?, ?, ?)",
+            (job_id, kind, params.get("action"), json.dumps(params), process_token(), now, now),
+        )
+
+    @classmethod
+    def get(cls, job_id: str) -> dict | None:
+        row = cls._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"] or "{}")
+        return job
+
+    @classmethod
+    def update(cls, job_id: str, **fields) -> None:
+        if "params" in fields:
+            fields["params"] = json.dumps(fields["params"])
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        cls._conn().execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+        )
+
+    @classmethod
+    def by_status(cls, status: str) -> list[dict]:
+        """Jobs with the given status in admission order."""
+        rows = cls._conn().execute(
+            "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, created_at",
+            (status,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    @classmethod
+    def delete(cls, job_id: str) -> None:
+        with cls.transaction() as conn:
+            conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    @classmethod
+    def request_cancel(cls, job_id: str) -> None:
+        cls.update(job_id, cancel_requested=1)
+
+    @classmethod
+    def cancel_requested(cls, job_id: str) -> bool:
+        row = cls._conn().execute(
+            "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return bool(row and row[0])
+
+    @classmethod
+    def average_duration(cls, action: str, last: int = 20) -> float | None:
+        row = cls._conn().execute(
+            "SELECT AVG(finished_at - started_at) FROM ("
+            "  SELECT started_at, finished_at FROM jobs"
+            "  WHERE action = ? AND status = 'done' AND started_at IS NOT NULL"
+            "  ORDER BY finished_at DESC LIMIT ?)",
+            (action, last),
+        ).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    # ---------- events ----------
+
+    @classmethod
+    def add_event(cls, job_id: str, message) -> int | None:
+        """
+        Append a progress message and update the job state it implies.
+        '[RESULT PATH] ...' messages are stored as job results instead of as
+        events. The final status is only set by '[DONE ALL]', from the
+        '[CANCELLED]' and '[ERROR]' events since the job last (re)started, so
+        a job that is still cleaning up keeps counting as running.
+        """
+        message = str(message)
+        now = time.time()
+        if message.startswith("[RESULT PATH] "):
+            cls.add_result(job_id, message.replace("[RESULT PATH] ", "").strip())
+            return None
+
+        with cls.transaction() as conn:
+            cur = conn.execute(
+                "INSERT INTO job_events (job_id, created_at, message) VALUES (?, ?, ?)",
+                (job_id, now, message),
+            )
+            if message == "[DONE ALL]":
+                since = (
+                    "SELECT COALESCE(MAX(id), 0) FROM job_events "
+                    "WHERE job_id = jobs.id AND message = '[RESUMED]'"
+                )
+                conn.execute(
+                    "UPDATE jobs SET finished_at = ?, updated_at = ?, status = CASE "
+                    "WHEN status IN ('failed', 'cancelled', 'interrupted') THEN status "
+                    "WHEN EXISTS (SELECT 1 FROM job_events WHERE job_id = jobs.id "
+                    f"AND message = '[CANCELLED]' AND id > ({since})) THEN 'cancelled' "
+                    "WHEN EXISTS (SELECT 1 FROM job_events WHERE job_id = jobs.id "
+                    f"AND substr(message, 1, 7) = '[ERROR]' AND id > ({since})) THEN 'failed' "
+                    "ELSE 'done' END WHERE id = ?",
+                    (now, now, job_id),
+                )
+            return cur.lastrowid
+
+    @classmethod
+    def messages_with_prefix(cls, job_id: str, prefix: str) -> list[str]:
+        rows = cls._conn().execute(
+            "SELECT message FROM job_events WHERE job_id = ? AND substr(message, 1, ?) = ? ORDER BY id",
+            (job_id, len(prefix), prefix),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    @classmethod
+    def last_event_id(cls, job_id: str, message: str) -> int:
+        """Id of the latest event with exactly this message, or 0."""
+        row = cls._conn().execute(
+            "SELECT MAX(id) FROM job_events WHERE job_id = ? AND message = ?",
+            (job_id, message),
+        ).fetchone()
+        return row[0] or 0
+
+    @classmethod
+    def events(cls, job_id: str, after_id: int = 0, limit: int = 500) -> list[tuple[int, str]]:
+        rows = cls._conn().execute(
+            "SELECT id, message FROM job_events WHERE job_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (job_id, after_id, limit),
+        ).fetchall()
+        return [(r["id"], r["message"]) for r in rows]
+
+    # ---------- results ----------
+
+    @classmethod
+    def add_result(cls, job_id: str, path: str) -> None:
+        cls._conn().execute(
+            "INSERT OR IGNORE INTO job_results (job_id, path, created_at) VALUES (?, ?, ?)",
+            (job_id, path, time.time()),
+        )
+
+    @classmethod
+    def results(cls, job_id: str) -> list[str]:
+        rows = cls._conn().execute(
+            "SELECT path FROM job_results WHERE job_id = ? ORDER BY created_at", (job_id,)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    # ---------- maintenance ----------
+
+    @classmethod
+    def mark_orphans(cls) -> None:
+        """Jobs whose owning API process is gone can never finish: mark them interrupted."""
+        rows = cls._conn().execute(
+            "SELECT id, owner FROM jobs WHERE status IN ('created', 'queued', 'running')"
+        ).fetchall()
+        for row in rows:
+            if not _owner_alive(row["owner"]):
+                logger.warning(f"Job {row['id']} lost its owner process; marking interrupted")
+                cls.update(row["id"], status="interrupted")
+                cls.add_event(row["id"], "[ERROR] Job was interrupted by a server restart")
+                cls.add_event(row["id"], "[DONE ALL]")
+
+    @classmethod
+    def expired(cls, older_than_days: float = RETENTION_DAYS) -> list[str]:
+        """Ids of jobs that finished more than `older_than_days` ago."""
+        cutoff = time.time() - older_than_days * 86400
+        placeholders = ", ".join("?" for _ in FINAL_STATUSES)
+        rows = cls._conn().execute(
+            f"SELECT id FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+            (*FINAL_STATUSES, cutoff),
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+
+class StoreQueue:
+    """Queue-like handle that appends job messages to the JobStore (picklable)."""
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def put(self, msg) -> None:
+        JobStore.add_event(self.job_id, msg)
+
+
+class StoreCancelEvent:
+    """Event-like handle backed by the job's cancel flag in the JobStore (picklable)."""
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def is_set(self) -> bool:
+        return JobStore.cancel_requested(self.job_id)
+
+    def set(self) -> None:
+        JobStore.request_cancel(self.job_id)
+
+    def clear(self) -> None:
+        JobStore.update(self.job_id, cancel_requested=0)
@@ -0,0 +1,74 @@
+import io
+import os
+from typing import Iterable, Iterator
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+
+# Output files of a session that are returned to the user
+ALLOWED_FILENAMES = {"trials_and_sessions_annotated.xlsx"}
+ALLOWED_SUFFIXES = ("Processor.log",)
+# Already compressed formats are stored as is instead of deflated again
+STORED_SUFFIXES = (".xlsx",)
+CHUNK_SIZE = 1024 * 1024
+
+
+class _ChunkSink(io.RawIOBase):
+    """Non-seekable file that collects what ZipFile writes until it is drained."""
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def result_files(base_dir: str | None, session_dirs: Iterable[str]) -> list[tuple[str, str]]:
+    """
+    Output files of finished sessions as (path, name inside the archive),
+    with names relative to the job's base directory. Sessions outside of it,
+    or of jobs without a local base directory, are named after their folder.
+    """
+    files = []
+    for session_dir in session_dirs:
+        if not os.path.isdir(session_dir):
+            continue
+        root = os.path.dirname(os.path.abspath(session_dir))
+        if base_dir and os.path.commonpath(
+            [os.path.abspath(base_dir), os.path.abspath(session_dir)]
+        ) == os.path.abspath(base_dir):
+            root = base_dir
+        for name in sorted(os.listdir(session_dir)):
+            path = os.path.join(session_dir, name)
+            if not os.path.isfile(path):
+                continue
+            if name in ALLOWED_FILENAMES or name.endswith(ALLOWED_SUFFIXES):
+                files.append((path, os.path.relpath(path, root)))
+    return files
+
+
+def stream_zip(files: Iterable[tuple[str, str]]) -> Iterator[bytes]:
+    """
+    Generate a zip archive of `files` chunk by chunk, without building it in
+    memory or on disk first.
+    """
+    sink = _ChunkSink()
+    with ZipFile(sink, "w") as zf:
+        for path, arcname in files:
+            info = ZipInfo.from_file(path, arcname)
+            info.compress_type = ZIP_STORED if path.endswith(STORED_SUFFIXES) else ZIP_DEFLATED
+            with open(path, "rb") as src, zf.open(info, "w") as dst:
+                while chunk := src.read(CHUNK_SIZE):
+                    dst.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    if data := sink.drain():
+        yield data
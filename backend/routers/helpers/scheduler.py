@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Callable
+
+from routers.helpers.job_store import JobStore
+from routers.helpers.worker_pool import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+def _total_ram_gb() -> float:
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) / 1024 ** 2
+    except (OSError, ValueError):
+        pass
+    return 16.0
+
+
+# Machine capacity shared by all jobs
+CPU_SLOTS = float(os.getenv("SCHEDULER_CPU_SLOTS", os.cpu_count() or 4))
+RAM_SLOTS_GB = float(os.getenv("SCHEDULER_RAM_GB", _total_ram_gb()))
+
+# Resources one job of each action type reserves while it runs.
+# Override with SCHEDULER_REQUIREMENTS='{"transcribe": {"cpu": 8, "ram_gb": 12}}'
+REQUIREMENTS = {
+    "transcribe": {"cpu": 4, "ram_gb": 10},
+    "translate": {"cpu": 2, "ram_gb": 6},
+    "gloss": {"cpu": 2, "ram_gb": 6},
+    "transliterate": {"cpu": 1, "ram_gb": 1},
+    "create columns": {"cpu": 1, "ram_gb": 1},
+    "default": {"cpu": 2, "ram_gb": 4},
+}
+REQUIREMENTS.update(json.loads(os.getenv("SCHEDULER_REQUIREMENTS", "{}")))
+
+# Assumed job duration in seconds until real durations have been observed
+DEFAULT_DURATION = float(os.getenv("SCHEDULER_DEFAULT_DURATION", "300"))
+# Seconds a cancelled job process gets to exit after SIGTERM before it is killed
+STOP_TIMEOUT = float(os.getenv("SCHEDULER_STOP_TIMEOUT", "5"))
+
+
+def requirements_for(action: str) -> tuple[float, float]:
+    """
+    (cpu, ram_gb) reserved by a job. Pipelines run their stages one after the
+    other, so they reserve the largest requirement of any stage. Requests are
+    clamped to the machine size so that every job can eventually run alone.
+    """
+    stages = [a.strip() for a in str(action).split(",") if a.strip()] or ["default"]
+    reqs = [REQUIREMENTS.get(s, REQUIREMENTS["default"]) for s in stages]
+    cpu = max(r.get("cpu", 0) for r in reqs)
+    ram = max(r.get("ram_gb", 0) for r in reqs)
+    return min(cpu, CPU_SLOTS), min(ram, RAM_SLOTS_GB)
+
+
+class ScheduledJob:
+    """A job accepted by this process, waiting for or holding its resource slots."""
+    def __init__(self, job, action: str, start_fn: Callable, priority: int):
+        self.job = job
+        self.action = action
+        self.start_fn = start_fn
+        self.priority = priority
+        self.submitted_at = time.time()
+        self.last_position: int | None = None
+        self.stopping = False
+        self.kill_at: float | None = None
+
+    def is_running(self) -> bool:
+        process = self.job.process
+        if process is not None:
+            return process.is_alive()
+        return WorkerPool.is_active(self.job.id)
+
+    def stop(self) -> None:
+        """
+        Ask a running job to stop without waiting for it: pooled jobs
+        cooperatively, dedicated processes with SIGTERM. `kill_if_overdue`
+        escalates once STOP_TIMEOUT has passed.
+        """
+        self.stopping = True
+        process = self.job.process
+        if process is None:
+            WorkerPool.cancel(self.job.id)
+        elif process.is_alive():
+            process.terminate()
+            self.kill_at = time.monotonic() + STOP_TIMEOUT
+
+    def kill_if_overdue(self) -> None:
+        process = self.job.process
+        if self.kill_at is not None and time.monotonic() > self.kill_at and process.is_alive():
+            logger.warning(f"Force killing process for job {self.job.id}")
+            process.kill()
+            self.kill_at = None
+
+
+class JobScheduler:
+    """
+    Admission control in front of the job processes, shared by all API worker
+    processes through the JobStore. Jobs wait with status 'queued' (higher
+    priority first, then submission order) until enough CPU and RAM slots are
+    free for their action type, counting the running jobs of every process.
+    Each process starts only the jobs it accepted itself, and waiting jobs
+    receive '[QUEUED] ...' events with their position and estimated start.
+    """
+    _pending: dict[str, ScheduledJob] = {}
+    _running: dict[str, ScheduledJob] = {}
+    _cond = threading.Condition()
+    _pump: threading.Thread | None = None
+    _last_orphan_check = 0.0
+
+    @classmethod
+    def submit(cls, job, action: str, start_fn: Callable, priority: int = 0) -> None:
+        """
+        Queue a job for admission.
+
+        Args:
+            job: Job object; its process attribute is set once it starts.
+            action (str): Action type used to look up resource requirements.
+            start_fn (Callable): Starts the job and returns its Process, or
+                None if it was handed to the warm worker pool.
+            priority (int): Higher values are admitted first.
+        """
+        entry = ScheduledJob(job, action, start_fn, priority)
+        JobStore.update(job.id, status="queued", action=action, priority=priority)
+        with cls._cond:
+            cls._pending[job.id] = entry
+            cls._ensure_pump()
+            cls._cond.notify()
+
+    @classmethod
+    def cancel(cls, job_id: str) -> None:
+        """
+        Flag a job as cancelled. The process that owns it drops it from the
+        queue or stops it on its next scheduling tick, and reports
+        '[CANCELLED]' and '[DONE ALL]' once the job has actually stopped.
+        """
+        JobStore.request_cancel(job_id)
+        with cls._cond:
+            cls._cond.notify()
+
+    # ---------- internals (called with the condition held) ----------
+
+    @classmethod
+    def _ensure_pump(cls) -> None:
+        if cls._pump and cls._pump.is_alive():
+            return
+        cls._pump = threading.Thread(target=cls._run, daemon=True)
+        cls._pump.start()
+
+    @staticmethod
+    def _free(running: list[dict]) -> tuple[float, float]:
+        reqs = [requirements_for(r["action"]) for r in running]
+        cpu = CPU_SLOTS - sum(c for c, _ in reqs)
+        ram = RAM_SLOTS_GB - sum(r for _, r in reqs)
+        return cpu, ram
+
+    @staticmethod
+    def _expected_duration(action: str) -> float:
+        return JobStore.average_duration(action) or DEFAULT_DURATION
+
+    @classmethod
+    def _apply_cancellations(cls) -> None:
+        for job_id in list(cls._pending):
+            if JobStore.cancel_requested(job_id):
+                entry = cls._pending.pop(job_id)
+                entry.job.queue.put("[CANCELLED]")
+                entry.job.queue.put("[DONE ALL]")
+        for job_id, entry in cls._running.items():
+            if not entry.stopping and JobStore.cancel_requested(job_id):
+                entry.stop()
+
+    @classmethod
+    def _reap(cls) -> None:
+        for job_id, entry in list(cls._running.items()):
+            if entry.is_running():
+                entry.kill_if_overdue()
+                continue
+            cls._running.pop(job_id)
+            if not (JobStore.get(job_id) or {}).get("finished_at"):
+                # the process died, or was stopped, without reporting completion
+                if entry.stopping:
+                    entry.job.queue.put("[CANCELLED]")
+                else:
+                    entry.job.queue.put("[ERROR] Job process exited unexpectedly")
+                entry.job.queue.put("[DONE ALL]")
+
+    @classmethod
+    def _admit(cls) -> None:
+        """
+        Start queued jobs in order while their slots are free. Idle warm
+        workers keep their models loaded, so they hold the RAM of their
+        action until they are evicted to make room for a job.
+        """
+        to_start = []
+        # strict priority order across all processes: a large job at the head
+        # of the queue is never overtaken
+        with JobStore.transaction():
+            running = JobStore.by_status("running")
+            # jobs of this process that already reported a final status but
+            # are still shutting down keep their slots until they are reaped
+            counted = {row["id"] for row in running}
+            running += [
+                row for row in (JobStore.get(job_id) for job_id in cls._running if job_id not in counted)
+                if row is not None
+            ]
+            cpu, ram = cls._free(running)
+            idle = WorkerPool.idle_keys()
+            ram -= sum(requirements_for(key[0])[1] for key in idle)
+            for row in JobStore.by_status("queued"):
+                need_cpu, need_ram = requirements_for(row["action"])
+                while need_ram > ram and need_cpu <= cpu and idle:
+                    key = idle.pop(0)
+                    if WorkerPool.evict(key):
+                        ram += requirements_for(key[0])[1]
+                if need_cpu > cpu or need_ram > ram:
+                    break
+                cpu, ram = cpu - need_cpu, ram - need_ram
+                entry = cls._pending.pop(row["id"], None)
+                if entry is None:
+                    # owned by another API process, which will start it
+                    continue
+                JobStore.update(row["id"], status="running", started_at=time.time())
+                to_start.append(entry)
+
+        for entry in to_start:
+            try:
+                entry.job.process = entry.start_fn()
+            except Exception as e:
+                logger.error(f"Failed to start job {entry.job.id}: {e}")
+                entry.job.queue.put(f"[ERROR] Failed to start processing: {e}")
+                entry.job.queue.put("[DONE ALL]")
+                continue
+            cls._running[entry.job.id] = entry
+            if entry.last_position is not None:
+                waited = time.time() - entry.submitted_at
+                entry.job.queue.put(f"[STARTED] after waiting {waited:.0f}s in queue")
+
+    @classmethod
+    def _estimate_starts(cls, running: list[dict], queued: list[dict]) -> list[float]:
+        """
+        Simulate admission with the average observed duration per action to
+        estimate the start time of each queued job, in queue order.
+        """
+        now = time.time()
+        finishing = []
+        for r in running:
+            cpu, ram = requirements_for(r["action"])
+            end = (r["started_at"] or now) + cls._expected_duration(r["action"])
+            finishing.append((max(end, now), cpu, ram))
+        cpu, ram = cls._free(running)
+        clock, starts = now, []
+        for row in queued:
+            need_cpu, need_ram = requirements_for(row["action"])
+            finishing.sort()
+            while (need_cpu > cpu or need_ram > ram) and finishing:
+                clock, f_cpu, f_ram = finishing.pop(0)
+                cpu, ram = cpu + f_cpu, ram + f_ram
+            starts.append(clock)
+            cpu, ram = cpu - need_cpu, ram - need_ram
+            finishing.append((clock + cls._expected_duration(row["action"]), need_cpu, need_ram))
+        return starts
+
+    @classmethod
+    def _report_positions(cls) -> None:
+        if not cls._pending:
+            return
+        queued = JobStore.by_status("queued")
+        starts = cls._estimate_starts(JobStore.by_status("running"), queued)
+        for position, (row, start) in enumerate(zip(queued, starts), start=1):
+            entry = cls._pending.get(row["id"])
+            if entry is None or entry.last_position == position:
+                continue
+            entry.last_position = position
+            eta = max(start - time.time(), 0)
+            entry.job.queue.put(
+                f"[QUEUED] Position {position} of {len(queued)}, "
+                f"estimated start in ~{eta / 60:.0f} min"
+            )
+
+    @classmethod
+    def _run(cls) -> None:
+        while True:
+            with cls._cond:
+                try:
+                    if time.time() - cls._last_orphan_check > 30:
+                        JobStore.mark_orphans()
+                        cls._last_orphan_check = time.time()
+                    cls._apply_cancellations()
+                    cls._reap()
+                    cls._admit()
+                    cls._report_positions()
+                except Exception as e:
+                    logger.error(f"Scheduler tick failed: {e}")
+                cls._cond.wait(timeout=1.0)
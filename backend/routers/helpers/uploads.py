@@ -0,0 +1,168 @@
+import os
+import re
+import time
+import fcntl
+import shutil
+import tempfile
+import uuid
+import logging
+from pathlib import Path
+from typing import AsyncIterator
+from zipfile import ZipFile
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Partial and finished chunked uploads live here until they are consumed
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "tgt_uploads")))
+# Bytes copied per read/write when streaming uploads to disk
+CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Chunked uploads not touched for this long are pruned on startup
+UPLOAD_RETENTION_HOURS = float(os.getenv("UPLOAD_RETENTION_HOURS", "24"))
+# Largest accepted upload, and most chunked uploads in progress at once,
+# so that clients cannot fill the disk
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024 ** 3)))
+UPLOAD_MAX_ACTIVE = int(os.getenv("UPLOAD_MAX_ACTIVE", "16"))
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadStore:
+    """
+    Resumable chunked uploads backed by one file per upload-id. Clients
+    append chunks at the current size of the file; after a dropped
+    connection they ask for the size and continue from there. Appends hold
+    an exclusive flock on the file, so only one request writes to an upload
+    at a time, whichever uvicorn worker process serves it.
+    """
+
+    @classmethod
+    def path(cls, upload_id: str) -> Path:
+        path = UPLOAD_DIR / f"{upload_id}.part"
+        if not _UPLOAD_ID.match(upload_id or "") or not path.exists():
+            raise HTTPException(status_code=404, detail=f"Upload '{upload_id}' not found")
+        return path
+
+    @classmethod
+    def create(cls) -> str:
+        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        if len(list(UPLOAD_DIR.glob("*.part"))) >= UPLOAD_MAX_ACTIVE:
+            raise HTTPException(status_code=429, detail="Too many uploads in progress, try again later")
+        upload_id = uuid.uuid4().hex
+        (UPLOAD_DIR / f"{upload_id}.part").touch()
+        return upload_id
+
+    @classmethod
+    def size(cls, upload_id: str) -> int:
+        return cls.path(upload_id).stat().st_size
+
+    @classmethod
+    async def append(cls, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """
+        Append a streamed chunk to the upload.
+
+        Args:
+            upload_id (str): Upload to extend.
+            offset (int): Position the chunk starts at; must equal the bytes
+                received so far.
+            chunks (AsyncIterator[bytes]): Request body stream.
+
+        Returns:
+            int: Bytes received so far, including data of an interrupted chunk.
+
+        Raises:
+            HTTPException: 409 if another chunk is being written or `offset`
+                is not the current size, 413 if the upload would exceed
+                UPLOAD_MAX_BYTES (the chunk is then dropped).
+        """
+        path = cls.path(upload_id)
+        with open(path, "ab") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(status_code=409, detail="Another chunk of this upload is being written")
+            size = os.fstat(f.fileno()).st_size
+            if offset != size:
+                raise HTTPException(status_code=409, detail=f"Upload is at offset {size}, not {offset}")
+            written = size
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                written += len(chunk)
+                if written > UPLOAD_MAX_BYTES:
+                    f.truncate(size)
+                    raise HTTPException(
+                        status_code=413, detail=f"Upload exceeds the limit of {UPLOAD_MAX_BYTES} bytes"
+                    )
+                await run_in_threadpool(f.write, chunk)
+            f.flush()
+            return os.fstat(f.fileno()).st_size
+
+    @classmethod
+    def discard(cls, upload_id: str) -> None:
+        try:
+            cls.path(upload_id).unlink()
+        except (HTTPException, OSError):
+            pass
+
+    @classmethod
+    def prune(cls, older_than_hours: float = UPLOAD_RETENTION_HOURS) -> None:
+        if not UPLOAD_DIR.is_dir():
+            return
+        cutoff = time.time() - older_than_hours * 3600
+        for path in UPLOAD_DIR.glob("*.part"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to prune upload {path}: {e}")
+
+
+def _copy_to_disk(upload: UploadFile, dest: Path) -> None:
+    upload.file.seek(0)
+    with open(dest, "wb") as out:
+        shutil.copyfileobj(upload.file, out, CHUNK_SIZE)
+
+
+def _extract(archive_path: Path, dest_dir: str) -> None:
+    with ZipFile(archive_path, "r") as archive:
+        archive.extractall(dest_dir)
+
+
+async def extract_upload(zipfile: UploadFile | None = None, upload_id: str | None = None) -> str:
+    """
+    Extract an uploaded zip archive into a new temporary directory without
+    holding the archive in memory or blocking the event loop.
+
+    Args:
+        zipfile (UploadFile, optional): Archive sent with the request.
+        upload_id (str, optional): Finished chunked upload to use instead;
+            it is consumed by the extraction.
+
+    Returns:
+        str: The temporary directory with the extracted files.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        if upload_id:
+            archive_path = UploadStore.path(upload_id)
+            await run_in_threadpool(_extract, archive_path, tmp_dir)
+            UploadStore.discard(upload_id)
+        else:
+            if (getattr(zipfile, "size", None) or 0) > UPLOAD_MAX_BYTES:
+                raise HTTPException(
+                    status_code=413, detail=f"Upload exceeds the limit of {UPLOAD_MAX_BYTES} bytes"
+                )
+            archive_path = Path(tmp_dir) / "upload.zip"
+            await run_in_threadpool(_copy_to_disk, zipfile, archive_path)
+            await run_in_threadpool(_extract, archive_path, tmp_dir)
+            archive_path.unlink()
+        return tmp_dir
+    except HTTPException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    except Exception as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=f"Failed to extract zip file: {str(e)}")
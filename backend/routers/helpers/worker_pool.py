@@ -0,0 +1,329 @@
+import os
+import time
+import queue
+import logging
+import threading
+import traceback
+from multiprocessing import Queue, Event
+
+from inference.processors.factory import ProcessorFactory
+from routers.helpers.job_processes import JobProcesses
+
+logger = logging.getLogger(__name__)
+
+# Number of warm worker processes kept alive at once (0 disables the pool)
+POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", "2"))
+# Seconds an idle warm worker is kept before it is shut down
+IDLE_TIMEOUT = float(os.getenv("WORKER_POOL_IDLE_TIMEOUT", "1800"))
+# Seconds a cancelled job may keep running before its worker is restarted
+CANCEL_GRACE = float(os.getenv("WORKER_POOL_CANCEL_GRACE", "30"))
+
+_STARTED = "[POOL STARTED]"
+# Seconds between checks for dead, stuck and idle workers
+HOUSEKEEPING_INTERVAL = 1.0
+
+
+class _ForwardingQueue:
+    """Queue stand-in handed to pooled jobs: tags every message with the job id."""
+    def __init__(self, job_id: str, outbox: Queue):
+        self.job_id = job_id
+        self.outbox = outbox
+
+    def put(self, msg):
+        self.outbox.put((self.job_id, msg))
+
+
+class _PooledJob:
+    """Minimal job object exposing the attributes AbstractInferenceWorker expects."""
+    def __init__(self, job_id: str, outbox: Queue, cancel_event):
+        self.id = job_id
+        self.queue = _ForwardingQueue(job_id, outbox)
+        self.cancel_event = cancel_event
+
+
+def _serve(inbox: Queue, outbox: Queue, cancel_event, cancelled: Queue) -> None:
+    """
+    Main loop of a warm worker process. Jobs arrive on the inbox as
+    (job_id, worker_cls, worker_kwargs); the processor built for the first
+    job is kept and handed to every following job, so models stay loaded.
+    """
+    processor = None
+    cancelled_ids = set()
+
+    while True:
+        task = inbox.get()
+        if task is None:
+            break
+        job_id, worker_cls, worker_kwargs = task
+
+        # collect cancellations of jobs that were still waiting in the inbox
+        while True:
+            try:
+                cancelled_ids.add(cancelled.get_nowait())
+            except queue.Empty:
+                break
+
+        job = _PooledJob(job_id, outbox, cancel_event)
+        cancel_event.clear()
+        outbox.put((job_id, _STARTED))
+
+        if job_id in cancelled_ids:
+            job.queue.put("[CANCELLED]")
+            job.queue.put("[DONE ALL]")
+            continue
+
+        try:
+            worker = worker_cls(**worker_kwargs, job=job)
+            if processor is None:
+                processor = ProcessorFactory.get_processor(
+                    worker.language,
+                    worker.action,
+                    worker.instruction,
+                    worker.translationModel,
+                    worker.glossingModel,
+                    worker.transcriptionModel,
+                    worker.diarize,
+                )
+            worker.shared_processor = processor
+            worker.run()
+        except BaseException as e:
+            job.queue.put(f"[ERROR] {e}")
+            job.queue.put(traceback.format_exc())
+            job.queue.put("[DONE ALL]")
+
+
+class _PoolSlot:
+    """Parent-side handle of one warm worker process."""
+    def __init__(self, key: tuple, outbox: Queue):
+        self.key = key
+        self.inbox: Queue = Queue()
+        self.cancelled: Queue = Queue()
+        self.cancel_event = Event()
+        self.tasks: dict[str, tuple] = {}
+        self.current: str | None = None
+        self.cancel_deadline: float | None = None
+        self.last_used = time.monotonic()
+        self.process = JobProcesses.start(
+            _serve, (self.inbox, outbox, self.cancel_event, self.cancelled)
+        )
+
+    @property
+    def busy(self) -> bool:
+        return bool(self.tasks)
+
+    def submit(self, task: tuple) -> None:
+        self.tasks[task[0]] = task
+        self.last_used = time.monotonic()
+        self.inbox.put(task)
+
+    def stop(self, timeout: float = 5) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=timeout)
+            if self.process.is_alive():
+                self.process.kill()
+
+
+class WorkerPool:
+    """
+    Long-lived pool of inference worker processes keyed by
+    (action, language, instruction, translation model, glossing model).
+    Each process keeps its processor, and therefore its models, loaded
+    between jobs and takes new jobs from its own queue.
+    """
+    _slots: dict[tuple, _PoolSlot] = {}
+    _jobs: dict[str, object] = {}
+    _outbox: Queue | None = None
+    _dispatcher: threading.Thread | None = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def make_key(worker_kwargs: dict) -> tuple:
+        return (
+            worker_kwargs.get("action"),
+            str(worker_kwargs.get("language", "")).lower(),
+            worker_kwargs.get("instruction"),
+            worker_kwargs.get("translationModel"),
+            worker_kwargs.get("glossingModel"),
+            worker_kwargs.get("transcriptionModel"),
+            worker_kwargs.get("diarize"),
+        )
+
+    @classmethod
+    def submit(cls, job, worker_cls, worker_kwargs: dict) -> bool:
+        """
+        Dispatch a job to the warm worker for its configuration.
+
+        Returns:
+            bool: False if the pool is disabled, full of busy workers or the
+            worker for this configuration is busy with another job, in which
+            case the caller should fall back to a dedicated process.
+        """
+        if POOL_SIZE <= 0:
+            return False
+
+        key = cls.make_key(worker_kwargs)
+        with cls._lock:
+            cls._ensure_dispatcher()
+            slot = cls._slots.get(key)
+            if slot is not None and not slot.process.is_alive():
+                cls._drop_slot(slot)
+                slot = None
+            if slot is not None and slot.busy:
+                # run identical jobs side by side instead of queueing them
+                return False
+            if slot is None:
+                if len(cls._slots) >= POOL_SIZE and not cls._evict_idle():
+                    return False
+                slot = _PoolSlot(key, cls._outbox)
+                cls._slots[key] = slot
+                logger.info(f"Started warm worker for {key}")
+
+            cls._jobs[job.id] = job
+            slot.submit((job.id, worker_cls, worker_kwargs))
+        return True
+
+    @classmethod
+    def cancel(cls, job_id: str) -> bool:
+        """
+        Cancel a pooled job; its worker still reports '[CANCELLED]' and
+        '[DONE ALL]'. Returns False if the job is not in the pool.
+        """
+        with cls._lock:
+            for slot in cls._slots.values():
+                if job_id not in slot.tasks:
+                    continue
+                if slot.current == job_id:
+                    slot.cancel_event.set()
+                    slot.cancel_deadline = time.monotonic() + CANCEL_GRACE
+                else:
+                    slot.cancelled.put(job_id)
+                return True
+        return False
+
+    @classmethod
+    def idle_keys(cls) -> list[tuple]:
+        """Keys of live idle warm workers, least recently used first."""
+        with cls._lock:
+            idle = [s for s in cls._slots.values() if not s.busy and s.process.is_alive()]
+            return [s.key for s in sorted(idle, key=lambda s: s.last_used)]
+
+    @classmethod
+    def evict(cls, key: tuple) -> bool:
+        """Shut down the warm worker for `key` if it is idle, freeing its models."""
+        with cls._lock:
+            slot = cls._slots.get(key)
+            if slot is None or slot.busy:
+                return False
+            logger.info(f"Evicting warm worker for {key} to make room for a job")
+            # an idle worker exits on its own once told to; waiting for it
+            # would hold up the scheduler
+            cls._slots.pop(key, None)
+            slot.inbox.put(None)
+            return True
+
+    @classmethod
+    def is_active(cls, job_id: str) -> bool:
+        """True while a pooled job is waiting for or running on a warm worker."""
+        with cls._lock:
+            return any(job_id in slot.tasks for slot in cls._slots.values())
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            for slot in list(cls._slots.values()):
+                cls._drop_slot(slot)
+
+    # ---------- internals (called with the lock held) ----------
+
+    @classmethod
+    def _ensure_dispatcher(cls) -> None:
+        if cls._dispatcher and cls._dispatcher.is_alive():
+            return
+        cls._outbox = cls._outbox or Queue()
+        cls._dispatcher = threading.Thread(target=cls._dispatch, daemon=True)
+        cls._dispatcher.start()
+
+    @classmethod
+    def _evict_idle(cls) -> bool:
+        idle = [s for s in cls._slots.values() if not s.busy]
+        if not idle:
+            return False
+        victim = min(idle, key=lambda s: s.last_used)
+        logger.info(f"Evicting warm worker for {victim.key}")
+        cls._drop_slot(victim)
+        return True
+
+    @classmethod
+    def _drop_slot(cls, slot: _PoolSlot) -> None:
+        cls._slots.pop(slot.key, None)
+        slot.inbox.put(None)
+        slot.stop()
+
+    @classmethod
+    def _restart_slot(cls, slot: _PoolSlot, message: str) -> None:
+        """
+        Kill a stuck worker, finish its current job with `message` and move
+        its still-waiting jobs to a fresh one.
+        """
+        logger.warning(f"Restarting warm worker for {slot.key}")
+        stuck = slot.current
+        cls._drop_slot(slot)
+        if stuck in cls._jobs:
+            job = cls._jobs.pop(stuck)
+            job.queue.put(message)
+            job.queue.put("[DONE ALL]")
+        waiting = [t for job_id, t in slot.tasks.items() if job_id != stuck]
+        if waiting:
+            fresh = _PoolSlot(slot.key, cls._outbox)
+            cls._slots[slot.key] = fresh
+            for task in waiting:
+                fresh.submit(task)
+
+    @classmethod
+    def _housekeeping(cls) -> None:
+        now = time.monotonic()
+        with cls._lock:
+            for slot in list(cls._slots.values()):
+                if slot.busy and not slot.process.is_alive():
+                    cls._restart_slot(slot, "[ERROR] Worker process exited unexpectedly")
+                elif slot.cancel_deadline and now > slot.cancel_deadline:
+                    cls._restart_slot(slot, "[CANCELLED]")
+                elif not slot.busy and now - slot.last_used > IDLE_TIMEOUT:
+                    logger.info(f"Shutting down idle warm worker for {slot.key}")
+                    cls._drop_slot(slot)
+
+    @classmethod
+    def _dispatch(cls) -> None:
+        """Forward messages from pooled workers to the owning jobs' queues."""
+        last_housekeeping = time.monotonic()
+        while True:
+            # also between messages, so that a chatty job cannot delay it
+            if time.monotonic() - last_housekeeping >= HOUSEKEEPING_INTERVAL:
+                cls._housekeeping()
+                last_housekeeping = time.monotonic()
+            try:
+                job_id, msg = cls._outbox.get(timeout=HOUSEKEEPING_INTERVAL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            with cls._lock:
+                slot = next((s for s in cls._slots.values() if job_id in s.tasks), None)
+                if msg == _STARTED:
+                    if slot:
+                        slot.current = job_id
+                    continue
+
+                job = cls._jobs.get(job_id)
+                if job is not None:
+                    job.queue.put(msg)
+
+                if msg == "[DONE ALL]":
+                    cls._jobs.pop(job_id, None)
+                    if slot:
+                        slot.tasks.pop(job_id, None)
+                        slot.current = None
+                        slot.cancel_deadline = None
+                        slot.last_used = time.monotonic()
@@ -6,16 +6,28 @@ from pathlib import Path
 from typing import Optional
 from fastapi import status
 from fastapi import APIRouter, HTTPException, Request, Form, UploadFile, File, Body, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 
-from routers.helpers.job_manager import JobManager, ProcessingService, JobCleanupService
+from routers.helpers.job_manager import (
+    JobManager,
+    ProcessingService,
+    JobCleanupService,
+    job_event_stream,
+)
+from routers.helpers.scheduler import JobScheduler
+from routers.helpers.job_store import JobStore, FINAL_STATUSES, process_token
+from routers.helpers.result_archive import result_files, stream_zip
+from routers.inference.inference_workers import OneDriveWorker, ZipWorker
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 MODELS_BASE = Path(__file__).resolve().parent.parent.parent / "models"
 
+# Jobs in these states stopped early and can continue from their checkpoints
+RESUMABLE_STATUSES = ("failed", "cancelled", "interrupted")
+
 @router.post("/process")
 async def process(
     request: Request,
@@ -23,19 +35,35 @@ async def process(
     language: str = Form(...),
     glossingModel: Optional[str] = Form(None),
     translationModel: Optional[str] = Form(None),
+    transcriptionModel: Optional[str] = Form(None),
+    diarize: Optional[bool] = Form(None),
     instruction: Optional[str] = Form(None),
     access_token: Optional[str] = Form(None),
     zipfile: Optional[UploadFile] = File(None),
+    upload_id: Optional[str] = Form(None),
     base_dir: Optional[str] = Form(None),
+    priority: int = Form(0),
 ):
     """Process files either from uploaded zip or OneDrive."""
-    # Initialize job
-    job = JobManager.create()
-    job.token = access_token
-
     # Normalize model names
     glossing_model = ProcessingService.normalize_model_name(glossingModel)
     translation_model = ProcessingService.normalize_model_name(translationModel)
+    transcription_model = ProcessingService.normalize_model_name(transcriptionModel)
+
+    # Initialize job
+    job = JobManager.create("inference", {
+        "action": action,
+        "language": language,
+        "instruction": instruction,
+        "translationModel": translation_model,
+        "glossingModel": glossing_model,
+        "transcriptionModel": transcription_model,
+        "diarize": diarize,
+        "source": "zip" if zipfile or upload_id else "onedrive",
+        "share_link": None if zipfile or upload_id else base_dir,
+        "priority": priority,
+    })
+    job.token = access_token
 
     logger.info(f"Processing job {job.id} - glossingModel: {glossing_model}, translationModel: {translation_model}")
 
@@ -45,13 +73,20 @@ async def process(
         return {"job_id": job.id}
 
     try:
-        if zipfile:
-            # Handle zip file upload
-            tmp_dir = await ProcessingService.extract_zipfile(zipfile)
-            worker = ProcessingService.create_zip_worker(
-                tmp_dir, action, language, instruction,
-                translation_model, glossing_model, job
-            )
+        worker_kwargs = dict(
+            action=action,
+            language=language,
+            instruction=instruction,
+            translationModel=translation_model,
+            glossingModel=glossing_model,
+            transcriptionModel=transcription_model,
+            diarize=diarize,
+        )
+        if zipfile or upload_id:
+            # Handle zip file upload, sent with the request or in chunks
+            tmp_dir = await ProcessingService.extract_zipfile(zipfile, upload_id)
+            worker_cls = ZipWorker
+            worker_kwargs["base_dir"] = tmp_dir
             job.base_dir = tmp_dir
         else:
             # Handle OneDrive processing
@@ -60,14 +95,18 @@ async def process(
                     status_code=400, 
                     detail="Missing base_dir or access_token for online processing"
                 )
-            
-            worker = ProcessingService.create_onedrive_worker(
-                base_dir, action, language, instruction,
-                translation_model, glossing_model, access_token, job
-            )
-
-        # Start worker process
-        job.process = await ProcessingService.create_worker_process(worker.run)
+            worker_cls = OneDriveWorker
+            worker_kwargs["base_dir"] = base_dir
+            worker_kwargs["token"] = access_token
+
+        # Queue the job; it starts (on a warm pooled process when possible)
+        # once enough resource slots are free
+        JobScheduler.submit(
+            job,
+            action,
+            lambda: ProcessingService.start_worker(job, worker_cls, **worker_kwargs),
+            priority=priority,
+        )
         return {"job_id": job.id}
         
     except HTTPException:
@@ -79,56 +118,97 @@ async def process(
 
 
 @router.get("/{job_id}/stream")
-async def stream(job_id: str):
+async def stream(job_id: str, request: Request):
     """Stream job progress events via Server-Sent Events."""
     job = JobManager.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    async def event_generator():
-        """Generate events from job queue."""
-        loop = asyncio.get_event_loop()
-        
-        while True:
-            try:
-                message = await loop.run_in_executor(None, job.queue.get)
-                
-                # Handle special messages
-                if isinstance(message, str) and message.startswith("[ZIP PATH] "):
-                    job.zip_path = message.replace("[ZIP PATH] ", "").strip()
-                    continue
-                
-                yield {"data": message}
-                
-                if message == "[DONE ALL]":
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error in event generator for job {job_id}: {e}")
-                yield {"data": f"[ERROR] Stream error: {str(e)}"}
-                break
-
-    return EventSourceResponse(event_generator())
+    return EventSourceResponse(
+        job_event_stream(job.id, request.headers.get("last-event-id"))
+    )
 
 
 @router.get("/{job_id}/download")
-async def download(job_id: str, background_tasks: BackgroundTasks):
-    """Download processed results as zip file."""
+async def download(job_id: str, background_tasks: BackgroundTasks, partial: bool = False):
+    """
+    Download processed results as a zip file streamed from the finished
+    sessions. With `partial=true` the sessions finished so far are returned
+    while the job is still running.
+    """
     job = JobManager.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    if not job.zip_path or not os.path.exists(job.zip_path):
+
+    status = job.status
+    if status not in FINAL_STATUSES and not partial:
         raise HTTPException(status_code=404, detail="Results not ready")
 
-    # Schedule cleanup
-    background_tasks.add_task(JobCleanupService.cleanup_job, job_id, job)
-    
-    return FileResponse(
-        path=job.zip_path,
+    files = result_files(job.base_dir, JobStore.results(job_id))
+    if not files:
+        raise HTTPException(status_code=404, detail="Results not ready")
+
+    # Schedule cleanup once the complete results were sent; jobs that stopped
+    # early keep their files for /resume until the retention prune
+    if status == "done":
+        background_tasks.add_task(JobCleanupService.cleanup_job, job_id, job)
+
+    return StreamingResponse(
+        stream_zip(files),
         media_type="application/zip",
-        filename=f"{job.id}_results.zip"
+        headers={"Content-Disposition": f'attachment; filename="{job.id}_results.zip"'},
+    )
+
+
+@router.post("/{job_id}/resume")
+async def resume(job_id: str, access_token: Optional[str] = Form(None)):
+    """
+    Resume a failed, cancelled or interrupted job. Sessions and items that
+    were finished before are taken from their checkpoints instead of being
+    processed again. OneDrive jobs need a fresh access token.
+    """
+    record = JobStore.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    if record["status"] not in RESUMABLE_STATUSES:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {record['status']}; only failed, cancelled or interrupted jobs can be resumed"
+        )
+
+    params = record["params"]
+    worker_kwargs = dict(
+        action=params.get("action"),
+        language=params.get("language"),
+        instruction=params.get("instruction"),
+        translationModel=params.get("translationModel"),
+        glossingModel=params.get("glossingModel"),
+        transcriptionModel=params.get("transcriptionModel"),
+        diarize=params.get("diarize"),
+        resume=True,
+    )
+    if params.get("source") == "zip":
+        if not record["base_dir"] or not os.path.isdir(record["base_dir"]):
+            raise HTTPException(status_code=410, detail="Uploaded files are no longer available")
+        worker_cls = ZipWorker
+        worker_kwargs["base_dir"] = record["base_dir"]
+    else:
+        if not access_token:
+            raise HTTPException(status_code=400, detail="Missing access_token for online processing")
+        worker_cls = OneDriveWorker
+        worker_kwargs["base_dir"] = params.get("share_link")
+        worker_kwargs["token"] = access_token
+
+    job = JobManager.get(job_id)
+    job.token = access_token
+    JobStore.update(
+        job_id, cancel_requested=0, finished_at=None, owner=process_token()
     )
+    job.queue.put("[RESUMED]")
+    JobScheduler.submit(
+        job,
+        params.get("action"),
+        lambda: ProcessingService.start_worker(job, worker_cls, **worker_kwargs),
+        priority=params.get("priority", 0),
+    )
+    return {"job_id": job_id}
 
 
 @router.post("/cancel")
@@ -139,30 +219,17 @@ async def cancel(payload: dict = Body(...)):
         raise HTTPException(status_code=400, detail="Missing job_id")
     
     job = JobManager.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
     
     try:
-        # Signal cancellation
-        job.queue.put("[CANCELLED]")
-        job.queue.put("[DONE ALL]")
-        
-        # Terminate process if running
-        if job.process and job.process.is_alive():
-            job.process.terminate()
-            job.process.join(timeout=5)  # Wait up to 5 seconds
-            
-            if job.process.is_alive():
-                logger.warning(f"Force killing process for job {job_id}")
-                job.process.kill()
+        # The API process that owns the job drops it from the queue, or
+        # stops its worker, on its next scheduling tick; '[CANCELLED]' and
+        # '[DONE ALL]' follow once it has stopped
+        JobScheduler.cancel(job.id)
     
     except Exception as e:
         logger.error(f"Error cancelling job {job_id}: {e}")
     
-    finally:
-        JobManager.remove(job_id)
-    
-    return {"status": "cancelled"}
+    return {"status": "cancelling"}
 
 
 @router.get("/models/{task}")
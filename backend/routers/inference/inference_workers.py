@@ -2,11 +2,11 @@ import os
 import tempfile
 import traceback
 import shutil
-from zipfile import ZipFile, ZIP_DEFLATED
 from pathlib import Path
 
 from inference.processors.factory import ProcessorFactory
 from inference.worker import AbstractInferenceWorker
+from routers.helpers.job_store import JobStore
 from routers.helpers.onedrive import (
     download_sharepoint_folder,
     upload_file_replace_in_onedrive,
@@ -14,48 +14,23 @@ from routers.helpers.onedrive import (
 )
 
 class ZipWorker(AbstractInferenceWorker):
-    # allow-list for files to include in the zip
-    ALLOWED_FILENAMES = {
-        "trials_and_sessions_annotated.xlsx",
-        "transcription.log",
-        "translation.log",
-    }
-
     """
     Processes a single local folder (or multiple if your base_dir contains
-    sub-folders named “Session_*”), then zips up only the output files you care
-    about and reports the zip path.
+    sub-folders named “Session_*”) and reports every finished session, so
+    that its outputs can be streamed to the user as a zip while the job is
+    still running.
     """
     def _initial_message(self):
-        self._put("Preparing to process and zip outputs…")
+        self._put("Preparing to process uploaded sessions…")
     
     def _folder_to_process(self):
         yield self.base_dir
 
+    def _session_done(self, session_dir):
+        self._put(f"[RESULT PATH] {session_dir}")
+
     def _after_process(self):
-        """
-        After processing each folder, walk the folder tree and zip
-        up only the files in ALLOWED_FILENAMES, preserving their
-        path relative to self.base_dir.
-        """
-        base_dir = Path(self.base_dir)
-        zip_path = Path(tempfile.gettempdir()) / f"{self.job_id}_output.zip"
-        
-        try:
-            self._put(f"Creating ZIP archive at {zip_path}")
-            with ZipFile(zip_path, "w", compression=ZIP_DEFLATED) as zf:
-                for file_path in Path(self.current_folder).rglob("*"):
-                    # only include files in our allow-list
-                    if file_path.name in self.ALLOWED_FILENAMES:
-                        # compute path inside zip relative to the base dir
-                        arcname = file_path.relative_to(base_dir)
-                        zf.write(file_path, arcname=arcname)
-                        print(f"Added to zip: {arcname}")
-            print(f"Created ZIP archive at {zip_path}")
-            self._put(f"[ZIP PATH] {zip_path}")
-        except Exception as e:
-            print(f"Failed to create ZIP for job {self.job_id}: {e}")
-            self._put(f"[ERROR] Could not bundle outputs: {e}")
+        self._put("Results are ready for download")
 
 
 class OneDriveWorker(AbstractInferenceWorker):
@@ -64,12 +39,18 @@ class OneDriveWorker(AbstractInferenceWorker):
     then uploads the outputs back to OneDrive and cleans up.
     """
     def __init__(self, base_dir, action, language, instruction,
-                 translationModel, glossingModel, token, job):
+                 translationModel, glossingModel, token, job, resume=False,
+                 transcriptionModel=None, diarize=None):
         super().__init__(base_dir, action, language, instruction,
-                         translationModel, glossingModel, job)
+                         translationModel, glossingModel, job, resume, transcriptionModel, diarize)
         self.share_link = base_dir
         self.token = token
         self.sessions_meta = []
+        # downloads are deleted after every session, so checkpoints live outside them
+        self.checkpoint_root = os.path.join(tempfile.gettempdir(), "tgt_checkpoints", str(self.job_id))
+
+    def _checkpoint_dir(self):
+        return self.checkpoint_root
 
     def _initial_message(self):
         self._put("Checking for sessions on OneDrive…")
@@ -80,11 +61,23 @@ class OneDriveWorker(AbstractInferenceWorker):
             self.sessions_meta = [{"webUrl": self.share_link}]
         self._put(f"Found {len(self.sessions_meta)} session(s).")
 
+    def _uploaded_sessions(self) -> set:
+        """Sessions an earlier run of this job already uploaded."""
+        if not self.resume or not self.job:
+            return set()
+        prefix = "[DONE UPLOADED] "
+        return {m[len(prefix):] for m in JobStore.messages_with_prefix(self.job_id, prefix)}
+
     def _folder_to_process(self):
+        uploaded = self._uploaded_sessions()
         for meta in self.sessions_meta:
             if self.cancel.is_set():
                 break
 
+            if meta.get("name") in uploaded:
+                self._put(f"Session '{meta['name']}' was already processed, skipping")
+                continue
+
             link = meta.get("webUrl")
             self._put("Downloading from OneDrive…")
             self._tempdir_obj = tempfile.TemporaryDirectory(prefix=f"{self.job_id}_")
@@ -153,6 +146,7 @@ class OneDriveWorker(AbstractInferenceWorker):
             )
 
         shutil.rmtree(self.temp_root, ignore_errors=True)
+        shutil.rmtree(os.path.join(self.checkpoint_root, name), ignore_errors=True)
         self._put(f"[DONE UPLOADED] {name}")
 
         self._tempdir_obj.cleanup()
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Request, Query
+
+from routers.helpers.uploads import UploadStore
+
+router = APIRouter()
+
+
+@router.post("")
+async def create_upload():
+    """Start a resumable chunked upload; pass the id to /process as upload_id."""
+    return {"upload_id": UploadStore.create()}
+
+
+@router.get("/{upload_id}")
+async def upload_status(upload_id: str):
+    """Bytes received so far, i.e. the offset to resume from."""
+    return {"upload_id": upload_id, "size": UploadStore.size(upload_id)}
+
+
+@router.put("/{upload_id}")
+async def upload_chunk(upload_id: str, request: Request, offset: int = Query(...)):
+    """Append the raw request body at `offset`, streaming it to disk."""
+    size = await UploadStore.append(upload_id, offset, request.stream())
+    return {"upload_id": upload_id, "size": size}
+
+
+@router.delete("/{upload_id}")
+async def delete_upload(upload_id: str):
+    UploadStore.discard(upload_id)
+    return {"status": "deleted"}
@@ -0,0 +1,146 @@
+import os
+import hashlib
+
+import numpy as np
+import pytest
+
+from inference.transcription import audio as audio_module
+from inference.transcription.audio import AudioCache, file_sha256
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    decoded = []
+
+    def decode(path, sr):
+        decoded.append(path)
+        return np.full(1000, len(decoded), dtype=np.float32)
+
+    monkeypatch.setattr(audio_module, "_decode", decode)
+    monkeypatch.setattr(AudioCache, "directory", str(tmp_path / "cache"))
+    return decoded
+
+
+def _recording(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_cache_hit_returns_read_only_memmap(cache, tmp_path):
+    path = _recording(tmp_path, "a.mp3", b"first")
+
+    first = AudioCache.load(path, 16000)
+    again = AudioCache.load(path, 16000)
+
+    assert cache == [path]
+    assert isinstance(again, np.memmap) and not again.flags.writeable
+    np.testing.assert_array_equal(first, again)
+
+
+def test_oldest_entry_is_evicted_over_the_cap(cache, tmp_path, monkeypatch):
+    # one entry is 1000 float32 samples plus the .npy header
+    monkeypatch.setattr(AudioCache, "max_bytes", 2 * 4200)
+    paths = [_recording(tmp_path, f"{i}.mp3", f"clip {i}".encode()) for i in range(3)]
+    AudioCache.load(paths[0], 16000)
+    AudioCache.load(paths[1], 16000)
+    entry = AudioCache._entry(paths[0], 16000)
+    os.utime(entry, (1, 1))
+    os.utime(AudioCache._entry(paths[1], 16000), (2, 2))
+    # a hit makes the older entry the most recently used one
+    AudioCache.load(paths[0], 16000)
+
+    AudioCache.load(paths[2], 16000)
+
+    remaining = set(os.listdir(AudioCache.directory))
+    assert os.path.basename(entry) in remaining
+    assert os.path.basename(AudioCache._entry(paths[1], 16000)) not in remaining
+    assert len(remaining) == 2
+
+
+def test_file_is_hashed_again_after_it_changes(tmp_path):
+    path = _recording(tmp_path, "a.mp3", b"take one")
+    before = file_sha256(path)
+    assert file_sha256(path) == before
+
+    with open(path, "wb") as f:
+        f.write(b"take two, longer")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert file_sha256(path) != before
+
+    # same size, new mtime
+    with open(path, "wb") as f:
+        f.write(b"take three, long")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2))
+    assert file_sha256(path) == hashlib.sha256(b"take three, long").hexdigest()
+
+
+def test_prefetcher_keeps_submission_order_and_errors(monkeypatch):
+    import time
+    from inference.transcription.audio import AudioPrefetcher
+
+    def load(path):
+        # later files finish decoding first
+        time.sleep(0.05 / (1 + int(path[0])))
+        if path == "2_broken.mp3":
+            raise RuntimeError(f"cannot decode {path}")
+        return np.full(3, int(path[0]), dtype=np.float32)
+
+    monkeypatch.setattr(audio_module, "load_audio", load)
+    paths = ["0.mp3", "1.mp3", "2_broken.mp3", "3.mp3"]
+    with AudioPrefetcher(workers=4) as prefetcher:
+        futures = prefetcher.fetch(paths)
+        assert [f.result()[0] for i, f in enumerate(futures) if i != 2] == [0, 1, 3]
+        with pytest.raises(RuntimeError, match="2_broken.mp3"):
+            futures[2].result()
+
+
+def _write_wav(path, sr, channels, seconds=1.0):
+    import wave
+
+    t = np.arange(int(sr * seconds)) / sr
+    tone = (0.4 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(sr)
+        f.writeframes(np.repeat(tone, channels).tobytes())
+    return str(path)
+
+
+@pytest.mark.skipif(audio_module.av is None, reason="PyAV is not installed")
+def test_pyav_and_ffmpeg_decode_the_same_waveform(tmp_path):
+    import shutil
+    from utils.functions import find_ffmpeg
+
+    if not (find_ffmpeg() or shutil.which("ffmpeg")):
+        pytest.skip("ffmpeg is not installed")
+
+    # no resampling needed: both paths return the very same samples
+    path = _write_wav(tmp_path / "mono16k.wav", 16000, 1)
+    np.testing.assert_array_equal(
+        audio_module._decode_av(path, 16000), audio_module._decode_ffmpeg(path, 16000)
+    )
+
+    # resampled and downmixed by libswresample in both cases
+    path = _write_wav(tmp_path / "stereo44k.wav", 44100, 2)
+    with_av = audio_module._decode_av(path, 16000)
+    with_ffmpeg = audio_module._decode_ffmpeg(path, 16000)
+    assert abs(len(with_av) - len(with_ffmpeg)) <= 16
+    n = min(len(with_av), len(with_ffmpeg))
+    assert np.max(np.abs(with_av[:n] - with_ffmpeg[:n])) < 1e-3
+
+
+def test_decoding_falls_back_to_ffmpeg_when_pyav_fails(monkeypatch):
+    class FFmpegError(Exception):
+        pass
+
+    def broken(path, sr):
+        raise FFmpegError("Invalid data found when processing input")
+
+    monkeypatch.setattr(audio_module, "av", type("av", (), {"FFmpegError": FFmpegError}))
+    monkeypatch.setattr(audio_module, "DECODER", "auto")
+    monkeypatch.setattr(audio_module, "_decode_av", broken)
+    monkeypatch.setattr(audio_module, "_decode_ffmpeg", lambda path, sr: np.ones(sr, np.float32))
+
+    assert len(audio_module._decode("clip.m4a", 16000)) == 16000
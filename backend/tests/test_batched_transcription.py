@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+SR = 16000
+
+
+def test_whisper_batches_short_clips_and_keeps_file_order(monkeypatch):
+    pytest.importorskip("whisper")
+    from inference.transcription import whisper as whisper_module
+    from inference.transcription.whisper import WhisperStrategy
+
+    # the "spectrogram" of a clip is its length, which the stub decoder echoes
+    monkeypatch.setattr(
+        whisper_module.whisper, "log_mel_spectrogram",
+        lambda audio, n_mels: torch.full((1,), float(np.count_nonzero(audio))),
+    )
+    batches = []
+
+    def decode(model, mels, options):
+        batches.append(len(mels))
+        return [
+            SimpleNamespace(text=f"clip {int(m[0])}", tokens=[1], avg_logprob=-0.1,
+                            no_speech_prob=0.0, compression_ratio=1.0)
+            for m in mels
+        ]
+
+    monkeypatch.setattr(whisper_module.whisper, "decode", decode)
+    strategy = WhisperStrategy.__new__(WhisperStrategy)
+    strategy.language_code, strategy.batch_size = "de", 2
+    strategy.model = SimpleNamespace(
+        device="cpu",
+        dims=SimpleNamespace(n_mels=80),
+        transcribe=lambda audio, **kw: {"text": f"long {len(audio)}", "segments": []},
+    )
+
+    long_len = whisper_module.whisper.audio.N_SAMPLES + SR
+    audios = [np.ones(3 * SR, np.float32), np.ones(long_len, np.float32),
+              np.ones(SR, np.float32), np.ones(2 * SR, np.float32)]
+
+    assert strategy.transcribe_many(audios) == [
+        f"clip {3 * SR}", f"long {long_len}", f"clip {SR}", f"clip {2 * SR}"
+    ]
+    # the three short clips went through batches of at most two
+    assert batches == [2, 1]
+
+
+def test_whisperx_maps_packed_segments_back_to_their_files(monkeypatch):
+    pytest.importorskip("whisperx")
+    from inference.transcription.whisperx import WhisperxStrategy
+
+    def recording(file_no, spans):
+        audio = np.zeros(4 * SR, np.float32)
+        for seg_no, (start, end) in enumerate(spans, start=1):
+            audio[start * SR:end * SR] = file_no * 10 + seg_no
+        return audio
+
+    spans = [[(0, 1), (2, 3)], [], [(2, 3)]]
+    audios = [recording(i, s) for i, s in enumerate(spans)]
+    vad = {id(a): [{"start": s, "end": e} for s, e in sp] for a, sp in zip(audios, spans)}
+
+    strategy = WhisperxStrategy.__new__(WhisperxStrategy)
+    strategy.language_code, strategy.batch_size = "de", 2
+    strategy.diarize, strategy._diarizer = False, None
+    monkeypatch.setattr(strategy, "_vad_segments", lambda audio: vad[id(audio)], raising=False)
+    # the stub ASR names each segment after the samples it was given
+    strategy.model = lambda inputs, batch_size, num_workers: (
+        {"text": f"s{int(item['inputs'][0])}"} for item in inputs
+    )
+
+    assert strategy.transcribe_many(audios) == ["s1 s2", "", "s21"]
+
+
+def test_whisperx_without_diarization_skips_alignment_and_pyannote(monkeypatch):
+    whisperx = pytest.importorskip("whisperx")
+    from inference.transcription.whisperx import WhisperxStrategy
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("alignment and diarization must not run")
+
+    monkeypatch.setattr(whisperx, "align", unexpected)
+    monkeypatch.setattr(whisperx, "assign_word_speakers", unexpected)
+    strategy = WhisperxStrategy.__new__(WhisperxStrategy)
+    strategy.language_code, strategy.batch_size = "de", 8
+    strategy.diarize, strategy._diarizer = False, None
+    monkeypatch.setattr(strategy, "_get_align_model", unexpected)
+    monkeypatch.setattr(strategy, "_get_diarize_model", unexpected)
+    strategy.model = SimpleNamespace(transcribe=lambda audio, **kw: {
+        "segments": [{"text": " Hallo, ", "start": 0.0, "end": 1.0},
+                     {"text": "wie geht's? ", "start": 1.5, "end": 2.5}],
+    })
+
+    assert strategy.transcribe(np.zeros(3 * SR, np.float32)) == "Hallo, wie geht's?"
+    assert strategy._diarizer is None
@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("whisper")
+
+from inference.transcription.cascade import CascadeStrategy
+from inference.transcription.guard import Transcript
+
+CLEAR = {"avg_logprob": -0.2, "no_speech_prob": 0.1, "compression_ratio": 1.5}
+
+
+class StubDraft:
+    def __init__(self, drafts):
+        self.drafts = drafts
+
+    def transcribe_scored(self, paths):
+        return [self.drafts[p] for p in paths]
+
+
+class StubFinal:
+    chunk_long_audio = True
+    model_id = "large-v2"
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe_many(self, paths):
+        self.calls.append(list(paths))
+        return [f"final {p}" for p in paths]
+
+
+def _cascade(drafts):
+    cascade = CascadeStrategy.__new__(CascadeStrategy)
+    cascade.draft_size, cascade.clips, cascade.escalated = "small", 0, 0
+    cascade.draft, cascade.final = StubDraft(drafts), StubFinal()
+    return cascade
+
+
+def _looped(text):
+    text = Transcript(text)
+    text.truncated = True
+    return text
+
+
+def test_unsure_and_guard_flagged_drafts_are_escalated():
+    drafts = {
+        "clear": ("draft clear", CLEAR),
+        "low_logprob": ("draft", {**CLEAR, "avg_logprob": -1.2}),
+        "no_speech": ("draft", {**CLEAR, "no_speech_prob": 0.8}),
+        "repetitive": ("draft", {**CLEAR, "compression_ratio": 3.1}),
+        "looped": (_looped("draft looped"), CLEAR),
+    }
+    cascade = _cascade(drafts)
+
+    texts = cascade.transcribe_many(list(drafts))
+
+    assert texts == [
+        "draft clear", "final low_logprob", "final no_speech", "final repetitive", "final looped"
+    ]
+    # escalated clips go to the full model together, in their original order
+    assert cascade.final.calls == [["low_logprob", "no_speech", "repetitive", "looped"]]
+
+
+def test_thresholds_are_inclusive_bounds(monkeypatch):
+    from inference.transcription import cascade as cascade_module
+
+    monkeypatch.setattr(cascade_module, "MIN_AVG_LOGPROB", -0.5)
+    monkeypatch.setattr(cascade_module, "MAX_NO_SPEECH_PROB", 0.3)
+    monkeypatch.setattr(cascade_module, "MAX_COMPRESSION_RATIO", 2.0)
+    edge = {"avg_logprob": -0.5, "no_speech_prob": 0.3, "compression_ratio": 2.0}
+
+    assert CascadeStrategy.confident(edge)
+    for key, value in (("avg_logprob", -0.51), ("no_speech_prob", 0.31), ("compression_ratio", 2.01)):
+        assert not CascadeStrategy.confident({**edge, key: value})
+
+
+def test_session_summary_reports_and_resets_counts():
+    cascade = _cascade({"a": ("a", CLEAR), "b": ("b", {**CLEAR, "avg_logprob": -3.0})})
+    assert cascade.session_summary() is None
+
+    cascade.transcribe_many(["a", "b"])
+    cascade.transcribe_many(["a"])
+
+    assert cascade.session_summary() == (
+        "Cascade escalated 1 of 3 clips (33%) from whisper small to StubFinal"
+    )
+    assert (cascade.clips, cascade.escalated) == (0, 0)
+    assert cascade.final.calls == [["b"]]
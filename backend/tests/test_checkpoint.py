@@ -0,0 +1,35 @@
+from inference.processors.checkpoint import Checkpoint
+
+
+def test_checkpoint_round_trip(tmp_path):
+    cp = Checkpoint(str(tmp_path), "TranscriptionProcessor:english:None", flush_interval=0)
+    cp.record("TranscriptionProcessor", "1_2_3.wav", "hello")
+    cp.record("TranslationProcessor", 4, "hola")
+
+    reloaded = Checkpoint(str(tmp_path), "TranscriptionProcessor:english:None")
+    assert reloaded.get("TranscriptionProcessor", "1_2_3.wav") == "hello"
+    assert reloaded.get("TranslationProcessor", 4) == "hola"
+    assert not reloaded.is_complete
+
+    reloaded.mark_complete()
+    assert Checkpoint(str(tmp_path), "TranscriptionProcessor:english:None").is_complete
+
+
+def test_checkpoint_with_other_signature_is_ignored(tmp_path):
+    cp = Checkpoint(str(tmp_path), "TranslationProcessor:german:automatic")
+    cp.record("TranslationProcessor", 0, "text")
+    cp.mark_complete()
+
+    other = Checkpoint(str(tmp_path), "TranslationProcessor:german:corrected")
+    assert other.get("TranslationProcessor", 0) is None
+    assert not other.is_complete
+
+
+def test_fresh_run_does_not_inherit_stored_progress(tmp_path):
+    cp = Checkpoint(str(tmp_path), "TranscriptionProcessor:english:None")
+    cp.record("TranscriptionProcessor", "1_2_3.wav", "hello")
+    cp.mark_complete()
+
+    fresh = Checkpoint(str(tmp_path), "TranscriptionProcessor:english:None", resume=False)
+    assert fresh.get("TranscriptionProcessor", "1_2_3.wav") is None
+    assert not fresh.is_complete
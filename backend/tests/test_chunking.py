@@ -0,0 +1,32 @@
+import numpy as np
+
+from inference.transcription.chunking import split_on_silence, stitch
+
+
+def test_chunks_cover_recording_and_end_in_pauses():
+    sr = 16000
+    t = np.arange(10 * sr) / sr
+    audio = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    # pauses at 3.5 s and 7 s
+    for pause in (3.5, 7.0):
+        audio[int(pause * sr):int((pause + 0.3) * sr)] = 0
+
+    bounds = split_on_silence(audio, sr, max_seconds=4)
+
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(audio)
+    assert all(end == start for (_, end), (start, _) in zip(bounds, bounds[1:]))
+    assert all(end - start <= 4 * sr for start, end in bounds)
+    for _, end in bounds[:-1]:
+        assert 3.5 * sr <= end <= 3.8 * sr or 7.0 * sr <= end <= 7.3 * sr
+
+
+def test_stitch_joins_chunks_in_order_with_their_times():
+    sr = 16000
+    bounds = [(0, 2 * sr), (2 * sr, 5 * sr), (5 * sr, 6 * sr)]
+    text, segments = stitch(bounds, [" Hallo ", "", "Welt"], sr)
+
+    assert text == "Hallo Welt" and not text.truncated
+    assert segments == [
+        {"start": 0.0, "end": 2.0, "text": "Hallo"},
+        {"start": 5.0, "end": 6.0, "text": "Welt"},
+    ]
@@ -0,0 +1,38 @@
+from inference.transcription.guard import (
+    MAX_WINDOW_TOKENS,
+    compression_ratio,
+    token_budget,
+    trim_repetitions,
+)
+
+
+def test_token_budget_grows_with_duration_up_to_window_limit():
+    assert token_budget(1) < token_budget(3) < token_budget(10)
+    assert token_budget(30) == token_budget(3600) == MAX_WINDOW_TOKENS
+
+
+def test_trim_repetitions_cuts_loops_only():
+    looped = "ich sehe einen Hund " + "und dann " * 40
+    text, cut = trim_repetitions(looped)
+    assert cut and text == "ich sehe einen Hund und dann"
+    assert compression_ratio(looped) > compression_ratio(text)
+
+    # whole sentences loop as well
+    sentence = "a b c d e f g h i j k l "
+    assert trim_repetitions("hallo " + sentence * 10) == ("hallo " + sentence.strip(), True)
+
+    assert trim_repetitions("ja ja ja nein") == ("ja ja ja nein", False)
+    # scripts without spaces repeat characters
+    assert trim_repetitions("猫が" + "あ" * 60) == ("猫があ", True)
+
+
+def test_trim_repetitions_keeps_short_repeated_speech():
+    for text in (
+        "no no no no no no I said no",
+        "eins zwei drei vier fünf sechs sieben acht neun zehn",
+        "one two one two one two one two one two",
+        "猫が" + "あ" * 8 + "と鳴いた",
+        "สวัสดีครับ" + "ๆ" * 6,
+    ):
+        assert trim_repetitions(text) == (text, False)
+
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from routers.helpers import event_bus
+from routers.helpers import job_store as job_store_module
+from routers.helpers.event_bus import JobEventBus
+from routers.helpers.job_store import JobStore, StoreQueue
+
+
+@pytest.fixture(autouse=True)
+def tmp_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(job_store_module, "STORE_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(JobStore, "_local", type(JobStore._local)())
+    monkeypatch.setattr(JobStore, "_initialized_pid", None)
+    monkeypatch.setattr(event_bus, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(JobEventBus, "_channels", {})
+
+
+async def _collect(job_id, last_event_id=None):
+    return [m async for m in JobEventBus.subscribe(job_id, last_event_id)]
+
+
+def test_subscribers_all_receive_every_event():
+    JobStore.create("job-1", "inference")
+    queue = StoreQueue("job-1")
+
+    async def scenario():
+        watchers = [asyncio.create_task(_collect("job-1")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        queue.put("Processing session: Session_1")
+        queue.put("[DONE ALL]")
+        return await asyncio.gather(*watchers)
+
+    for messages in asyncio.run(scenario()):
+        assert [m["data"] for m in messages] == ["Processing session: Session_1", "[DONE ALL]"]
+
+
+def test_replay_after_last_event_id():
+    JobStore.create("job-2", "inference")
+    queue = StoreQueue("job-2")
+    for msg in ["one", "two", "three", "[DONE ALL]"]:
+        queue.put(msg)
+    first_id = JobStore.events("job-2")[0][0]
+
+    messages = asyncio.run(_collect("job-2", first_id))
+    assert [m["data"] for m in messages] == ["two", "three", "[DONE ALL]"]
+
+
+def test_pending_queue_positions_are_coalesced():
+    first = "[QUEUED] Position 3 of 3, estimated start in ~9 min"
+    second = "[QUEUED] Position 2 of 3, estimated start in ~6 min"
+    third = "[QUEUED] Position 1 of 2, estimated start in ~3 min"
+    sub = event_bus._Subscriber(last_id=0)
+    sub.push(1, first)
+    sub.push(2, second)
+    sub.push(3, "Job 7 finished")
+    sub.push(4, third)
+    assert list(sub.pending) == [(2, second), (3, "Job 7 finished"), (4, third)]
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from routers.helpers import job_store as job_store_module
+from routers.helpers.job_store import JobStore, StoreQueue, StoreCancelEvent
+
+
+@pytest.fixture(autouse=True)
+def tmp_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(job_store_module, "STORE_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(JobStore, "_local", type(JobStore._local)())
+    monkeypatch.setattr(JobStore, "_initialized_pid", None)
+
+
+def test_events_and_status_round_trip():
+    JobStore.create("job-1", "inference", {"action": "transcribe"})
+    queue = StoreQueue("job-1")
+
+    queue.put("Processing session: Session_1")
+    queue.put("[RESULT PATH] /tmp/job-1/Session_1")
+    queue.put("[DONE ALL]")
+
+    messages = [m for _, m in JobStore.events("job-1")]
+    assert messages == ["Processing session: Session_1", "[DONE ALL]"]
+    job = JobStore.get("job-1")
+    assert JobStore.results("job-1") == ["/tmp/job-1/Session_1"]
+    assert job["status"] == "done"
+    assert job["params"] == {"action": "transcribe"}
+
+    first_id = JobStore.events("job-1")[0][0]
+    assert [m for _, m in JobStore.events("job-1", after_id=first_id)] == ["[DONE ALL]"]
+
+
+def test_cancel_flag_is_shared():
+    JobStore.create("job-2", "train")
+    event = StoreCancelEvent("job-2")
+    assert not event.is_set()
+    event.set()
+    assert StoreCancelEvent("job-2").is_set()
+
+    StoreQueue("job-2").put("[CANCELLED]")
+    StoreQueue("job-2").put("[DONE ALL]")
+    assert JobStore.get("job-2")["status"] == "cancelled"
+
+
+def test_final_status_is_set_on_done_all_only():
+    JobStore.create("job-3", "inference")
+    JobStore.update("job-3", status="running")
+    queue = StoreQueue("job-3")
+
+    queue.put("[ERROR] model crashed")
+    # still cleaning up: keeps its slots until the process reports completion
+    assert JobStore.get("job-3")["status"] == "running"
+    assert JobStore.get("job-3")["finished_at"] is None
+
+    queue.put("[DONE ALL]")
+    assert JobStore.get("job-3")["status"] == "failed"
+
+    # a resumed run is judged by its own events only
+    JobStore.update("job-3", status="running", finished_at=None)
+    queue.put("[RESUMED]")
+    queue.put("[DONE ALL]")
+    assert JobStore.get("job-3")["status"] == "done"
+
+
+def test_orphans_are_found_when_the_pid_is_reused():
+    JobStore.create("alive", "inference")
+    JobStore.create("orphan", "inference")
+    for job_id in ("alive", "orphan"):
+        JobStore.update(job_id, status="running")
+    # a restarted container gives the new API process the old one's PID
+    JobStore.update("orphan", owner=f"{os.getpid()}:0")
+
+    JobStore.mark_orphans()
+    assert JobStore.get("alive")["status"] == "running"
+    assert JobStore.get("orphan")["status"] == "interrupted"
@@ -0,0 +1,92 @@
+import gc
+import threading
+import time
+
+import pytest
+
+from inference.model_registry import ModelRegistry
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(ModelRegistry, "_entries", type(ModelRegistry._entries)())
+    monkeypatch.setattr(ModelRegistry, "_load_counts", type(ModelRegistry._load_counts)())
+    monkeypatch.setattr(ModelRegistry, "_known_sizes", {})
+    monkeypatch.setattr(ModelRegistry, "_loading", {})
+    monkeypatch.setattr(ModelRegistry, "budget_bytes", 0)
+
+
+def test_acquire_loads_once_and_shares_instance():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return object()
+
+    a = ModelRegistry.acquire("spacy:de_core_news_lg", loader, owner="gloss")
+    b = ModelRegistry.acquire("spacy:de_core_news_lg", loader, owner="pii")
+
+    assert a is b
+    assert len(calls) == 1
+    stats = ModelRegistry.stats()[0]
+    assert stats["loads"] == 1 and stats["hits"] == 1 and stats["refs"] == 2
+    assert ModelRegistry.load_count("spacy:de_core_news_lg") == 1
+
+
+def test_unreferenced_models_are_evicted_lru_over_budget(monkeypatch):
+    import inference.model_registry as registry_module
+    monkeypatch.setattr(registry_module, "_model_size", lambda model: 100)
+    monkeypatch.setattr(ModelRegistry, "budget_bytes", 250)
+
+    owner = object()
+    ModelRegistry.acquire("a", object, owner=owner)
+    ModelRegistry.acquire("b", object)
+    ModelRegistry.release_owner(owner)
+    ModelRegistry.acquire("c", object)
+
+    names = [s["name"] for s in ModelRegistry.stats()]
+    # 'a' is the only unreferenced model, so it makes room for 'c'
+    assert names == ["b", "c"]
+
+
+def test_unreferenced_models_are_unloaded_without_budget():
+    class Strategy:
+        pass
+
+    owner = Strategy()
+    ModelRegistry.acquire("a", object, owner=owner)
+    ModelRegistry.acquire("b", object, owner=Strategy())
+    gc.collect()
+    # the second owner was collected without releasing; its reference went with it
+    assert {s["name"]: s["refs"] for s in ModelRegistry.stats()} == {"a": 1, "b": 0}
+
+    ModelRegistry.release_owner(owner)
+    assert ModelRegistry.stats() == []
+
+
+def test_concurrent_acquires_load_once_outside_the_lock():
+    started, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(5)
+        return object()
+
+    owner = "pii"
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(ModelRegistry.acquire("slow", slow_loader, owner=owner)))
+        for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    started.wait(5)
+    # other models load while 'slow' is still loading
+    ModelRegistry.acquire("fast", object, owner=owner)
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(results) == 3 and results[0] is results[1] is results[2]
+    assert ModelRegistry.load_count("slow") == 1
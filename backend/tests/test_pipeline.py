@@ -0,0 +1,54 @@
+import pandas as pd
+
+from inference.processors.abstract import DataProcessor
+from inference.processors.factory import ProcessorFactory
+from inference.processors.pipeline import PipelineProcessor
+
+
+class AppendStage(DataProcessor):
+    def __init__(self, column, highlight):
+        super().__init__("de", "automatic")
+        self.column = column
+        self.columns_to_highlight = highlight
+
+    def _process_dataframe(self, df):
+        df[self.column] = df["text"] + f"-{self.column}"
+        return df
+
+
+def test_parse_actions_splits_pipeline():
+    assert ProcessorFactory.parse_actions("transcribe, translate,gloss") == [
+        "transcribe", "translate", "gloss"
+    ]
+    assert ProcessorFactory.parse_actions("translate") == ["translate"]
+
+
+def test_pipeline_runs_stages_in_order_on_one_dataframe():
+    first = AppendStage("a", "col_a")
+    second = AppendStage("b", ["col_a", "col_b"])
+    pipeline = PipelineProcessor("de", "automatic", [first, second])
+
+    df = pipeline._process_dataframe(pd.DataFrame({"text": ["x", "y"]}))
+
+    assert list(df["a"]) == ["x-a", "y-a"]
+    assert list(df["b"]) == ["x-b", "y-b"]
+    assert pipeline.columns_to_highlight == ["col_a", "col_b"]
+    # all stages share the pipeline's session log
+    assert first.logger is pipeline.logger and second.logger is pipeline.logger
+
+
+def test_pipeline_writes_the_sheet_like_its_first_stage():
+    written = []
+
+    class WritingStage(AppendStage):
+        def _write_file(self, path, df):
+            written.append((path, list(df.columns), self.columns_to_highlight))
+
+    first = WritingStage("a", "col_a")
+    pipeline = PipelineProcessor("de", "automatic", [first, AppendStage("b", "col_b")])
+    df = pd.DataFrame({"text": ["x"], "a": ["x-a"], "b": ["x-b"]})
+
+    pipeline._write_file("session.xlsx", df)
+
+    assert written == [("session.xlsx", ["text", "a", "b"], ["col_a", "col_b"])]
+    assert first.columns_to_highlight == "col_a"
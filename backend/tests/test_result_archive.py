@@ -0,0 +1,38 @@
+import io
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
+
+from routers.helpers.result_archive import result_files, stream_zip
+
+
+def test_streamed_archive_contains_session_outputs(tmp_path):
+    session = tmp_path / "Session_1"
+    session.mkdir()
+    (session / "trials_and_sessions_annotated.xlsx").write_bytes(b"PK-xlsx" * 1000)
+    (session / "TranslationProcessor.log").write_text("done\n")
+    (session / "trials_and_sessions.xlsx").write_bytes(b"input")
+
+    files = result_files(str(tmp_path), [str(session), str(tmp_path / "missing")])
+    archive = ZipFile(io.BytesIO(b"".join(stream_zip(files))))
+
+    infos = {i.filename: i for i in archive.infolist()}
+    assert set(infos) == {
+        "Session_1/TranslationProcessor.log",
+        "Session_1/trials_and_sessions_annotated.xlsx",
+    }
+    assert infos["Session_1/trials_and_sessions_annotated.xlsx"].compress_type == ZIP_STORED
+    assert infos["Session_1/TranslationProcessor.log"].compress_type == ZIP_DEFLATED
+    assert archive.read("Session_1/trials_and_sessions_annotated.xlsx") == b"PK-xlsx" * 1000
+
+
+def test_result_files_without_local_base_dir(tmp_path):
+    session = tmp_path / "download" / "Session_2"
+    session.mkdir(parents=True)
+    (session / "trials_and_sessions_annotated.xlsx").write_bytes(b"xlsx")
+
+    assert result_files(None, [str(session)]) == [
+        (str(session / "trials_and_sessions_annotated.xlsx"), "Session_2/trials_and_sessions_annotated.xlsx")
+    ]
+    # sessions outside the base directory never get '..' names
+    other = tmp_path / "elsewhere"
+    other.mkdir()
+    assert result_files(str(other), [str(session)])[0][1] == "Session_2/trials_and_sessions_annotated.xlsx"
@@ -0,0 +1,85 @@
+from routers.helpers import scheduler as scheduler_module
+from routers.helpers.scheduler import requirements_for
+
+
+def test_pipeline_reserves_largest_stage(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "CPU_SLOTS", 64)
+    monkeypatch.setattr(scheduler_module, "RAM_SLOTS_GB", 64)
+    cpu, ram = requirements_for("transcribe,translate")
+    expected = scheduler_module.REQUIREMENTS["transcribe"]
+    assert (cpu, ram) == (expected["cpu"], expected["ram_gb"])
+
+
+def test_requirements_are_clamped_to_machine(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "CPU_SLOTS", 2)
+    monkeypatch.setattr(scheduler_module, "RAM_SLOTS_GB", 3)
+    assert requirements_for("transcribe") == (2, 3)
+
+
+class _StubbornProcess:
+    """Process handle that ignores SIGTERM."""
+    def __init__(self):
+        self.signals = []
+
+    def is_alive(self):
+        return "kill" not in self.signals
+
+    def terminate(self):
+        self.signals.append("terminate")
+
+    def kill(self):
+        self.signals.append("kill")
+
+
+def test_stop_does_not_wait_and_kills_once_overdue(monkeypatch):
+    from types import SimpleNamespace
+    from routers.helpers.scheduler import ScheduledJob
+
+    process = _StubbornProcess()
+    entry = ScheduledJob(SimpleNamespace(id="job", process=process), "transcribe", None, 0)
+
+    monkeypatch.setattr(scheduler_module, "STOP_TIMEOUT", 60)
+    entry.stop()
+    entry.kill_if_overdue()
+    assert entry.stopping and process.signals == ["terminate"]
+
+    entry.kill_at = 0
+    entry.kill_if_overdue()
+    assert process.signals == ["terminate", "kill"]
+
+
+def test_idle_warm_workers_hold_ram_until_evicted(monkeypatch, tmp_path):
+    from types import SimpleNamespace
+    from routers.helpers import job_store as job_store_module
+    from routers.helpers.scheduler import JobScheduler
+    from routers.helpers.job_store import JobStore
+
+    monkeypatch.setattr(job_store_module, "STORE_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(JobStore, "_local", type(JobStore._local)())
+    monkeypatch.setattr(JobStore, "_initialized_pid", None)
+
+    monkeypatch.setattr(scheduler_module, "CPU_SLOTS", 16)
+    monkeypatch.setattr(scheduler_module, "RAM_SLOTS_GB", 16)
+    idle = [("transcribe",), ("translate",)]
+    evicted = []
+    monkeypatch.setattr(scheduler_module.WorkerPool, "idle_keys", classmethod(lambda cls: list(idle)))
+    monkeypatch.setattr(
+        scheduler_module.WorkerPool, "evict", classmethod(lambda cls, key: evicted.append(key) or True)
+    )
+    monkeypatch.setattr(JobStore, "by_status", classmethod(
+        lambda cls, status: [{"id": "job", "action": "transcribe"}] if status == "queued" else []
+    ))
+    monkeypatch.setattr(JobStore, "update", classmethod(lambda cls, *a, **kw: None))
+    started = []
+    job = SimpleNamespace(id="job", process=None, queue=SimpleNamespace(put=lambda msg: None))
+    monkeypatch.setattr(JobScheduler, "_pending", {
+        "job": scheduler_module.ScheduledJob(job, "transcribe", lambda: started.append(True), 0)
+    })
+    monkeypatch.setattr(JobScheduler, "_running", {})
+
+    JobScheduler._admit()
+
+    # 16 GB minus the idle workers' 10 + 6 GB leaves no room for a 10 GB job
+    # until the least recently used worker is evicted
+    assert evicted == [("transcribe",)]
+    assert started == [True]
@@ -0,0 +1,35 @@
+from multiprocessing import Queue
+
+from inference.transcription import shards
+from inference.transcription.shards import ShardPool
+from routers.helpers.job_processes import JobProcesses
+
+
+class _EchoStrategy:
+    model_id = "echo"
+
+    def transcribe(self, audio):
+        return f"{len(audio)} samples"
+
+
+def _echo_init(language, engine, diarize, threads):
+    shards._strategy = _EchoStrategy()
+    shards._silence_detector = None
+
+
+def _job(results: Queue):
+    pool = ShardPool("de", workers=2, threads=1, initializer=_echo_init)
+    try:
+        results.put(pool.describe())
+    finally:
+        pool.close()
+
+
+def test_shard_pool_starts_inside_a_job_process():
+    # the API runs jobs in processes started like this; daemonic ones
+    # could not start the pool's workers
+    results = Queue()
+    proc = JobProcesses.start(_job, (results,))
+    proc.join(60)
+    assert proc.exitcode == 0
+    assert results.get(timeout=5) == ("_EchoStrategy", "echo")
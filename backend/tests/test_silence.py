@@ -0,0 +1,20 @@
+import numpy as np
+
+from inference.transcription.silence import SilenceDetector
+
+
+def test_energy_screen_separates_silence_from_tone():
+    sr = 16000
+    detector = SilenceDetector(use_vad=False, sr=sr)
+    t = np.arange(sr) / sr
+
+    silence = np.random.default_rng(0).normal(0, 1e-4, sr).astype(np.float32)
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    assert detector.is_silent(silence)
+    assert detector.is_silent(np.zeros(0, dtype=np.float32))
+    assert not detector.is_silent(tone)
+    # a short click is not enough speech
+    click = silence.copy()
+    click[:800] = 0.5
+    assert detector.is_silent(click)
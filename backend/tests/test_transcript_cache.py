@@ -0,0 +1,43 @@
+import os
+import time
+import sqlite3
+
+from inference.transcription.audio import file_sha256
+from inference.transcription.result_cache import TranscriptCache
+
+
+def test_transcript_cache_hits_only_for_same_key(tmp_path):
+    audio = tmp_path / "1_2_3.mp3"
+    audio.write_bytes(b"not really audio")
+    digest = file_sha256(str(audio))
+    db = str(tmp_path / "cache" / "cache.sqlite3")
+
+    cache = TranscriptCache("WhisperStrategy", "large-v2", "de", True, "12:24:4:2.4", path=db)
+    assert cache.get(digest) is None
+    cache.put(digest, "Hallo [NAME]", [{"start": 0.0, "end": 1.5, "text": "Hallo Anna"}])
+    assert os.stat(db).st_mode & 0o777 == 0o600
+
+    reopened = TranscriptCache("WhisperStrategy", "large-v2", "de", True, "12:24:4:2.4", path=db)
+    assert reopened.get(digest) == "Hallo [NAME]"
+    assert (reopened.hits, reopened.misses) == (1, 0)
+    # nothing from before anonymization is written to disk
+    dump = "\n".join(sqlite3.connect(db).iterdump())
+    assert "Anna" not in dump
+
+    assert TranscriptCache("WhisperStrategy", "large-v2", "de", False, "12:24:4:2.4", path=db).get(digest) is None
+    assert TranscriptCache("WhisperStrategy", "large-v2", "de", True, "12:24:8:2.4", path=db).get(digest) is None
+    assert TranscriptCache("FasterWhisperStrategy", "large-v2:int8:beam5", "de", True, path=db).get(digest) is None
+
+
+def test_transcript_cache_prune_drops_old_rows(tmp_path):
+    db = str(tmp_path / "cache.sqlite3")
+    cache = TranscriptCache("WhisperStrategy", "large-v2", "de", True, path=db)
+    cache.put("old", "alt")
+    cache.put("new", "neu")
+    sqlite3.connect(db, isolation_level=None).execute(
+        "UPDATE transcripts SET created_at = ? WHERE audio_sha256 = 'old'", (time.time() - 30 * 86400,)
+    )
+
+    TranscriptCache.prune(7, path=db)
+    assert cache.get("old") is None
+    assert cache.get("new") == "neu"
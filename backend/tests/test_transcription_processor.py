@@ -0,0 +1,103 @@
+import logging
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from inference.processors.transcription import TranscriptionProcessor
+
+
+def _bare_processor():
+    # only the state the tested helpers use, without loading any models
+    processor = TranscriptionProcessor.__new__(TranscriptionProcessor)
+    processor._text_parts = {}
+    processor.logger = logging.getLogger("test")
+    processor.language, processor.pii_identifier = "en", None
+    processor.checkpoint, processor.transcript_cache, processor._audio_hashes = None, None, {}
+    processor.silence_detector, processor.silent_files, processor.truncated_files = None, 0, []
+    return processor
+
+
+def _done(value=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
+    return future
+
+
+def _append_one_by_one(df, idx, column, text):
+    # the cell update _flush_texts replaced
+    old = df.at[idx, column]
+    df.at[idx, column] = ("" if pd.isna(old) else old) + text
+
+
+def test_flushed_texts_match_appending_per_file():
+    def sheet():
+        return pd.DataFrame({
+            "automatic_transcription": ["vorher ", np.nan, np.nan, "x"],
+            # empty columns come back from Excel as float NaN
+            "latin_transcription_everything": pd.Series([np.nan] * 4, dtype=float),
+        })
+
+    placements = [
+        (0, "automatic_transcription", "1: hallo "),
+        (0, "latin_transcription_everything", "1: hallo "),
+        (2, "automatic_transcription", "2: zwei - "),
+        (0, "automatic_transcription", "3: noch eins "),
+        (2, "latin_transcription_everything", "2: zwei - "),
+        (0, "latin_transcription_everything", "3: noch eins "),
+    ]
+
+    expected = sheet()
+    expected["latin_transcription_everything"] = expected["latin_transcription_everything"].astype(object)
+    for idx, column, text in placements:
+        _append_one_by_one(expected, idx, column, text)
+
+    processor, df = _bare_processor(), sheet()
+    for idx, column, text in placements:
+        processor._append_to_cell(df, idx, column, text)
+    processor._flush_texts(df)
+
+    for column in expected.columns:
+        assert df[column].fillna("<NaN>").tolist() == expected[column].fillna("<NaN>").tolist()
+    assert processor._text_parts == {}
+
+
+def test_failed_batch_is_retried_file_by_file():
+    class Strategy:
+        def transcribe_many(self, audios):
+            raise RuntimeError("out of memory")
+
+        def transcribe(self, audio):
+            if audio[0] == 2:
+                raise RuntimeError("broken recording")
+            return f"text {int(audio[0])}"
+
+    processor = _bare_processor()
+    processor.strategy = Strategy()
+    files = ["a.mp3", "b.mp3", "c.mp3", "d.mp3"]
+    decoding = [_done(np.full(4, 1.0)), _done(np.full(4, 2.0)),
+                _done(error=RuntimeError("cannot decode")), _done(np.full(4, 3.0))]
+
+    texts = processor._transcribe_batch(files, decoding)
+
+    # only the broken and the undecodable recording lose their transcription
+    assert texts == {"a.mp3": "text 1", "d.mp3": "text 3"}
+
+
+def test_batches_stay_within_file_and_duration_limits(monkeypatch):
+    from inference.processors import transcription as transcription_module
+
+    monkeypatch.setattr(transcription_module, "TRANSCRIBE_BATCH_FILES", 3)
+    monkeypatch.setattr(transcription_module, "TRANSCRIBE_BATCH_SECONDS", 100)
+    durations = {"a": 10, "b": 10, "c": 10, "d": 10, "e": 60, "f": 50, "g": 250, "h": 5}
+
+    batches = TranscriptionProcessor._batches(list(durations), durations)
+
+    assert batches == [["a", "b", "c"], ["d", "e"], ["f"], ["g"], ["h"]]
+    for batch in batches:
+        assert len(batch) <= 3
+        # only a recording longer than the limit gets a batch of its own over it
+        assert len(batch) == 1 or sum(durations[f] for f in batch) <= 100
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from inference.processors.trial_index import TrialIndex
+
+
+def test_index_matches_sheet_scan():
+    df = pd.DataFrame({
+        "Block_Nr": [1, 1, 2.0, None],
+        "Task_Nr": [1, 2, 1, 1],
+        "Trial_Nr": [3, 3, 3, 3],
+        "file_a": ["x.mp3", None, "y.mp3", "y.mp3"],
+        "file_b": [None, "x.mp3", "y.mp3", None],
+    })
+    index = TrialIndex(df)
+
+    for name in ("x.mp3", "y.mp3", "z.mp3"):
+        expected = [row for (row, _), _ in df[df.isin([name])].stack().items()]
+        assert index.filename_rows(name) == expected
+
+    assert index.trial_rows(1, 2, 3) == [1]
+    assert index.trial_rows(2, 1, 3) == [2]
+    assert index.trial_rows(9, 9, 9) == []
@@ -0,0 +1,102 @@
+import asyncio
+import fcntl
+import io
+import os
+from zipfile import ZipFile
+
+import pytest
+from fastapi import HTTPException
+
+from routers.helpers import uploads
+from routers.helpers.uploads import UploadStore, extract_upload
+
+
+@pytest.fixture(autouse=True)
+def tmp_upload_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", tmp_path / "uploads")
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _zip_bytes() -> bytes:
+    buf = io.BytesIO()
+    with ZipFile(buf, "w") as zf:
+        zf.writestr("Session_1/trials_and_sessions.xlsx", b"data")
+    return buf.getvalue()
+
+
+def test_chunked_upload_resumes_at_offset_and_extracts():
+    payload = _zip_bytes()
+    upload_id = UploadStore.create()
+
+    async def scenario():
+        half = len(payload) // 2
+        assert await UploadStore.append(upload_id, 0, _stream(payload[:half])) == half
+        with pytest.raises(HTTPException) as exc:
+            await UploadStore.append(upload_id, 0, _stream(payload[half:]))
+        assert exc.value.status_code == 409
+        await UploadStore.append(upload_id, UploadStore.size(upload_id), _stream(payload[half:]))
+        return await extract_upload(upload_id=upload_id)
+
+    tmp_dir = asyncio.run(scenario())
+    assert os.path.exists(os.path.join(tmp_dir, "Session_1", "trials_and_sessions.xlsx"))
+    with pytest.raises(HTTPException):
+        UploadStore.path(upload_id)
+
+
+def test_unknown_upload_id_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        UploadStore.size("../../etc/passwd")
+    assert exc.value.status_code == 404
+
+
+def test_concurrent_chunks_at_same_offset_append_once():
+    upload_id = UploadStore.create()
+
+    async def slow_stream(data):
+        for byte in data:
+            await asyncio.sleep(0)
+            yield bytes([byte])
+
+    async def scenario():
+        return await asyncio.gather(
+            UploadStore.append(upload_id, 0, slow_stream(b"abcd")),
+            UploadStore.append(upload_id, 0, slow_stream(b"abcd")),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+    assert sorted(type(r).__name__ for r in results) == ["HTTPException", "int"]
+    assert UploadStore.size(upload_id) == 4
+
+
+def test_append_is_locked_across_processes():
+    upload_id = UploadStore.create()
+    # another uvicorn worker holding the lock while it writes a chunk
+    with open(UploadStore.path(upload_id), "ab") as other:
+        fcntl.flock(other, fcntl.LOCK_EX)
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(UploadStore.append(upload_id, 0, _stream(b"abcd")))
+        assert exc.value.status_code == 409
+    assert asyncio.run(UploadStore.append(upload_id, 0, _stream(b"abcd"))) == 4
+
+
+def test_upload_size_and_count_are_limited(monkeypatch):
+    monkeypatch.setattr(uploads, "UPLOAD_MAX_BYTES", 6)
+    monkeypatch.setattr(uploads, "UPLOAD_MAX_ACTIVE", 2)
+    upload_id = UploadStore.create()
+
+    assert asyncio.run(UploadStore.append(upload_id, 0, _stream(b"abcd"))) == 4
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(UploadStore.append(upload_id, 4, _stream(b"ef", b"gh")))
+    assert exc.value.status_code == 413
+    # the rejected chunk is dropped entirely
+    assert UploadStore.size(upload_id) == 4
+
+    UploadStore.create()
+    with pytest.raises(HTTPException) as exc:
+        UploadStore.create()
+    assert exc.value.status_code == 429
@@ -7,6 +7,7 @@ from inference.processors.factory import ProcessorFactory
 class DummyProcessor:
     def __init__(self):
         self.process = MagicMock()
+        self.close = MagicMock()
 
 @pytest.fixture(autouse=True)
 def patch_factory():
@@ -38,4 +39,50 @@ def test_local_worker_processes_folder(tmp_path, patch_factory, capsys):
     captured = capsys.readouterr().out
     assert "Starting job local_job" in captured
     assert "Processed folder" in captured
-    assert "[DONE ALL]" in captured
\ No newline at end of file
+    assert "[DONE ALL]" in captured
+    # the processor created for the job is released at the end
+    patch_factory.close.assert_called_once()
+
+
+def test_local_worker_builds_processor_once_per_job(tmp_path, patch_factory):
+    sessions = [tmp_path / f"Session_{i}" for i in range(3)]
+    for s in sessions:
+        s.mkdir()
+
+    class MultiWorker(LocalWorker):
+        def _folder_to_process(self):
+            yield from (str(s) for s in sessions)
+
+    worker = MultiWorker(
+        base_dir=str(tmp_path),
+        action='transcribe',
+        language='english',
+        instruction=None,
+        job=None
+    )
+    worker.run()
+
+    ProcessorFactory.get_processor.assert_called_once()
+    assert patch_factory.process.call_count == 3
+    patch_factory.close.assert_called_once()
+
+def test_local_worker_reuses_shared_processor(tmp_path, patch_factory):
+    base = tmp_path / "session1"
+    base.mkdir()
+    shared = DummyProcessor()
+
+    worker = LocalWorker(
+        base_dir=str(base),
+        action='transcribe',
+        language='english',
+        instruction=None,
+        job=None
+    )
+    worker.shared_processor = shared
+    worker.run()
+
+    # the preloaded processor is used and the factory one is left untouched
+    shared.process.assert_called_once_with(str(base))
+    patch_factory.process.assert_not_called()
+    # a shared processor belongs to the pool and stays loaded
+    shared.close.assert_not_called()
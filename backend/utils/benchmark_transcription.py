@@ -0,0 +1,78 @@
+"""
+Compare the real-time factor (processing time / audio duration) of the
+transcription engines on a folder of recordings.
+
+Example:
+    python -m utils.benchmark_transcription path/to/binaries --language de \
+        --engines whisper whisperx faster-whisper faster-whisper:medium
+"""
+
+import os
+import time
+import argparse
+
+from inference.model_registry import ModelRegistry
+from inference.transcription.audio import SAMPLE_RATE, load_audio
+from inference.transcription.factory import TranscriptionStrategyFactory
+
+AUDIO_EXTENSIONS = ('.mp3', '.mp4', '.m4a', '.wav')
+
+
+def benchmark(engine: str, language: str, audios: list) -> dict:
+    """
+    Transcribe pre-decoded audio with one engine and time it.
+
+    Returns:
+        dict: load time, transcription time and real-time factor.
+    """
+    start = time.perf_counter()
+    strategy = TranscriptionStrategyFactory.get_strategy(language, engine)
+    load_time = time.perf_counter() - start
+
+    duration = sum(len(a) for a in audios) / SAMPLE_RATE
+    start = time.perf_counter()
+    for audio in audios:
+        strategy.transcribe(audio)
+    elapsed = time.perf_counter() - start
+
+    strategy.unload()
+    ModelRegistry.clear()
+    return {
+        "engine": engine,
+        "load_s": load_time,
+        "audio_s": duration,
+        "elapsed_s": elapsed,
+        "rtf": elapsed / duration if duration else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcription engines")
+    parser.add_argument("input_dir", help="Folder with audio files, e.g. a session's binaries/")
+    parser.add_argument("--language", required=True, help="Language code, e.g. 'de'")
+    parser.add_argument(
+        "--engines", nargs="+", default=["whisper", "whisperx", "faster-whisper"],
+        help="Engines to compare; 'faster-whisper:<size>' selects a model size"
+    )
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of files")
+    args = parser.parse_args()
+
+    files = sorted(
+        f for f in os.listdir(args.input_dir) if f.lower().endswith(AUDIO_EXTENSIONS)
+    )[:args.limit]
+    # decode once up front so that only model time is measured
+    audios = [load_audio(os.path.join(args.input_dir, f)) for f in files]
+    print(f"Benchmarking {len(audios)} files")
+
+    results = [benchmark(engine, args.language, audios) for engine in args.engines]
+
+    print(f"{'engine':<24}{'load (s)':>10}{'audio (s)':>11}{'time (s)':>10}{'RTF':>8}")
+    for r in results:
+        print(
+            f"{r['engine']:<24}{r['load_s']:>10.1f}{r['audio_s']:>11.1f}"
+            f"{r['elapsed_s']:>10.1f}{r['rtf']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
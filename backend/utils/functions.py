@@ -143,15 +143,15 @@ def install_ffmpeg():
         print("An error occurred:", e)
 
 
+@functools.lru_cache(maxsize=None)
 def find_ffmpeg():
-    """Dynamically finds ffmpeg executable path"""
+    """Dynamically finds ffmpeg executable path (looked up once per process)"""
     ffmpeg_path = shutil.which("ffmpeg")
 
     if not ffmpeg_path:
         print("FFmpeg not found. Attempting to install FFmpeg...")
         ffmpeg_path = install_ffmpeg()
-    else:
-        return ffmpeg_path
+    return ffmpeg_path
 
 
 def format_excel_output(excel_output_file, columns_to_highlight: list):